@@ -0,0 +1,7 @@
+"""
+Benchmarks de rendimiento del sistema holográfico.
+
+Cada benchmark se ejecuta con ``python -m src.benchmarks.<modulo>`` y guarda sus
+resultados en ``.benchmarks/<nombre>.jsonl`` junto con el commit actual, para
+comparar contra la ejecución anterior y detectar regresiones.
+"""
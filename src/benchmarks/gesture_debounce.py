@@ -0,0 +1,127 @@
+"""
+Benchmark de estabilización de gestos: acciones espurias vs. retardo.
+
+Clasifica un dataset sintético con ruido (segmentos de gestos sostenidos con
+frames mal clasificados) y cuenta las acciones que dispararía cada estrategia:
+
+    - ``cambio``: disparar cuando el gesto crudo cambia (el antiguo ``GestureApp``)
+    - ``cooldown``: cambio o cooldown vencido (el antiguo ``GestureController``)
+    - ``maquina``: ``GestureStateMachine`` (votación por tiempo, histéresis y cooldown)
+
+Métricas por estrategia, a 30 y 60 FPS para ver que la ventana es de tiempo:
+
+    - ``actions``: acciones disparadas
+    - ``spurious``: acciones de un gesto distinto a la etiqueta del frame
+    - ``missed``: segmentos etiquetados (de al menos 0.3 s) sin ninguna acción
+    - ``latency_ms``: mediana desde el inicio del segmento hasta su acción
+
+Uso:
+    python -m src.benchmarks.gesture_debounce
+    python -m src.benchmarks.gesture_debounce --noise 0.03 --seconds 600
+"""
+import argparse
+from typing import Any, Dict
+
+import numpy as np
+
+from src.benchmarks.results import compare_with_previous, save_result
+from src.gestos.components.gesture_mapper import GestureMapper
+from src.gestos.components.gesture_state import GestureStateMachine
+from src.gestos.offline.dataset import synthetic_dataset
+from src.utils.config import GESTURE_COOLDOWN
+
+BENCHMARK_NAME = "gesture_debounce"
+
+
+def _on_change(codes, timestamps):
+    previous = np.concatenate([[0], codes[:-1]])
+    return np.flatnonzero((codes != previous) & (codes != 0))
+
+
+def _cooldown(codes, timestamps):
+    events, last_code, last_time = [], 0, -np.inf
+    for i, (code, t) in enumerate(zip(codes.tolist(), timestamps.tolist())):
+        if code and (code != last_code or t - last_time >= GESTURE_COOLDOWN):
+            events.append(i)
+            last_code, last_time = code, t
+    return np.asarray(events, dtype=np.int64)
+
+
+def _state_machine(codes, timestamps):
+    update = GestureStateMachine().update
+    return np.asarray([i for i, (code, t) in enumerate(zip(codes.tolist(), timestamps.tolist()))
+                       if update(code or None, t) is not None], dtype=np.int64)
+
+
+STRATEGIES = {
+    'cambio': _on_change,
+    'cooldown': _cooldown,
+    'maquina': _state_machine,
+}
+
+
+def _score(events, codes, labels, timestamps, fps) -> Dict[str, float]:
+    spurious = int((codes[events] != labels[events]).sum())
+    starts = np.flatnonzero(np.diff(labels, prepend=-1))
+    ends = np.append(starts[1:], len(labels))
+    missed, latencies = 0, []
+    for start, end in zip(starts, ends):
+        if labels[start] == 0 or (end - start) < 0.3 * fps:
+            continue
+        lo, hi = np.searchsorted(events, [start, end])
+        hits = [e for e in events[lo:hi] if codes[e] == labels[start]]
+        if hits:
+            latencies.append((timestamps[hits[0]] - timestamps[start]) * 1000)
+        else:
+            missed += 1
+    return {
+        'actions': len(events),
+        'spurious': spurious,
+        'missed': missed,
+        'latency_ms': float(np.median(latencies)) if latencies else 0.0,
+    }
+
+
+def run_benchmark(seconds: float = 300.0, noise: float = 0.025, seed: int = 0) -> Dict[str, Any]:
+    mapper = GestureMapper()
+    report: Dict[str, Any] = {'seconds': seconds, 'noise': noise, 'fps': {}}
+    for fps in (30, 60):
+        dataset = synthetic_dataset(int(seconds * fps), noise=noise, fps=fps, seed=seed)
+        codes = mapper.detect_batch(dataset.landmarks)
+        labels = np.asarray(dataset.labels)
+        timestamps = np.asarray(dataset.timestamps)
+        report['fps'][str(fps)] = {
+            'misclassified': float((codes != labels).mean()),
+            'strategies': {name: _score(fn(codes, timestamps), codes, labels, timestamps, fps)
+                           for name, fn in STRATEGIES.items()},
+        }
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"Sesión sintética de {report['seconds']:.0f} s, ruido {report['noise']}"]
+    for fps, r in report['fps'].items():
+        lines.append(f"{fps} FPS ({r['misclassified']:.1%} de frames mal clasificados)")
+        lines.append(f"  {'estrategia':<12}{'acciones':>10}{'espurias':>10}{'perdidos':>10}{'retardo ms':>12}")
+        for name, s in r['strategies'].items():
+            lines.append(f"  {name:<12}{s['actions']:>10}{s['spurious']:>10}{s['missed']:>10}{s['latency_ms']:>12.0f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Acciones espurias vs. retardo de la estabilización de gestos")
+    parser.add_argument('--seconds', type=float, default=300.0)
+    parser.add_argument('--noise', type=float, default=0.025)
+    parser.add_argument('--no-save', action='store_true', help="No guardar el resultado")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.seconds, args.noise)
+    print(format_report(report))
+
+    print(compare_with_previous(BENCHMARK_NAME, report))
+    if not args.no_save:
+        print(f"Resultado guardado en {save_result(BENCHMARK_NAME, report)}")
+
+
+if __name__ == "__main__":
+    main()
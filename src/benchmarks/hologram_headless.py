@@ -0,0 +1,211 @@
+"""
+Benchmark sin ventana de las apps del holograma.
+
+Ejecuta ``HologramRenderer`` (renderer.py) o ``HologramApp`` (holograma.py) en
+un buffer offscreen (rasterizador por software, sin GPU ni servidor X) y les
+inyecta una secuencia de gestos guionada a ritmo fijo desde un hilo, como lo
+haría el receptor de red. Reporta:
+
+    - ``frame``: distribución del tiempo por frame (``taskMgr.step``)
+    - ``event_to_frame``: del evento encolado al fin del frame que lo aplicó
+    - memoria residente del proceso y geometría única de la escena
+
+Panda3D admite un ``ShowBase`` por proceso: cada ejecución mide una sola app.
+
+Uso:
+    python -m src.benchmarks.hologram_headless
+    python -m src.benchmarks.hologram_headless --app app --rate 30 --frames 600
+    python -m src.benchmarks.hologram_headless --compositor --size 900 900
+"""
+import argparse
+import contextlib
+import io
+import os
+import resource
+import threading
+import time
+from typing import Any, Dict, Iterator, Tuple
+
+from src.benchmarks.offscreen import configure_offscreen
+from src.benchmarks.results import compare_with_previous, save_result
+from src.utils.metrics import LatencyRecorder
+
+BENCHMARK_NAME = "hologram_headless"
+
+
+def rss_mb() -> float:
+    """Memoria residente actual del proceso (máxima si no hay ``/proc``)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def gesture_script(app: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Secuencia infinita de eventos para cada app."""
+    i = 0
+    while True:
+        if app == "renderer":
+            # Rotación continua con un swipe cada 30 eventos
+            if i % 30 == 29:
+                yield ("swipe_left" if i % 60 == 59 else "swipe_right"), {}
+            else:
+                yield "rotation", {'angle': (i * 3.0) % 360}
+        else:
+            yield ("point", "point", "open_hand", "fist")[i % 4], {}
+        i += 1
+
+
+def _create_app(app: str, compositor: bool, size):
+    with contextlib.redirect_stdout(io.StringIO()):
+        if app == "renderer":
+            from src.holograma.renderer import HologramRenderer
+            instance = HologramRenderer(use_network=False, compositor=compositor, panel_size=size,
+                                        headless=True)
+            return instance, instance.event_handlers
+        if app == "app":
+            from src.holograma.holograma import HologramApp
+            instance = HologramApp(use_network=False, headless=True)
+            return instance, instance.gesture_handlers
+    raise ValueError(f"App desconocida: {app}")
+
+
+def _wait_for_model(instance, timeout: float = 10.0) -> None:
+    """``HologramApp`` carga el modelo en segundo plano: avanza frames hasta que aparece."""
+    model = getattr(instance, "assets", None) and instance.model
+    deadline = time.perf_counter() + timeout
+    while model is not None and model.getNumChildren() == 0 and time.perf_counter() < deadline:
+        instance.taskMgr.step()
+        time.sleep(0.005)
+
+
+def run_benchmark(app: str = "renderer", frames: int = 300, rate: float = 120.0,
+                  size=(640, 480), renderer: str = "software", compositor: bool = False) -> Dict[str, Any]:
+    """
+    Ejecuta la app offscreen con gestos guionados y retorna sus métricas.
+
+    Args:
+        app: ``"renderer"`` (HologramRenderer) o ``"app"`` (HologramApp)
+        frames: Frames a medir
+        rate: Eventos por segundo del guion
+        size: Tamaño del buffer offscreen
+        renderer: ``"software"`` (p3tinydisplay) o ``"gl"``
+        compositor: Usar ``HologramCompositor`` en el renderer
+    """
+    configure_offscreen(*size, renderer=renderer)
+    rss_before = rss_mb()
+    instance, handlers = _create_app(app, compositor, size)
+    _wait_for_model(instance)
+    rss_loaded = rss_mb()
+
+    # Cada handler anota cuándo se encoló el evento que aplica
+    applied = []
+    for kind, handler in list(handlers.items()):
+        def timed(data, handler=handler):
+            handler(data)
+            applied.append(data['t_push'])
+        handlers[kind] = timed
+
+    pushed = 0
+    stop = threading.Event()
+
+    def produce():
+        nonlocal pushed
+        period = 1.0 / rate
+        start = time.perf_counter()
+        for i, (kind, data) in enumerate(gesture_script(app)):
+            delay = start + i * period - time.perf_counter()
+            if delay > 0 and stop.wait(delay):
+                return
+            if stop.is_set():
+                return
+            instance.events.push(kind, dict(data, t_push=time.perf_counter()))
+            pushed += 1
+
+    latency = LatencyRecorder(window=max(frames * 4, 1000))
+    # Calentamiento
+    for _ in range(5):
+        instance.taskMgr.step()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame_start = time.perf_counter()
+        instance.taskMgr.step()
+        frame_end = time.perf_counter()
+        latency.record('frame', frame_end - frame_start)
+        for t_push in applied:
+            latency.record('event_to_frame', frame_end - t_push)
+        applied.clear()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    producer.join(timeout=1.0)
+
+    from src.holograma.scene import unique_geometry_bytes
+    roots = [instance.render]
+    if getattr(instance, "compositor", None):
+        roots += [pivot.getParent() for pivot in instance.compositor.pivots.values()]
+    report = {
+        'app': app,
+        'compositor': compositor,
+        'frames': frames,
+        'event_rate': rate,
+        'size': f"{size[0]}x{size[1]}",
+        'renderer': renderer,
+        'events_pushed': pushed,
+        'events_applied': latency.report().get('event_to_frame', {}).get('count', 0),
+        'frames_per_second': frames / elapsed if elapsed > 0 else 0.0,
+        'rss_start_mb': rss_before,
+        'rss_loaded_mb': rss_loaded,
+        'rss_end_mb': rss_mb(),
+        'geometry_mb': unique_geometry_bytes(roots) / 1e6,
+        'stages': latency.report(),
+    }
+    if hasattr(instance, "shutdown"):
+        instance.shutdown()
+    instance.destroy()
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    mode = " (compositor)" if report['compositor'] else ""
+    lines = [
+        f"App: {report['app']}{mode}  |  {report['size']} ({report['renderer']})  |  "
+        f"{report['frames']} frames, {report['event_rate']:g} eventos/s",
+        f"Eventos: {report['events_applied']} aplicados de {report['events_pushed']} encolados  |  "
+        f"{report['frames_per_second']:.1f} fps",
+        f"Memoria: {report['rss_start_mb']:.1f} MB al inicio, {report['rss_loaded_mb']:.1f} MB con el "
+        f"modelo, {report['rss_end_mb']:.1f} MB al final  |  geometría {report['geometry_mb']:.2f} MB",
+        f"{'etapa':<16}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    for stage, s in report['stages'].items():
+        lines.append(
+            f"{stage:<16}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}{s['max_ms']:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rendimiento sin ventana de las apps del holograma")
+    parser.add_argument('--app', choices=("renderer", "app"), default="renderer")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--rate', type=float, default=120.0, help="Eventos por segundo del guion")
+    parser.add_argument('--size', type=int, nargs=2, default=(640, 480), metavar=('ANCHO', 'ALTO'))
+    parser.add_argument('--renderer', choices=("software", "gl"), default="software")
+    parser.add_argument('--compositor', action='store_true', help="Renderer en modo compositor")
+    parser.add_argument('--no-save', action='store_true', help="No guardar el resultado")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.app, args.frames, args.rate, tuple(args.size), args.renderer, args.compositor)
+    print(format_report(report))
+
+    name = f"{BENCHMARK_NAME}_{args.app}{'_compositor' if args.compositor else ''}"
+    print(compare_with_previous(name, report))
+    if not args.no_save:
+        print(f"Resultado guardado en {save_result(name, report)}")
+
+
+if __name__ == "__main__":
+    main()
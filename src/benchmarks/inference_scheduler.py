@@ -0,0 +1,123 @@
+"""
+Benchmark del programador de inferencia: CPU usada vs. calidad de los landmarks.
+
+Sesión sintética a 30 FPS: la mano de ``temporal_gestures`` (swipes, giros y
+pausas) que además desaparece 4 s de cada 12. La inferencia es simulada
+(devuelve la mano real si está visible) con un costo fijo ``--inference-ms``;
+la CPU se estima como inferencias x costo / duración. Estrategias:
+
+    - ``cada_frame``: inferir todos los frames (lo que se hacía antes)
+    - ``programador``: ``InferenceScheduler`` con landmarks interpolados en los
+      frames saltados
+    - ``presupuesto_0.25``: el programador limitado a un cuarto de núcleo
+    - ``presupuesto_0.25_sin_interpolar``: el mismo programa repitiendo la
+      última inferencia en los frames saltados
+
+Métricas:
+
+    - ``run_fraction`` y ``cpu``: frames inferidos y fracción de un núcleo
+    - ``error_px``: error medio de los landmarks (en píxeles de 640x480) en
+      los frames con mano
+    - ``missing``: frames con mano en los que no se entregó ninguna
+    - ``appear_ms``: retardo medio desde que aparece la mano hasta que se ve
+
+Uso:
+    python -m src.benchmarks.inference_scheduler
+    python -m src.benchmarks.inference_scheduler --inference-ms 25
+"""
+import argparse
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.benchmarks.results import compare_with_previous, save_result
+from src.benchmarks.temporal_gestures import synthetic_session
+from src.gestos.components.scheduler import InferenceScheduler
+
+BENCHMARK_NAME = "inference_scheduler"
+FRAME_SIZE = np.array([640, 480])
+
+
+def session(n_frames: int = 5400, fps: float = 30.0, seed: int = 0):
+    """Returns: ``(landmarks (N, 21, 3), timestamps, visible (N,))``."""
+    landmarks, timestamps, _ = synthetic_session(n_frames, fps, seed=seed)
+    visible = (timestamps % 12.0) < 8.0
+    return landmarks, timestamps, visible
+
+
+def _run(landmarks, timestamps, visible, cost: float, scheduler: Optional[InferenceScheduler],
+         interpolate: bool = True) -> Dict[str, float]:
+    errors, missing, runs = [], 0, 0
+    appear_delays, appeared = [], None
+    last = None
+    for i, t in enumerate(timestamps):
+        if visible[i] and (i == 0 or not visible[i - 1]):
+            appeared = t
+        if scheduler is None or scheduler.should_run(t):
+            runs += 1
+            last = landmarks[i][None] if visible[i] else None
+            if scheduler is not None:
+                scheduler.observe(last, t, cost)
+            estimate = last
+            if last is not None and appeared is not None:
+                appear_delays.append(t - appeared)
+                appeared = None
+        elif interpolate:
+            estimate = scheduler.interpolate(t)
+        else:
+            estimate = last
+
+        if visible[i]:
+            if estimate is None:
+                missing += 1
+            else:
+                errors.append(np.abs((estimate[0, :, :2] - landmarks[i, :, :2]) * FRAME_SIZE).mean())
+    seconds = timestamps[-1] - timestamps[0]
+    return {
+        'run_fraction': runs / len(timestamps),
+        'cpu': float(runs * cost / seconds),
+        'error_px': float(np.mean(errors)),
+        'missing': missing,
+        'appear_ms': float(np.mean(appear_delays)) * 1000 if appear_delays else 0.0,
+    }
+
+
+def run_benchmark(frames: int = 5400, inference_ms: float = 15.0, seed: int = 0) -> Dict[str, Any]:
+    landmarks, timestamps, visible = session(frames, seed=seed)
+    cost = inference_ms / 1000
+    strategies = {
+        'cada_frame': _run(landmarks, timestamps, visible, cost, None),
+        'programador': _run(landmarks, timestamps, visible, cost, InferenceScheduler(cpu_budget=1.0)),
+        'presupuesto_0.25': _run(landmarks, timestamps, visible, cost, InferenceScheduler(cpu_budget=0.25)),
+        'presupuesto_0.25_sin_interpolar': _run(landmarks, timestamps, visible, cost,
+                                                InferenceScheduler(cpu_budget=0.25), interpolate=False),
+    }
+    return {'frames': frames, 'inference_ms': inference_ms, 'strategies': strategies}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"Sesión sintética de {report['frames']} frames, inferencia de {report['inference_ms']:.0f} ms",
+             f"  {'estrategia':<34}{'inferidos':>10}{'CPU':>7}{'error px':>10}{'sin mano':>10}{'aparición ms':>14}"]
+    for name, s in report['strategies'].items():
+        lines.append(f"  {name:<34}{s['run_fraction']:>10.0%}{s['cpu']:>7.0%}{s['error_px']:>10.2f}"
+                     f"{s['missing']:>10}{s['appear_ms']:>14.0f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CPU y calidad de landmarks del programador de inferencia")
+    parser.add_argument('--frames', type=int, default=5400)
+    parser.add_argument('--inference-ms', type=float, default=15.0)
+    parser.add_argument('--no-save', action='store_true', help="No guardar el resultado")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.frames, args.inference_ms)
+    print(format_report(report))
+
+    print(compare_with_previous(BENCHMARK_NAME, report))
+    if not args.no_save:
+        print(f"Resultado guardado en {save_result(BENCHMARK_NAME, report)}")
+
+
+if __name__ == "__main__":
+    main()
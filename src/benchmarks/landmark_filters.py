@@ -0,0 +1,186 @@
+"""
+Benchmark de filtros de landmarks: jitter vs. retardo.
+
+Filtra frame a frame la mano completa (21 landmarks) de una grabación o de una
+sesión sintética con pausas y movimientos rápidos, y mide sobre la punta del
+índice, en píxeles de una pantalla de 1920x1080 (como el cursor):
+
+    - ``jitter_px``: RMS de la segunda diferencia mientras la mano está quieta
+    - ``lag_ms``: desfase temporal que mejor alinea la salida con la referencia
+      durante los movimientos
+    - ``error_px``: RMS del error contra la referencia
+    - ``us_per_frame``: costo del filtro por frame
+
+La referencia es la trayectoria real en la sesión sintética; en una grabación,
+un promedio móvil centrado (sin retardo) de los landmarks grabados.
+
+Uso:
+    python -m src.benchmarks.landmark_filters
+    python -m src.benchmarks.landmark_filters --recording sesion.hglm
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.benchmarks.results import compare_with_previous, save_result
+from src.gestos.components.filters import FILTER_PRESETS, make_filter
+from src.gestos.components.landmarks import INDEX_TIP
+
+BENCHMARK_NAME = "landmark_filters"
+SCREEN = np.array([1920.0, 1080.0])
+
+# Nombre en el reporte -> (consumidor o tipo, parámetros)
+CANDIDATES = {
+    'sin_filtro': None,
+    'exponencial_7': ('exponential', {'smoothening': 7.0}),
+    **{f"{name}_{preset['kind']}": (name, {}) for name, preset in FILTER_PRESETS.items()},
+}
+
+
+def synthetic_motion(n_frames: int = 1800, fps: float = 30.0, noise: float = 0.003,
+                     seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mano que alterna pausas y desplazamientos de mínimo jerk, con ruido gaussiano.
+
+    Returns:
+        ``(reales, medidos, timestamps)`` con landmarks ``(N, 21, 3)``
+    """
+    from src.gestos.offline.dataset import canonical_poses
+    from src.gestos.components.gesture_mapper import GESTURE_CODES
+
+    rng = np.random.default_rng(seed)
+    pose = canonical_poses()[GESTURE_CODES['OPEN_HAND']]
+    offsets = np.zeros((n_frames, 2))
+    position = np.zeros(2)
+    i = 0
+    while i < n_frames:
+        hold = int(rng.uniform(0.3, 1.0) * fps)
+        offsets[i:i + hold] = position
+        i += hold
+        move = max(2, int(rng.uniform(0.15, 0.6) * fps))
+        target = rng.uniform(-0.3, 0.3, size=2)
+        s = np.linspace(0, 1, move)[:, None]
+        profile = 10 * s ** 3 - 15 * s ** 4 + 6 * s ** 5
+        segment = position + (target - position) * profile
+        offsets[i:i + move] = segment[:max(0, min(move, n_frames - i))]
+        position = target
+        i += move
+
+    truth = np.repeat(pose[None], n_frames, axis=0)
+    truth[:, :, :2] += offsets[:, None, :].astype(np.float32)
+    measured = truth + rng.normal(0.0, noise, size=truth.shape).astype(np.float32)
+    return truth, measured, np.arange(n_frames) / fps
+
+
+def recorded_motion(path: Path, window: int = 5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Landmarks de una grabación y su referencia por promedio móvil centrado."""
+    from src.gestos.offline.recording import Recording
+
+    dataset = Recording(path).to_dataset()
+    measured = np.asarray(dataset.landmarks, dtype=np.float32)
+    kernel = np.ones(window) / window
+    pad = window // 2
+    padded = np.pad(measured, ((pad, pad), (0, 0), (0, 0)), mode='edge')
+    reference = np.apply_along_axis(lambda v: np.convolve(v, kernel, mode='valid'), 0, padded)
+    return reference.astype(np.float32), measured, np.asarray(dataset.timestamps, dtype=np.float64)
+
+
+def _best_lag(output: np.ndarray, reference: np.ndarray, moving: np.ndarray, max_lag: int) -> int:
+    """Desfase en frames (salida atrasada) con menor error durante el movimiento."""
+    errors = []
+    for lag in range(max_lag + 1):
+        idx = np.nonzero(moving[:len(moving) - lag])[0]
+        if len(idx) == 0:
+            errors.append(np.inf)
+            continue
+        diff = output[idx + lag] - reference[idx]
+        errors.append(float((diff * diff).sum(axis=-1).mean()))
+    return int(np.argmin(errors))
+
+
+def evaluate(reference: np.ndarray, measured: np.ndarray, timestamps: np.ndarray,
+             candidate: Optional[Tuple[str, Dict[str, Any]]]) -> Dict[str, float]:
+    """Filtra ``measured`` frame a frame y calcula las métricas sobre la punta del índice."""
+    output = np.empty_like(measured)
+    start = time.perf_counter()
+    if candidate is None:
+        output[:] = measured
+    else:
+        name, params = candidate
+        filt = make_filter(name, **params)
+        for i in range(len(measured)):
+            output[i] = filt(measured[i], timestamps[i])
+    elapsed = time.perf_counter() - start
+
+    tip = output[:, INDEX_TIP, :2] * SCREEN
+    ref = reference[:, INDEX_TIP, :2] * SCREEN
+    dt = float(np.median(np.diff(timestamps))) if len(timestamps) > 1 else 1 / 30
+    ref_speed = np.zeros(len(ref))
+    ref_speed[1:] = np.linalg.norm(np.diff(ref, axis=0), axis=1) / dt
+    still = ref_speed < 20.0      # px/s
+    moving = ref_speed > 200.0
+
+    # Jitter: segunda diferencia (la deriva lenta hacia el reposo no cuenta)
+    accel = np.zeros(len(tip))
+    accel[1:-1] = np.linalg.norm(tip[2:] - 2 * tip[1:-1] + tip[:-2], axis=1)
+    jitter = float(np.sqrt(np.mean(accel[still] ** 2))) if still.any() else 0.0
+    error = float(np.sqrt(np.mean(((tip - ref) ** 2).sum(axis=1))))
+    lag = _best_lag(tip, ref, moving, max_lag=int(0.3 / dt))
+    return {
+        'jitter_px': jitter,
+        'lag_ms': lag * dt * 1000,
+        'error_px': error,
+        'us_per_frame': elapsed / len(measured) * 1e6,
+    }
+
+
+def run_benchmark(recording: Optional[Path] = None, frames: int = 1800, fps: float = 30.0,
+                  noise: float = 0.003, seed: int = 0) -> Dict[str, Any]:
+    if recording is not None:
+        reference, measured, timestamps = recorded_motion(recording)
+        source = str(recording)
+    else:
+        reference, measured, timestamps = synthetic_motion(frames, fps, noise, seed)
+        source = f"sintética ({frames} frames, ruido {noise})"
+    return {
+        'source': source,
+        'frames': len(measured),
+        'filters': {name: evaluate(reference, measured, timestamps, candidate)
+                    for name, candidate in CANDIDATES.items()},
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Fuente: {report['source']}  |  {report['frames']} frames  |  punta del índice en 1920x1080",
+        f"{'filtro':<26}{'jitter px':>11}{'lag ms':>9}{'error px':>10}{'µs/frame':>10}",
+    ]
+    for name, s in report['filters'].items():
+        lines.append(
+            f"{name:<26}{s['jitter_px']:>11.2f}{s['lag_ms']:>9.1f}{s['error_px']:>10.2f}{s['us_per_frame']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jitter vs. retardo de los filtros de landmarks")
+    parser.add_argument('--recording', type=Path, help="Grabación .hglm a filtrar")
+    parser.add_argument('--frames', type=int, default=1800)
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--noise', type=float, default=0.003, help="Ruido de la sesión sintética")
+    parser.add_argument('--no-save', action='store_true', help="No guardar el resultado")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.recording, args.frames, args.fps, args.noise)
+    print(format_report(report))
+
+    print(compare_with_previous(BENCHMARK_NAME, report))
+    if not args.no_save:
+        print(f"Resultado guardado en {save_result(BENCHMARK_NAME, report)}")
+
+
+if __name__ == "__main__":
+    main()
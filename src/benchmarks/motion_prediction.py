@@ -0,0 +1,178 @@
+"""
+Instrumentación de la predicción de movimiento: posición predicha vs. real.
+
+Reproduce una grabación (o la sesión sintética de ``landmark_filters``) con una
+latencia de pipeline simulada: la muestra capturada en ``t`` recién se usa en
+``t + latencia``. Compara contra la posición real en ese instante:
+
+    - la punta del índice filtrada como el cursor (preset ``"cursor"``), sin y
+      con ``MotionPredictor``, en píxeles de una pantalla de 1920x1080
+    - un ángulo de rotación (sintético, en grados) sin y con predicción
+
+Métricas: RMS y p95 del error durante el movimiento y jitter (segunda
+diferencia) con la mano quieta, para ver que la predicción no lo amplifica.
+
+Uso:
+    python -m src.benchmarks.motion_prediction
+    python -m src.benchmarks.motion_prediction --latency 0.12 --recording sesion.hglm
+"""
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.benchmarks.landmark_filters import SCREEN, recorded_motion, synthetic_motion
+from src.benchmarks.results import compare_with_previous, save_result
+from src.gestos.components.filters import make_filter
+from src.gestos.components.landmarks import INDEX_TIP
+from src.gestos.components.prediction import MotionPredictor
+
+BENCHMARK_NAME = "motion_prediction"
+
+# Nombre en el reporte -> parámetros de MotionPredictor (None = sin predicción)
+CANDIDATES = {
+    'sin_prediccion': None,
+    'prediccion': {'gain': 1.0},
+    'prediccion_gain_0.5': {'gain': 0.5},
+}
+
+
+def _metrics(output: np.ndarray, actual: np.ndarray, speed: np.ndarray,
+             still_below: float, moving_above: float) -> Dict[str, float]:
+    error = np.linalg.norm(output - actual, axis=-1) if output.ndim > 1 else np.abs(output - actual)
+    moving = speed > moving_above
+    still = speed < still_below
+    accel = np.zeros(len(output))
+    second = output[2:] - 2 * output[1:-1] + output[:-2]
+    accel[1:-1] = np.linalg.norm(second, axis=-1) if output.ndim > 1 else np.abs(second)
+    return {
+        'error': float(np.sqrt(np.mean(error ** 2))),
+        'moving_error': float(np.sqrt(np.mean(error[moving] ** 2))) if moving.any() else 0.0,
+        'moving_error_p95': float(np.percentile(error[moving], 95)) if moving.any() else 0.0,
+        'still_jitter': float(np.sqrt(np.mean(accel[still] ** 2))) if still.any() else 0.0,
+    }
+
+
+def _cursor(reference, measured, timestamps, lag: int, latency: float,
+            params: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    filt = make_filter("cursor")
+    predictor = MotionPredictor(horizon=latency, **params) if params is not None else None
+    n = len(measured) - lag
+    output = np.empty((n, 2))
+    for i in range(n):
+        hand = filt(measured[i], timestamps[i])
+        if predictor is not None:
+            hand = predictor(hand, timestamps[i])
+        output[i] = hand[INDEX_TIP, :2]
+    actual = reference[lag:, INDEX_TIP, :2] * SCREEN
+    speed = np.zeros(n)
+    dt = float(np.median(np.diff(timestamps)))
+    speed[1:] = np.linalg.norm(np.diff(actual, axis=0), axis=1) / dt
+    metrics = _metrics(output * SCREEN, actual, speed, still_below=20.0, moving_above=200.0)
+    return {f"{key}_px": value for key, value in metrics.items()}
+
+
+def synthetic_angle(timestamps: np.ndarray, noise: float = 0.5, seed: int = 0):
+    """Ángulo (grados) que alterna pausas y giros suaves de hasta 180°, con ruido."""
+    rng = np.random.default_rng(seed)
+    n = len(timestamps)
+    fps = 1.0 / float(np.median(np.diff(timestamps)))
+    angle = np.zeros(n)
+    current, i = 0.0, 0
+    while i < n:
+        hold = int(rng.uniform(0.3, 1.0) * fps)
+        angle[i:i + hold] = current
+        i += hold
+        move = max(2, int(rng.uniform(0.3, 0.8) * fps))
+        target = current + rng.uniform(-180, 180)
+        s = np.linspace(0, 1, move)
+        segment = current + (target - current) * (10 * s ** 3 - 15 * s ** 4 + 6 * s ** 5)
+        angle[i:i + move] = segment[:max(0, min(move, n - i))]
+        current = target
+        i += move
+    return angle, angle + rng.normal(0.0, noise, size=n)
+
+
+def _rotation(timestamps, lag: int, latency: float, params: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    truth, measured = synthetic_angle(timestamps)
+    filt = make_filter("rotation")
+    predictor = MotionPredictor(horizon=latency, period=360.0, **params) if params is not None else None
+    n = len(measured) - lag
+    output = np.empty(n)
+    for i in range(n):
+        value = float(filt(np.array([measured[i]]), timestamps[i])[0])
+        if predictor is not None:
+            value = float(predictor(value, timestamps[i]))
+        output[i] = value
+    actual = truth[lag:]
+    # Error angular en (-180, 180]
+    unwrapped = actual + (output - actual + 180.0) % 360.0 - 180.0
+    dt = float(np.median(np.diff(timestamps)))
+    speed = np.zeros(n)
+    speed[1:] = np.abs(np.diff(actual)) / dt
+    metrics = _metrics(unwrapped, actual, speed, still_below=2.0, moving_above=30.0)
+    return {f"{key}_deg": value for key, value in metrics.items()}
+
+
+def run_benchmark(recording: Optional[Path] = None, frames: int = 1800, fps: float = 30.0,
+                  latency: float = 0.1, seed: int = 0) -> Dict[str, Any]:
+    """
+    Args:
+        recording: Grabación .hglm; por defecto la sesión sintética
+        frames, fps: Tamaño y ritmo de la sesión sintética
+        latency: Latencia del pipeline simulada (segundos)
+    """
+    if recording is not None:
+        reference, measured, timestamps = recorded_motion(recording)
+        source = str(recording)
+    else:
+        reference, measured, timestamps = synthetic_motion(frames, fps, seed=seed)
+        source = f"sintética ({frames} frames)"
+    dt = float(np.median(np.diff(timestamps)))
+    lag = max(1, int(round(latency / dt)))
+    return {
+        'source': source,
+        'frames': len(measured),
+        'latency_ms': lag * dt * 1000,
+        'cursor': {name: _cursor(reference, measured, timestamps, lag, lag * dt, params)
+                   for name, params in CANDIDATES.items()},
+        'rotation': {name: _rotation(timestamps, lag, lag * dt, params)
+                     for name, params in CANDIDATES.items()},
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Fuente: {report['source']}  |  {report['frames']} frames  |  "
+        f"latencia simulada {report['latency_ms']:.0f} ms",
+    ]
+    for target, unit in (('cursor', 'px'), ('rotation', 'deg')):
+        lines.append(f"{target + f' ({unit})':<24}{'error':>9}{'en mov.':>9}{'p95 mov.':>10}{'jitter':>9}")
+        for name, s in report[target].items():
+            lines.append(
+                f"  {name:<22}{s[f'error_{unit}']:>9.2f}{s[f'moving_error_{unit}']:>9.2f}"
+                f"{s[f'moving_error_p95_{unit}']:>10.2f}{s[f'still_jitter_{unit}']:>9.2f}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Posición predicha vs. real con latencia de pipeline")
+    parser.add_argument('--recording', type=Path, help="Grabación .hglm a reproducir")
+    parser.add_argument('--frames', type=int, default=1800)
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--latency', type=float, default=0.1, help="Latencia simulada en segundos")
+    parser.add_argument('--no-save', action='store_true', help="No guardar el resultado")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.recording, args.frames, args.fps, args.latency)
+    print(format_report(report))
+
+    print(compare_with_previous(BENCHMARK_NAME, report))
+    if not args.no_save:
+        print(f"Resultado guardado en {save_result(BENCHMARK_NAME, report)}")
+
+
+if __name__ == "__main__":
+    main()
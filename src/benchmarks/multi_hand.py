@@ -0,0 +1,142 @@
+"""
+Benchmark de varias manos: estabilidad de la identidad y costo por cantidad de manos.
+
+Identidad: dos manos que se cruzan horizontalmente (con ruido), entregadas en
+orden aleatorio en cada frame y con frames perdidos, como hace MediaPipe.
+Cuenta los cambios de id de cada mano real:
+
+    - ``orden``: usar el índice de la detección como id (lo que se hacía antes)
+    - ``tracker``: ``HandIdentityTracker`` sin lateralidad
+    - ``tracker_lateralidad``: con la lateralidad de cada detección
+
+Costo: ``MultiHandGesturePipeline.update`` (asociación, filtro, clasificación
+vectorizada, estado por mano y pinch-zoom) con 1, 2, 4 y 8 manos por frame.
+
+Uso:
+    python -m src.benchmarks.multi_hand
+"""
+import argparse
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+from src.benchmarks.results import compare_with_previous, save_result
+from src.benchmarks.temporal_gestures import _pose, hand_template
+from src.gestos.components.filters import make_filter
+from src.gestos.components.multi_hand import HandIdentityTracker, MultiHandGesturePipeline
+
+BENCHMARK_NAME = "multi_hand"
+
+
+def crossing_hands(n_frames: int = 1800, fps: float = 30.0, noise: float = 0.003,
+                   drop: float = 0.05, seed: int = 0):
+    """
+    Dos manos que van y vienen cruzándose.
+
+    Returns:
+        ``(frames, timestamps)``: cada frame es ``(landmarks (k, 21, 3),
+        lateralidad (k,), mano real (k,))`` en orden aleatorio
+    """
+    rng = np.random.default_rng(seed)
+    template = hand_template()
+    t = np.arange(n_frames) / fps
+    phase = np.sin(2 * np.pi * t / 3.0)
+    centers = np.stack([
+        np.stack([0.5 - 0.3 * phase, 0.5 + 0.03 * np.ones_like(t)], axis=1),
+        np.stack([0.5 + 0.3 * phase, 0.5 - 0.03 * np.ones_like(t)], axis=1),
+    ], axis=1)
+    frames = []
+    for i in range(n_frames):
+        present = [h for h in (0, 1) if rng.random() >= drop]
+        rng.shuffle(present)
+        hands = np.stack([_pose(template, centers[i, h], 0.0) for h in present]) if present else \
+            np.zeros((0, 21, 3), dtype=np.float32)
+        hands = hands + rng.normal(0.0, noise, size=hands.shape).astype(np.float32)
+        # Lateralidad: la mano 0 es la izquierda; MediaPipe se equivoca a veces
+        handedness = np.array([h if rng.random() > 0.05 else 1 - h for h in present], dtype=np.int8)
+        frames.append((hands, handedness, np.array(present, dtype=np.int64)))
+    return frames, t
+
+
+def _id_switches(assigned) -> int:
+    """Cambios del id asignado a cada mano real entre sus apariciones."""
+    last, switches = {}, 0
+    for truth, ids in assigned:
+        for hand, hand_id in zip(truth.tolist(), ids.tolist()):
+            if hand in last and last[hand] != hand_id:
+                switches += 1
+            last[hand] = hand_id
+    return switches
+
+
+def evaluate_identity(frames, timestamps) -> Dict[str, int]:
+    report = {'orden': _id_switches((truth, np.arange(len(truth))) for _, _, truth in frames)}
+    for name, use_handedness in (('tracker', False), ('tracker_lateralidad', True)):
+        tracker = HandIdentityTracker(max_hands=2)
+        assigned = []
+        for (hands, handedness, truth), t in zip(frames, timestamps):
+            ids, _, _ = tracker.update(hands, handedness if use_handedness else None, t)
+            assigned.append((truth, ids))
+        report[name] = _id_switches(assigned)
+    return report
+
+
+def measure_cost(hand_counts=(1, 2, 4, 8), frames: int = 2000, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """µs por frame de ``MultiHandGesturePipeline.update`` según la cantidad de manos."""
+    rng = np.random.default_rng(seed)
+    template = hand_template()
+    report = {}
+    for count in hand_counts:
+        pipeline = MultiHandGesturePipeline(max_hands=count, landmark_filter=make_filter("classification"))
+        centers = rng.uniform(0.2, 0.8, size=(count, 2))
+        base = np.stack([_pose(template, c, 0.0) for c in centers])
+        noise = rng.normal(0.0, 0.002, size=(frames,) + base.shape).astype(np.float32)
+        start = time.perf_counter()
+        for i in range(frames):
+            pipeline.update(base + noise[i], None, i / 30.0)
+        elapsed = time.perf_counter() - start
+        report[str(count)] = {
+            'us_per_frame': elapsed / frames * 1e6,
+            'us_per_hand': elapsed / frames / count * 1e6,
+        }
+    return report
+
+
+def run_benchmark(frames: int = 1800, seed: int = 0) -> Dict[str, Any]:
+    hand_frames, timestamps = crossing_hands(frames, seed=seed)
+    return {
+        'frames': frames,
+        'id_switches': evaluate_identity(hand_frames, timestamps),
+        'cost': measure_cost(seed=seed),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"Identidad: dos manos cruzándose, {report['frames']} frames en orden aleatorio",
+             f"  {'estrategia':<22}{'cambios de id':>14}"]
+    for name, switches in report['id_switches'].items():
+        lines.append(f"  {name:<22}{switches:>14}")
+    lines.append(f"Costo de MultiHandGesturePipeline.update")
+    lines.append(f"  {'manos':<8}{'µs/frame':>10}{'µs/mano':>10}")
+    for count, s in report['cost'].items():
+        lines.append(f"  {count:<8}{s['us_per_frame']:>10.1f}{s['us_per_hand']:>10.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Identidad de manos y costo por cantidad de manos")
+    parser.add_argument('--frames', type=int, default=1800)
+    parser.add_argument('--no-save', action='store_true', help="No guardar el resultado")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.frames)
+    print(format_report(report))
+
+    print(compare_with_previous(BENCHMARK_NAME, report))
+    if not args.no_save:
+        print(f"Resultado guardado en {save_result(BENCHMARK_NAME, report)}")
+
+
+if __name__ == "__main__":
+    main()
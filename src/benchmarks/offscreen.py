@@ -0,0 +1,45 @@
+"""
+Panda3D sin ventana para los benchmarks de render.
+
+Usa un buffer offscreen con el rasterizador por software ``p3tinydisplay``,
+así que funciona en una máquina Linux sin GPU ni servidor X. Con
+``renderer="gl"`` se usa el pipe por defecto (GPU) para comparar.
+"""
+from panda3d.core import loadPrcFileData
+
+_configured = None
+
+
+def configure_offscreen(width: int = 640, height: int = 480, renderer: str = "software") -> None:
+    """
+    Configura Panda3D para render offscreen. Debe llamarse antes de crear ``ShowBase``.
+
+    Args:
+        width, height: Tamaño del buffer
+        renderer: ``"software"`` (p3tinydisplay) o ``"gl"``
+    """
+    global _configured
+    lines = [
+        "window-type offscreen",
+        f"win-size {width} {height}",
+        "audio-library-name null",
+        "sync-video false",
+        "show-frame-rate-meter false",
+    ]
+    if renderer == "software":
+        lines.append("load-display p3tinydisplay")
+    loadPrcFileData("offscreen-benchmark", "\n".join(lines))
+    _configured = (width, height, renderer)
+
+
+def offscreen_base(width: int = 640, height: int = 480, renderer: str = "software"):
+    """Crea (o reutiliza) un ``ShowBase`` offscreen; Panda3D admite uno por proceso."""
+    import builtins
+
+    existing = getattr(builtins, "base", None)
+    if existing is not None:
+        return existing
+
+    configure_offscreen(width, height, renderer)
+    from direct.showbase.ShowBase import ShowBase
+    return ShowBase()
@@ -0,0 +1,312 @@
+"""
+Benchmark de latencia extremo a extremo: del frame de cámara a la reacción del holograma.
+
+Recorre sin ventana ni cámara el camino completo:
+
+    fuente (grabación o sintética) → HandTracker (o réplica) → GestureMapper
+    → GestureController.process_gesture → transporte → ``HologramApp`` (holograma.py)
+
+El lado receptor es un ``HologramApp`` offscreen: los eventos entran por su
+``handle_event`` y se aplican con sus propios handlers en ``update``, avanzando
+un frame de Panda3D por cada frame de la fuente.
+
+Transportes:
+    - ``bridge``: ``NetworkEventBridge`` → ``GestureNetworkReceiver`` (renderer.py)
+    - ``bus``: ``EventClient`` → ``EventBus`` → ``EventClient`` (holograma.py)
+    - ``shm``: ``EventClient`` → memoria compartida → ``EventClient`` (como en src/main.py)
+
+Uso:
+    python -m src.benchmarks.pipeline_latency
+    python -m src.benchmarks.pipeline_latency --recording sesion.hglm --fps 0
+    python -m src.benchmarks.pipeline_latency --transport bus --frames 5000
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+from src.benchmarks.offscreen import configure_offscreen
+from src.benchmarks.results import compare_with_previous, save_result
+from src.gestos.components.gesture_mapper import GestureMapper
+from src.gestos.event_system import GestureController, GestureEvent, NetworkEventBridge
+from src.gestos.offline.dataset import synthetic_dataset
+from src.gestos.offline.recording import LandmarkRecorder, ReplayHandTracker, ReplaySource
+from src.utils.metrics import LatencyRecorder
+
+BENCHMARK_NAME = "pipeline_latency"
+# Evento del controlador → gesto que entiende HologramApp (el detector envía "point")
+GESTURE_EVENTS = {"pointing": "point", "open_hand": "open_hand", "fist": "fist"}
+
+
+def record_synthetic_session(path: Path, n_frames: int, seed: int = 0) -> Path:
+    """Graba una sesión sintética para usarla como fuente de frames y landmarks."""
+    dataset = synthetic_dataset(n_frames, seed=seed)
+    with LandmarkRecorder(path, max_hands=1) as recorder:
+        for hand, timestamp in zip(dataset.landmarks, dataset.timestamps):
+            results = SimpleNamespace(multi_hand_landmarks=[hand], multi_handedness=None)
+            recorder.record(results, timestamp=float(timestamp))
+    return path
+
+
+class HologramReaction:
+    """
+    Lado receptor: un ``HologramApp`` offscreen con sus handlers reales.
+
+    Registra la latencia de transporte al llegar a ``handle_event`` y la de
+    reacción cuando termina el frame que aplicó el gesto. Panda3D admite un
+    ``ShowBase`` por proceso, así que la app se reutiliza entre ejecuciones.
+    """
+
+    _app = None
+
+    def __init__(self, latency: LatencyRecorder):
+        self.latency = latency
+        self.app = self._hologram_app()
+        self.app.events.stats = dict.fromkeys(self.app.events.stats, 0)
+        self.received = 0
+        self.applied = []
+        # Cada handler real marca el evento como aplicado en este frame
+        self.handlers = self.app.gesture_handlers
+        self.app.gesture_handlers = {
+            name: self._measured(handler) for name, handler in self.handlers.items()
+        }
+
+    @classmethod
+    def _hologram_app(cls):
+        if cls._app is None:
+            from src.holograma.holograma import HologramApp
+
+            configure_offscreen()
+            cls._app = HologramApp(use_network=False, headless=True)
+        return cls._app
+
+    def _measured(self, handler):
+        def run(data):
+            handler(data)
+            self.applied.append(data)
+        return run
+
+    def on_event(self, event: Dict[str, Any]):
+        """Hilo del transporte: entrega el mensaje a ``HologramApp.handle_event``."""
+        received = time.perf_counter()
+        self.latency.record('transport', received - event['data']['t_send'])
+        self.app.handle_event(dict(event, data=dict(event['data'], received=received)))
+
+    def step(self) -> None:
+        """Avanza un frame de la app (hilo principal) y registra los gestos aplicados."""
+        self.app.taskMgr.step()
+        done = time.perf_counter()
+        for data in self.applied:
+            self.latency.record('reaction', done - data['received'])
+            self.latency.record('total', done - data['t0'])
+        self.received += len(self.applied)
+        self.applied.clear()
+
+    def close(self) -> None:
+        self.app.gesture_handlers = self.handlers
+
+
+def _setup_bridge(controller: GestureController, reaction: HologramReaction):
+    """
+    NetworkEventBridge → GestureNetworkReceiver en un puerto libre.
+
+    Retorna la función que cierra el transporte.
+    """
+    from src.holograma.renderer import GestureNetworkReceiver
+
+    receiver = GestureNetworkReceiver(port=0)
+    for name, gesture in GESTURE_EVENTS.items():
+        receiver.register_callback(name, lambda data, gesture=gesture: reaction.on_event(
+            {'type': 'gesture_detected', 'data': dict(data, gesture=gesture)}))
+    receiver.start()
+    receiver.ready.wait(2.0)
+
+    controller.network_bridge = NetworkEventBridge(port=receiver.port)
+    controller.network_bridge.connect()
+    return receiver.stop
+
+
+def _setup_bus(controller: GestureController, reaction: HologramReaction):
+    """
+    EventClient → EventBus → EventClient (puerto de src/utils/config.py).
+
+    El productor se suscribe al bus local del controlador, igual que haría el
+    detector de gestos. Retorna la función que cierra el transporte.
+    """
+    from src.network.event_bus import EventBus
+
+    bus = EventBus()
+    threading.Thread(target=bus.start, daemon=True).start()
+    return _setup_bus_clients(controller, reaction)
+
+
+def _setup_bus_clients(controller: GestureController, reaction: HologramReaction):
+    """Productor y consumidor ``EventClient``; eligen solos entre TCP y memoria compartida."""
+    from src.network.client import EventClient
+
+    consumer = EventClient("Holograma", topics=["gesture_detected"])
+    consumer.on_message_received = reaction.on_event
+    consumer.connect()
+
+    producer = EventClient("Gestos", topics=[])
+    producer.connect()
+
+    for name, gesture in GESTURE_EVENTS.items():
+        controller.event_bus.subscribe(
+            GestureEvent(name),
+            lambda data, gesture=gesture: producer.send_event("gesture_detected", dict(data, gesture=gesture))
+        )
+
+    def close():
+        producer.close()
+        consumer.close()
+    return close
+
+
+def _setup_shm(controller: GestureController, reaction: HologramReaction):
+    """
+    EventClient → memoria compartida → EventClient, como entre los procesos de src/main.py.
+
+    Retorna la función que cierra el transporte.
+    """
+    from src.network import shm_transport
+
+    transport = shm_transport.SharedMemoryTransport.create()
+    shm_transport.set_local_transport(transport)
+    close_clients = _setup_bus_clients(controller, reaction)
+
+    def close():
+        close_clients()
+        shm_transport.set_local_transport(None)
+        transport.close()
+    return close
+
+
+def run_benchmark(
+    recording: Optional[Path] = None,
+    frames: int = 1200,
+    fps: float = 120.0,
+    transport: str = "bridge",
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Ejecuta el pipeline completo y retorna latencias por etapa y throughput.
+
+    Args:
+        recording: Grabación a reproducir; si es None se genera una sintética
+        frames: Frames a procesar
+        fps: Ritmo de la fuente (0 = lo más rápido posible)
+        transport: ``"bridge"``, ``"bus"`` o ``"shm"``
+        seed: Semilla de la sesión sintética
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if recording is None:
+            recording = record_synthetic_session(Path(tmp) / "sintetica.hglm", frames, seed)
+
+        latency = LatencyRecorder(window=max(frames, 1000))
+        reaction = HologramReaction(latency)
+        source = ReplaySource(recording, loop=True)
+        tracker = ReplayHandTracker(recording)
+        mapper = GestureMapper()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Asíncrono: el loop de la fuente no espera a los handlers (ni al envío)
+            controller = GestureController(use_network=False, dispatch="async")
+            if transport == "bridge":
+                close = _setup_bridge(controller, reaction)
+            elif transport == "bus":
+                close = _setup_bus(controller, reaction)
+            elif transport == "shm":
+                close = _setup_shm(controller, reaction)
+            else:
+                raise ValueError(f"Transporte desconocido: {transport}")
+
+            sent = 0
+            period = 1.0 / fps if fps > 0 else 0.0
+            start = time.perf_counter()
+            for i in range(frames):
+                if period:
+                    delay = start + i * period - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+
+                t0 = time.perf_counter()
+                ok, frame = source.read()
+                t1 = time.perf_counter()
+                _, results = tracker.process_frame(frame)
+                t2 = time.perf_counter()
+                hands = results.multi_hand_landmarks
+                gesture = mapper.detect_gesture(hands[0]) if hands else None
+                t3 = time.perf_counter()
+                latency.record('source', t1 - t0)
+                latency.record('tracking', t2 - t1)
+                latency.record('mapping', t3 - t2)
+
+                if gesture and gesture.lower() in GESTURE_EVENTS:
+                    controller.process_gesture(gesture, {'frame_id': i, 't0': t0, 't_send': t3})
+                    latency.record('controller', time.perf_counter() - t3)
+                    sent += 1
+                reaction.step()
+
+            produce_time = time.perf_counter() - start
+            deadline = time.perf_counter() + 2.0
+            while reaction.received < sent and time.perf_counter() < deadline:
+                reaction.step()
+            elapsed = time.perf_counter() - start
+            close()
+            reaction.close()
+            controller.shutdown()
+
+    return {
+        'transport': transport,
+        'frames': frames,
+        'target_fps': fps,
+        'events_sent': sent,
+        'events_received': reaction.received,
+        'frames_per_second': frames / produce_time if produce_time > 0 else 0.0,
+        'events_per_second': reaction.received / elapsed if elapsed > 0 else 0.0,
+        'stages': latency.report(),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Transporte: {report['transport']}  |  frames: {report['frames']}  |  "
+        f"fps objetivo: {report['target_fps'] or 'máximo'}",
+        f"Throughput: {report['frames_per_second']:,.0f} frames/s, "
+        f"{report['events_per_second']:,.0f} eventos/s",
+        f"Eventos: {report['events_received']}/{report['events_sent']} recibidos",
+        f"{'etapa':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    for stage, s in report['stages'].items():
+        lines.append(
+            f"{stage:<12}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}{s['max_ms']:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de latencia cámara → holograma")
+    parser.add_argument('--recording', type=Path, help="Grabación .hglm a reproducir")
+    parser.add_argument('--frames', type=int, default=1200)
+    parser.add_argument('--fps', type=float, default=120.0, help="0 = máxima velocidad")
+    parser.add_argument('--transport', choices=("bridge", "bus", "shm"), default="bridge")
+    parser.add_argument('--no-save', action='store_true', help="No guardar el resultado")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.recording, args.frames, args.fps, args.transport)
+    print(format_report(report))
+
+    name = f"{BENCHMARK_NAME}_{args.transport}"
+    print(compare_with_previous(name, report))
+    if not args.no_save:
+        print(f"Resultado guardado en {save_result(name, report)}")
+
+
+if __name__ == "__main__":
+    main()
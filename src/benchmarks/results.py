@@ -0,0 +1,96 @@
+"""
+Persistencia y comparación de resultados de benchmarks.
+"""
+import json
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DIR = Path(__file__).resolve().parents[2] / ".benchmarks"
+
+# Sufijos de métricas comparables: latencias (menor es mejor) y tasas (mayor es mejor)
+LOWER_IS_BETTER = ('_ms', '_mb')
+HIGHER_IS_BETTER = ('per_second',)
+
+
+def current_commit() -> str:
+    """Hash corto del commit actual (o ``unknown`` fuera de un repositorio git)."""
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=DEFAULT_DIR.parent, capture_output=True, text=True, timeout=5
+        )
+        return out.stdout.strip() or 'unknown'
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+
+
+def _history_path(name: str, directory: Optional[Path]) -> Path:
+    return Path(directory or DEFAULT_DIR) / f"{name}.jsonl"
+
+
+def save_result(name: str, report: Dict[str, Any], directory: Optional[Path] = None) -> Path:
+    """Agrega un resultado al historial del benchmark ``name``."""
+    path = _history_path(name, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {'commit': current_commit(), 'timestamp': time.time(), 'report': report}
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, default=float) + '\n')
+    return path
+
+
+def load_history(name: str, directory: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Retorna todas las ejecuciones guardadas del benchmark (más antigua primero)."""
+    path = _history_path(name, directory)
+    if not path.exists():
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def flatten(report: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    """Aplana un reporte anidado a ``{'etapa.p95_ms': valor}`` con sólo valores numéricos."""
+    flat = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare_with_previous(
+    name: str,
+    report: Dict[str, Any],
+    directory: Optional[Path] = None,
+    threshold: float = 0.10
+) -> str:
+    """
+    Compara un reporte contra la última ejecución guardada de otro commit.
+
+    Args:
+        threshold: Variación relativa a partir de la cual una métrica se marca
+
+    Returns:
+        Texto con las métricas comparables y su variación (⚠️ = regresión)
+    """
+    commit = current_commit()
+    previous = [h for h in load_history(name, directory) if h['commit'] != commit]
+    if not previous:
+        return "Sin ejecuciones anteriores de otro commit para comparar."
+
+    base = previous[-1]
+    old, new = flatten(base['report']), flatten(report)
+    lines = [f"Comparación contra {base['commit']}:"]
+    for key in sorted(new):
+        lower = key.endswith(LOWER_IS_BETTER)
+        higher = key.endswith(HIGHER_IS_BETTER)
+        if key not in old or not (lower or higher) or old[key] == 0:
+            continue
+        change = (new[key] - old[key]) / abs(old[key])
+        worse = change > threshold if lower else change < -threshold
+        mark = "⚠️" if worse else "  "
+        lines.append(f"{mark} {key:<40}{old[key]:>12.3f} → {new[key]:>12.3f} ({change:+.1%})")
+    return "\n".join(lines)
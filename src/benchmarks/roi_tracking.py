@@ -0,0 +1,184 @@
+"""
+Benchmark de la región de interés (``RoiTracker``): aciertos del recorte y costo por frame.
+
+Sin cámara usa un detector simulado que entrega las manos reales (sesión de
+``temporal_gestures`` con swipes rápidos y una segunda mano que entra y sale)
+cuyos landmarks caen dentro de la imagen recibida. La inferencia simulada no
+cuesta nada, así que el tiempo medido es sólo el de recorte, reducción y
+conversión de color: el ahorro real con MediaPipe es mayor. Métricas:
+
+    - ``hit_rate``: frames resueltos sólo con el recorte
+    - ``fallbacks``: recortes sin manos que se repitieron con el frame completo
+    - ``missed_hands``: manos visibles que el recorte no entregó (manos nuevas
+      fuera del recorte hasta la próxima detección completa)
+    - ``max_error``: error máximo de los landmarks devueltos al frame completo
+    - ``us_per_frame`` con y sin ROI
+
+Con ``--camera`` (requiere MediaPipe) procesa frames reales con
+``HandTracker(roi=True)`` y reporta las estadísticas del ``RoiTracker``.
+
+Uso:
+    python -m src.benchmarks.roi_tracking
+    python -m src.benchmarks.roi_tracking --camera 0 --frames 600
+"""
+import argparse
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+import cv2
+import numpy as np
+
+from src.benchmarks.results import compare_with_previous, save_result
+from src.benchmarks.temporal_gestures import synthetic_session
+from src.gestos.components.roi import RoiTracker
+
+BENCHMARK_NAME = "roi_tracking"
+FRAME_SIZE = (640, 480)
+
+
+class SimulatedDetector:
+    """
+    Sustituto de MediaPipe: entrega las manos de ``hands`` (frame completo) que
+    tienen al menos ``visible`` de sus landmarks dentro de la imagen recibida,
+    en coordenadas de esa imagen.
+    """
+
+    def __init__(self, frame_size=FRAME_SIZE, visible: float = 0.9):
+        self.frame_size = frame_size
+        self.visible = visible
+        self.roi: Optional[RoiTracker] = None
+        self.hands = np.zeros((0, 21, 3), dtype=np.float32)
+
+    def __call__(self, image: np.ndarray) -> Any:
+        width, height = self.frame_size
+        region = self.roi.region if self.roi is not None else None
+        x0, y0, side = region if region is not None else (0, 0, None)
+        sx = side / width if side else 1.0
+        sy = side / height if side else 1.0
+        local = self.hands.copy()
+        local[..., 0] = (local[..., 0] - x0 / width) / sx
+        local[..., 1] = (local[..., 1] - y0 / height) / sy
+        local[..., 2] /= sx
+        inside = ((local[..., :2] >= 0) & (local[..., :2] <= 1)).all(axis=-1).mean(axis=-1) >= self.visible
+        hands = list(local[inside])
+        return SimpleNamespace(multi_hand_landmarks=hands or None, multi_handedness=None)
+
+
+def two_hand_session(n_frames: int, fps: float = 30.0, seed: int = 0):
+    """
+    Returns:
+        ``(manos, visibles)``: landmarks ``(N, 2, 21, 3)`` y máscara ``(N, 2)``; la
+        segunda mano (espejada) aparece durante 4 s de cada 8
+    """
+    first, timestamps, _ = synthetic_session(n_frames, fps, seed=seed)
+    second = first[::-1].copy()
+    second[..., 0] = 1.0 - second[..., 0]
+    visible = np.ones((n_frames, 2), dtype=bool)
+    visible[:, 1] = (timestamps % 8.0) < 4.0
+    return np.stack([first, second], axis=1), visible
+
+
+def _run(detector: SimulatedDetector, roi: Optional[RoiTracker], frame, hands, visible):
+    """Procesa la sesión; retorna segundos, manos perdidas y error máximo."""
+    missed, error = 0, 0.0
+    start = time.perf_counter()
+    for i in range(len(hands)):
+        truth = hands[i][visible[i]]
+        detector.hands = truth
+        if roi is not None:
+            results = roi.process(frame)
+        else:
+            results = detector(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        found = results.multi_hand_landmarks or []
+        missed += len(truth) - len(found)
+        for hand in found:
+            # Error contra la mano real más cercana
+            error = max(error, float(np.abs(truth - hand).max(axis=(1, 2)).min()))
+    return time.perf_counter() - start, missed, error
+
+
+def run_simulated(frames: int = 3000, input_size: int = 256, seed: int = 0) -> Dict[str, Any]:
+    hands, visible = two_hand_session(frames, seed=seed)
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, size=(FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+
+    detector = SimulatedDetector()
+    full_elapsed, full_missed, _ = _run(detector, None, frame, hands, visible)
+    roi = RoiTracker(detector, max_hands=2, input_size=input_size)
+    detector.roi = roi
+    roi_elapsed, roi_missed, error = _run(detector, roi, frame, hands, visible)
+    report = roi.report()
+    return {
+        'source': f"simulada ({frames} frames)",
+        'frames': frames,
+        'full': {'us_per_frame': full_elapsed / frames * 1e6, 'missed_hands': full_missed},
+        'roi': {
+            'us_per_frame': roi_elapsed / frames * 1e6,
+            'missed_hands': roi_missed,
+            'hit_rate': report['hit_rate'],
+            'fallbacks': report['fallbacks'],
+            'full_frames': report['full'],
+            'max_error': error,
+        },
+    }
+
+
+def run_camera(index: int, frames: int = 600) -> Dict[str, Any]:
+    from src.gestos.components.hand_tracking import HandTracker
+
+    tracker = HandTracker(max_hands=2, detection_con=0.7, track_con=0.7, roi=True)
+    cap = cv2.VideoCapture(index)
+    try:
+        for _ in range(frames):
+            success, frame = cap.read()
+            if not success:
+                break
+            tracker.process_frame(frame)
+    finally:
+        cap.release()
+    return {'source': f"cámara {index}", 'frames': tracker.roi.stats['frames'], 'camera': tracker.roi.report()}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"Fuente: {report['source']}"]
+    if 'camera' in report:
+        r = report['camera']
+        lines.append(
+            f"  recorte en {r['hit_rate']:.0%} de los frames, {r['fallbacks']} reintentos completos  |  "
+            f"completo {r['full_ms']:.1f} ms, recorte {r['roi_ms']:.1f} ms, "
+            f"ahorro {r['saved_ms_per_frame']:.1f} ms/frame"
+        )
+        return "\n".join(lines)
+    full, roi = report['full'], report['roi']
+    lines.append(f"  {'modo':<10}{'µs/frame':>10}{'manos perdidas':>16}")
+    lines.append(f"  {'completo':<10}{full['us_per_frame']:>10.1f}{full['missed_hands']:>16}")
+    lines.append(f"  {'roi':<10}{roi['us_per_frame']:>10.1f}{roi['missed_hands']:>16}")
+    lines.append(
+        f"  recorte en {roi['hit_rate']:.0%} de los frames, {roi['fallbacks']} reintentos, "
+        f"{roi['full_frames']} frames completos, error máximo {roi['max_error']:.1e}"
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aciertos y costo de la inferencia sobre un recorte")
+    parser.add_argument('--camera', type=int, help="Índice de cámara (requiere MediaPipe)")
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--input-size', type=int, default=256)
+    parser.add_argument('--no-save', action='store_true', help="No guardar el resultado")
+    args = parser.parse_args(argv)
+
+    if args.camera is not None:
+        report = run_camera(args.camera, args.frames)
+    else:
+        report = run_simulated(args.frames, args.input_size)
+    print(format_report(report))
+
+    print(compare_with_previous(BENCHMARK_NAME, report))
+    if not args.no_save:
+        print(f"Resultado guardado en {save_result(BENCHMARK_NAME, report)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Benchmark de la escena Pepper's Ghost: copias del modelo vs. instancias aplanadas.
+
+Renderiza offscreen (rasterizador por software, sin GPU) un modelo de muchos
+polígonos en las cuatro vistas y compara:
+
+    - ``copias``: cuatro ``copyTo`` del modelo y los pisos de ``crear_suelos``
+      (como ``renderer.py`` antes del constructor de escena)
+    - ``instancias``: ``build_hologram_scene`` (un modelo aplanado instanciado
+      en cada vista) y pisos aplanados en un único Geom
+    - ``compositor``: ``HologramCompositor`` (cada vista renderizada a textura
+      y compuesta en la cruz), girando y con el modelo quieto (``comp_quieto``),
+      donde las vistas sin cambios no se vuelven a renderizar
+
+Reporta llamadas de dibujo, cambios de estado, nodos, geometría única y
+tiempo por frame.
+
+Uso:
+    python -m src.benchmarks.scene_draw_calls
+    python -m src.benchmarks.scene_draw_calls --triangles 50000 --parts 256 --frames 60
+"""
+import argparse
+import math
+import time
+from typing import Any, Dict
+
+import numpy as np
+from panda3d.core import (
+    Geom, GeomNode, GeomTriangles, GeomVertexData, GeomVertexFormat, NodePath
+)
+
+from src.benchmarks.results import compare_with_previous, save_result
+from src.benchmarks.offscreen import offscreen_base
+
+BENCHMARK_NAME = "scene_draw_calls"
+
+
+def make_sphere_geom(triangles: int, radius: float = 1.0) -> Geom:
+    """Esfera UV de aproximadamente ``triangles`` triángulos."""
+    rings = max(4, int(math.sqrt(triangles / 2)))
+    segments = max(4, triangles // (2 * rings))
+
+    theta = np.linspace(0, np.pi, rings + 1)[:, None]
+    phi = np.linspace(0, 2 * np.pi, segments + 1)[None, :]
+    normals = np.stack([
+        np.sin(theta) * np.cos(phi),
+        np.sin(theta) * np.sin(phi),
+        np.cos(theta) * np.ones_like(phi),
+    ], axis=-1).reshape(-1, 3).astype(np.float32)
+    vertices = np.concatenate([normals * radius, normals], axis=1)
+
+    data = GeomVertexData("esfera", GeomVertexFormat.getV3n3(), Geom.UHStatic)
+    data.uncleanSetNumRows(len(vertices))
+    memoryview(data.modifyArray(0)).cast("B").cast("f")[:] = vertices.ravel()
+
+    r, s = np.meshgrid(np.arange(rings), np.arange(segments), indexing="ij")
+    a = r * (segments + 1) + s
+    b = a + segments + 1
+    indices = np.stack([a, b, a + 1, a + 1, b, b + 1], axis=-1).reshape(-1).astype(np.uint32)
+
+    prim = GeomTriangles(Geom.UHStatic)
+    prim.setIndexType(Geom.NTUint32)
+    handle = prim.modifyVertices()
+    handle.uncleanSetNumRows(len(indices))
+    memoryview(handle).cast("B").cast("I")[:] = indices
+    geom = Geom(data)
+    geom.addPrimitive(prim)
+    return geom
+
+
+def make_test_model(triangles: int = 200000, parts: int = 64) -> NodePath:
+    """Modelo de prueba de muchos polígonos repartido en ``parts`` nodos con el mismo estado."""
+    model = NodePath("modelo_prueba")
+    per_part = max(8, triangles // parts)
+    for i in range(parts):
+        node = GeomNode(f"parte_{i}")
+        node.addGeom(make_sphere_geom(per_part, radius=0.3))
+        part = model.attachNewNode(node)
+        angle = 2 * math.pi * i / parts
+        part.setPos(math.cos(angle) * 0.8, 0, math.sin(angle) * 0.8)
+        part.setColor(0.6, 0.8, 1.0, 0.8)
+    return model
+
+
+def _build_copies(render: NodePath, model: NodePath):
+    """Escena previa: geometría duplicada por vista y cinco pisos separados."""
+    from src.holograma.floors import crear_suelos
+    from src.holograma.scene import DEFAULT_VIEWS, HologramScene
+    from panda3d.core import TransparencyAttrib
+
+    root = render.attachNewNode("holograma_copias")
+    master = root.attachNewNode("maestro")
+    views, base_hprs = {}, {}
+    for name, (pos, hpr) in DEFAULT_VIEWS.items():
+        view = model.copyTo(root)
+        view.setPos(*pos)
+        view.setHpr(*hpr)
+        view.setTransparency(TransparencyAttrib.M_alpha)
+        views[name] = view
+        base_hprs[name] = hpr
+    floors = root.attachNewNode("suelos")
+    crear_suelos(floors)
+    return HologramScene(root, master, model, views, base_hprs, floors)
+
+
+def _measure(base, scene, frames: int) -> Dict[str, Any]:
+    from src.holograma.rotations import aplicar_rotaciones
+    from src.holograma.scene import draw_stats, unique_geometry_bytes
+
+    def update():
+        scene.master.setH(scene.master.getH() + 3)
+        aplicar_rotaciones(
+            scene.master,
+            scene.views["frontal"], scene.base_hprs["frontal"],
+            scene.views["posterior"], scene.base_hprs["posterior"],
+            scene.views["superior"], scene.base_hprs["superior"],
+            scene.views["inferior"], scene.base_hprs["inferior"]
+        )
+
+    # Calentamiento: prepara la geometría en el GSG
+    for _ in range(3):
+        update()
+        base.graphicsEngine.renderFrame()
+
+    times = np.empty(frames)
+    for i in range(frames):
+        start = time.perf_counter()
+        update()
+        base.graphicsEngine.renderFrame()
+        times[i] = time.perf_counter() - start
+
+    stats = draw_stats(scene.root)
+    return {
+        **stats,
+        'nodes': scene.root.findAllMatches("**").getNumPaths(),
+        'geometry_mb': unique_geometry_bytes([scene.root]) / 1e6,
+        'frame_p50_ms': float(np.percentile(times, 50) * 1000),
+        'frame_p95_ms': float(np.percentile(times, 95) * 1000),
+        'frames_per_second': float(frames / times.sum()),
+    }
+
+
+def _measure_compositor(base, model, frames: int, size, rotate: bool = True) -> Dict[str, Any]:
+    from src.holograma.compositor import HologramCompositor
+    from src.holograma.scene import draw_stats, unique_geometry_bytes
+
+    compositor = HologramCompositor(base, model, panel_size=size)
+    base.cam.node().setActive(False)
+    heading = 0.0
+
+    def update():
+        nonlocal heading
+        if rotate:
+            heading += 3
+        compositor.update(heading)
+
+    for _ in range(3):
+        update()
+        base.graphicsEngine.renderFrame()
+    compositor.rendered = compositor.skipped = 0
+
+    times = np.empty(frames)
+    for i in range(frames):
+        start = time.perf_counter()
+        update()
+        base.graphicsEngine.renderFrame()
+        times[i] = time.perf_counter() - start
+
+    scenes = [pivot.getParent() for pivot in compositor.pivots.values()]
+    stats = {'draw_calls': 0, 'state_changes': 0, 'triangles': 0}
+    for scene in scenes + [compositor.root2d]:
+        for key, value in draw_stats(scene).items():
+            stats[key] += value
+    report = {
+        **stats,
+        'nodes': sum(scene.findAllMatches("**").getNumPaths() for scene in scenes),
+        'geometry_mb': unique_geometry_bytes(scenes) / 1e6,
+        'frame_p50_ms': float(np.percentile(times, 50) * 1000),
+        'frame_p95_ms': float(np.percentile(times, 95) * 1000),
+        'frames_per_second': float(frames / times.sum()),
+        **compositor.get_stats(),
+    }
+    compositor.destroy()
+    base.cam.node().setActive(True)
+    return report
+
+
+def run_benchmark(triangles: int = 200000, parts: int = 64, frames: int = 30,
+                  size=(640, 480), renderer: str = "software") -> Dict[str, Any]:
+    """Compara ambas escenas sobre el mismo modelo y retorna sus métricas."""
+    from src.holograma.scene import build_hologram_scene
+
+    base = offscreen_base(*size, renderer=renderer)
+    base.disableMouse()
+    base.camera.setPos(0, -15, 0)
+    base.camera.lookAt(0, 0, 0)
+
+    report = {'triangles': triangles, 'parts': parts, 'frames': frames,
+              'size': f"{size[0]}x{size[1]}", 'renderer': renderer}
+
+    scene = _build_copies(base.render, make_test_model(triangles, parts))
+    report['copias'] = _measure(base, scene, frames)
+    scene.remove()
+
+    scene = build_hologram_scene(base.render, make_test_model(triangles, parts), floors=True)
+    report['instancias'] = _measure(base, scene, frames)
+    scene.remove()
+
+    report['compositor'] = _measure_compositor(base, make_test_model(triangles, parts), frames, size)
+    report['comp_quieto'] = _measure_compositor(base, make_test_model(triangles, parts), frames, size,
+                                                rotate=False)
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Modelo: {report['triangles']:,} triángulos en {report['parts']} partes  |  "
+        f"{report['size']} ({report['renderer']})  |  {report['frames']} frames",
+        f"{'escena':<12}{'draws':>7}{'estados':>9}{'nodos':>7}{'geom MB':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'fps':>8}",
+    ]
+    for name in ('copias', 'instancias', 'compositor', 'comp_quieto'):
+        s = report[name]
+        lines.append(
+            f"{name:<12}{s['draw_calls']:>7}{s['state_changes']:>9}{s['nodes']:>7}{s['geometry_mb']:>9.2f}"
+            f"{s['frame_p50_ms']:>9.2f}{s['frame_p95_ms']:>9.2f}{s['frames_per_second']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Llamadas de dibujo y tiempo por frame de la escena holográfica")
+    parser.add_argument('--triangles', type=int, default=200000)
+    parser.add_argument('--parts', type=int, default=64, help="Nodos en los que se reparte el modelo")
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--size', type=int, nargs=2, default=(640, 480), metavar=('ANCHO', 'ALTO'))
+    parser.add_argument('--renderer', choices=("software", "gl"), default="software")
+    parser.add_argument('--no-save', action='store_true', help="No guardar el resultado")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.triangles, args.parts, args.frames, tuple(args.size), args.renderer)
+    print(format_report(report))
+
+    print(compare_with_previous(BENCHMARK_NAME, report))
+    if not args.no_save:
+        print(f"Resultado guardado en {save_result(BENCHMARK_NAME, report)}")
+
+
+if __name__ == "__main__":
+    main()
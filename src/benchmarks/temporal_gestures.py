@@ -0,0 +1,240 @@
+"""
+Benchmark del reconocedor temporal (swipes y rotación).
+
+Sesión sintética con un guion conocido: pausas, swipes rápidos en las cuatro
+direcciones, desplazamientos lentos (que no deben contar como swipe) y giros de
+la mano, todo con ruido gaussiano. Mide sobre ese guion:
+
+    - ``swipe_recall`` y ``swipe_false``: swipes del guion detectados con la
+      dirección correcta, y swipes detectados que no estaban en el guion
+    - ``rotation_error_deg``: error medio del ángulo acumulado en cada giro
+    - ``rotation_false``: eventos ``ROTATION`` fuera de los giros
+    - throughput (frames/s y µs/frame) con una y dos manos
+
+Con ``--recording`` reproduce una grabación ``.hglm`` (todas sus manos) y
+reporta throughput y eventos detectados.
+
+Uso:
+    python -m src.benchmarks.temporal_gestures
+    python -m src.benchmarks.temporal_gestures --recording sesion.hglm
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.benchmarks.results import compare_with_previous, save_result
+from src.gestos.components.temporal import PALM_IDS, TemporalGestureRecognizer
+from src.gestos.event_system import GestureEvent
+
+BENCHMARK_NAME = "temporal_gestures"
+
+SWIPES = {
+    GestureEvent.SWIPE_LEFT: (-1, 0),
+    GestureEvent.SWIPE_RIGHT: (1, 0),
+    GestureEvent.SWIPE_UP: (0, -1),
+    GestureEvent.SWIPE_DOWN: (0, 1),
+}
+
+
+def hand_template() -> np.ndarray:
+    """Mano abierta con la muñeca bajo los nudillos (dedos hacia arriba)."""
+    from src.gestos.offline.dataset import canonical_poses
+    from src.gestos.components.gesture_mapper import GESTURE_CODES
+
+    hand = canonical_poses()[GESTURE_CODES['OPEN_HAND']].copy()
+    hand[0, :2] = (0.5, 0.62)
+    for i, mcp in enumerate((5, 9, 13, 17)):
+        hand[mcp, :2] = (0.47 + 0.02 * i, 0.5)
+    return hand
+
+
+def _pose(template: np.ndarray, center: np.ndarray, roll: float) -> np.ndarray:
+    """La plantilla girada ``roll`` grados (horario) y con la palma en ``center``."""
+    pivot = template[PALM_IDS, :2].mean(axis=0)
+    c, s = np.cos(np.radians(roll)), np.sin(np.radians(roll))
+    xy = template[:, :2] - pivot
+    hand = template.copy()
+    # Con y hacia abajo, este giro es horario en pantalla
+    hand[:, 0] = center[0] + c * xy[:, 0] - s * xy[:, 1]
+    hand[:, 1] = center[1] + s * xy[:, 0] + c * xy[:, 1]
+    return hand
+
+
+def synthetic_session(n_frames: int = 3000, fps: float = 30.0, noise: float = 0.002,
+                      seed: int = 0) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+    """
+    Returns:
+        ``(landmarks (N, 21, 3), timestamps, guion)``; cada acción del guion
+        tiene ``kind`` (``'swipe'``, ``'slow'`` o ``'rotate'``), ``start``,
+        ``end`` (frames) y ``event`` o ``angle``
+    """
+    rng = np.random.default_rng(seed)
+    template = hand_template()
+    centers = np.zeros((n_frames, 2))
+    rolls = np.zeros(n_frames)
+    script = []
+    center, roll = np.array([0.5, 0.5]), 0.0
+    i = 0
+    while i < n_frames:
+        hold = int(rng.uniform(0.4, 1.0) * fps)
+        centers[i:i + hold], rolls[i:i + hold] = center, roll
+        i += hold
+        if i >= n_frames:
+            break
+        kind = rng.choice(['swipe', 'slow', 'rotate'], p=[0.45, 0.2, 0.35])
+        if kind == 'rotate':
+            duration = rng.uniform(0.4, 0.8)
+            target = float(np.clip(roll + rng.choice([-1, 1]) * rng.uniform(40, 90), -90, 90))
+            action = {'kind': 'rotate', 'angle': target - roll}
+            target_center = center
+        else:
+            # Direcciones que mantienen la palma dentro de la imagen
+            distance = 0.3 if kind == 'swipe' else 0.12
+            duration = rng.uniform(0.15, 0.3) if kind == 'swipe' else rng.uniform(1.0, 1.5)
+            options = [(e, d) for e, d in SWIPES.items()
+                       if np.all(np.abs(center + np.array(d) * distance - 0.5) <= 0.3)]
+            event, direction = options[rng.integers(len(options))]
+            target_center = center + np.array(direction) * distance
+            action = {'kind': kind, 'event': event}
+            target = roll
+        move = max(2, int(duration * fps))
+        s = np.linspace(0, 1, move)
+        profile = 10 * s ** 3 - 15 * s ** 4 + 6 * s ** 5
+        stop = min(i + move, n_frames)
+        centers[i:stop] = (center + (target_center - center) * profile[:, None])[:stop - i]
+        rolls[i:stop] = (roll + (target - roll) * profile)[:stop - i]
+        if stop == i + move:
+            script.append(dict(action, start=i, end=stop))
+        center, roll = target_center, target
+        i = stop
+
+    landmarks = np.stack([_pose(template, c, r) for c, r in zip(centers, rolls)])
+    landmarks += rng.normal(0.0, noise, size=landmarks.shape).astype(np.float32)
+    return landmarks.astype(np.float32), np.arange(n_frames) / fps, script
+
+
+def _run(recognizer: TemporalGestureRecognizer, landmarks, timestamps, num_hands=None):
+    """Alimenta el reconocedor frame a frame; retorna ``(frame, evento, datos)`` y segundos."""
+    events = []
+    start = time.perf_counter()
+    for i in range(len(landmarks)):
+        hands = landmarks[i] if num_hands is None else landmarks[i, :num_hands[i]]
+        for event, data in recognizer.update(hands, timestamps[i]):
+            events.append((i, event, data))
+    return events, time.perf_counter() - start
+
+
+def evaluate_script(events, script, fps: float) -> Dict[str, float]:
+    """Compara los eventos detectados con el guion."""
+    slack = int(0.3 * fps)
+    swipes = [a for a in script if a['kind'] == 'swipe']
+    rotations = [a for a in script if a['kind'] == 'rotate']
+    swipe_events = [(i, e) for i, e, _ in events if e in SWIPES]
+    matched = set()
+    hits = 0
+    for action in swipes:
+        for k, (i, event) in enumerate(swipe_events):
+            if k not in matched and action['start'] <= i <= action['end'] + slack and event == action['event']:
+                matched.add(k)
+                hits += 1
+                break
+
+    rotation_events = [(i, d['delta']) for i, e, d in events if e == GestureEvent.ROTATION]
+    inside = set()
+    errors = []
+    for action in rotations:
+        steps = [(k, delta) for k, (i, delta) in enumerate(rotation_events)
+                 if action['start'] <= i <= action['end'] + slack]
+        inside.update(k for k, _ in steps)
+        errors.append(abs(sum(delta for _, delta in steps) - action['angle']))
+    return {
+        'swipes': len(swipes),
+        'swipe_recall': hits / len(swipes) if swipes else 1.0,
+        'swipe_false': len(swipe_events) - len(matched),
+        'rotations': len(rotations),
+        'rotation_error_deg': float(np.mean(errors)) if errors else 0.0,
+        'rotation_false': len(rotation_events) - len(inside),
+    }
+
+
+def _throughput(events, elapsed: float, frames: int) -> Dict[str, float]:
+    return {
+        'frames_per_s': frames / elapsed,
+        'us_per_frame': elapsed / frames * 1e6,
+        'events': len(events),
+    }
+
+
+def run_benchmark(recording: Optional[Path] = None, frames: int = 3000, fps: float = 30.0,
+                  seed: int = 0) -> Dict[str, Any]:
+    if recording is not None:
+        from src.gestos.offline.recording import Recording
+
+        rec = Recording(recording)
+        timestamps = np.asarray(rec.timestamps, dtype=np.float64)
+        recognizer = TemporalGestureRecognizer(max_hands=rec.max_hands)
+        events, elapsed = _run(recognizer, rec.landmarks, timestamps, rec.records['num_hands'])
+        counts = {}
+        for _, event, _ in events:
+            counts[event.value] = counts.get(event.value, 0) + 1
+        return {
+            'source': str(recording),
+            'frames': len(rec),
+            'hands': {str(rec.max_hands): _throughput(events, elapsed, len(rec))},
+            'detected': counts,
+        }
+
+    landmarks, timestamps, script = synthetic_session(frames, fps, seed=seed)
+    events, elapsed = _run(TemporalGestureRecognizer(max_hands=1), landmarks, timestamps)
+    # Dos manos: la segunda es la misma sesión desplazada
+    two = np.stack([landmarks, landmarks[::-1]], axis=1)
+    events_two, elapsed_two = _run(TemporalGestureRecognizer(max_hands=2), two, timestamps)
+    return {
+        'source': f"sintética ({frames} frames)",
+        'frames': frames,
+        'hands': {
+            '1': _throughput(events, elapsed, frames),
+            '2': _throughput(events_two, elapsed_two, frames),
+        },
+        'accuracy': evaluate_script(events, script, fps),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"Fuente: {report['source']}  |  {report['frames']} frames",
+             f"{'manos':<8}{'frames/s':>12}{'µs/frame':>10}{'eventos':>9}"]
+    for hands, s in report['hands'].items():
+        lines.append(f"{hands:<8}{s['frames_per_s']:>12.0f}{s['us_per_frame']:>10.1f}{s['events']:>9}")
+    if 'accuracy' in report:
+        a = report['accuracy']
+        lines.append(
+            f"Swipes: {a['swipe_recall']:.0%} de {a['swipes']} detectados, {a['swipe_false']} falsos  |  "
+            f"Giros: error medio {a['rotation_error_deg']:.1f}° en {a['rotations']}, "
+            f"{a['rotation_false']} eventos fuera de giro"
+        )
+    if 'detected' in report:
+        lines.append("Eventos: " + ", ".join(f"{k}={v}" for k, v in sorted(report['detected'].items())))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Swipes y rotación sobre la historia de landmarks")
+    parser.add_argument('--recording', type=Path, help="Grabación .hglm a reproducir")
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--no-save', action='store_true', help="No guardar el resultado")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.recording, args.frames, args.fps)
+    print(format_report(report))
+
+    print(compare_with_previous(BENCHMARK_NAME, report))
+    if not args.no_save:
+        print(f"Resultado guardado en {save_result(BENCHMARK_NAME, report)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Filtros adaptativos de landmarks.
+
+Todos los filtros reciben la mano completa como array (``(21, 3)``, o
+``(N, 21, 3)`` para varias manos, o cualquier otra forma) y la filtran en una
+sola operación vectorizada por frame:
+
+    - ``OneEuroFilter``: pasabajos cuya frecuencia de corte crece con la
+      velocidad; casi sin jitter en reposo y con poco retardo en movimientos
+      rápidos.
+    - ``KalmanFilter``: Kalman de velocidad constante por coordenada.
+    - ``ExponentialFilter``: el suavizado de factor fijo que usaba
+      ``CursorControl`` (referencia para comparar).
+
+Cada consumidor (cursor, rotación, clasificación) tiene su configuración en
+``FILTER_PRESETS``; ``make_filter`` crea el filtro correspondiente.
+"""
+import math
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Fallback de dt cuando dos muestras llegan con la misma marca de tiempo
+DEFAULT_DT = 1.0 / 30.0
+
+
+class LandmarkFilter:
+    """
+    Base de los filtros: estado, marca de tiempo y reinicio al perder la mano.
+
+    Args:
+        max_gap: Si pasan más de ``max_gap`` segundos entre muestras (mano
+            perdida) el filtro se reinicia con la muestra nueva
+    """
+
+    def __init__(self, max_gap: float = 0.5):
+        self.max_gap = max_gap
+        self._x: Optional[np.ndarray] = None
+        self._t = 0.0
+
+    def reset(self) -> None:
+        self._x = None
+
+    def __call__(self, x: Any, timestamp: Optional[float] = None, reset: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Filtra una muestra.
+
+        Args:
+            x: Landmarks (cualquier forma; se convierte a ``float32``)
+            timestamp: Segundos de la muestra (por defecto ``time.perf_counter()``)
+            reset: Máscara booleana sobre el primer eje: esas filas (p. ej. una
+                mano nueva en su slot) se reinician con la muestra en vez de filtrarse
+
+        Returns:
+            Array filtrado con la forma de ``x`` (copia: no cambia con el filtro)
+        """
+        x = np.asarray(x, dtype=np.float32)
+        t = time.perf_counter() if timestamp is None else timestamp
+        if self._x is None or self._x.shape != x.shape or t - self._t > self.max_gap:
+            self._x = x.copy()
+            self._init_state(x)
+        else:
+            dt = t - self._t
+            self._update(x, dt if dt > 0 else DEFAULT_DT)
+            if reset is not None and np.any(reset):
+                self._x[reset] = x[reset]
+                self._reset_rows(reset)
+        self._t = t
+        return self._x.copy()
+
+    def _init_state(self, x: np.ndarray) -> None:
+        pass
+
+    def _reset_rows(self, rows: np.ndarray) -> None:
+        pass
+
+    def _update(self, x: np.ndarray, dt: float) -> None:
+        raise NotImplementedError
+
+
+class ExponentialFilter(LandmarkFilter):
+    """Suavizado exponencial de factor fijo: ``x += (medida - x) / smoothening``."""
+
+    def __init__(self, smoothening: float = 7.0, max_gap: float = 0.5):
+        super().__init__(max_gap)
+        self.smoothening = smoothening
+
+    def _update(self, x, dt):
+        self._x += (x - self._x) / self.smoothening
+
+
+def _alpha(cutoff, dt: float):
+    """Factor del pasabajos de primer orden para una frecuencia de corte (Hz)."""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter(LandmarkFilter):
+    """
+    Filtro One-Euro (Casiez et al., 2012) vectorizado.
+
+    Args:
+        min_cutoff: Frecuencia de corte en reposo (Hz); menor = menos jitter
+        beta: Cuánto sube el corte con la velocidad; mayor = menos retardo
+        d_cutoff: Frecuencia de corte del estimador de velocidad (Hz)
+        per_point: La velocidad de cada punto es la norma de su último eje, así
+            x, y, z de un landmark comparten el mismo corte
+        max_gap: Ver ``LandmarkFilter``
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.0, d_cutoff: float = 1.0,
+                 per_point: bool = True, max_gap: float = 0.5):
+        super().__init__(max_gap)
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.per_point = per_point
+        self._dx: Optional[np.ndarray] = None
+
+    def _init_state(self, x):
+        self._dx = np.zeros_like(x)
+
+    def _reset_rows(self, rows):
+        self._dx[rows] = 0
+
+    def _update(self, x, dt):
+        self._dx += _alpha(self.d_cutoff, dt) * ((x - self._x) / dt - self._dx)
+        if self.per_point and x.ndim:
+            speed = np.sqrt((self._dx * self._dx).sum(axis=-1, keepdims=True))
+        else:
+            speed = np.abs(self._dx)
+        self._x += _alpha(self.min_cutoff + self.beta * speed, dt) * (x - self._x)
+
+
+class KalmanFilter(LandmarkFilter):
+    """
+    Kalman de velocidad constante, independiente por coordenada.
+
+    Todas las coordenadas comparten dt y ruidos, así que la covarianza (2x2)
+    es la misma para todas y se lleva como tres escalares: por frame sólo el
+    estado (posición y velocidad) es un array.
+
+    Args:
+        process_noise: Densidad espectral de la aceleración (unidades²/s³);
+            mayor = sigue antes los cambios de velocidad
+        measurement_noise: Varianza del ruido de medición (unidades²)
+        max_gap: Ver ``LandmarkFilter``
+    """
+
+    def __init__(self, process_noise: float = 1.0, measurement_noise: float = 1e-5, max_gap: float = 0.5):
+        super().__init__(max_gap)
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self._v: Optional[np.ndarray] = None
+
+    def _init_state(self, x):
+        self._v = np.zeros_like(x)
+        self._p = [self.measurement_noise, 0.0, 1.0]
+
+    def _reset_rows(self, rows):
+        self._v[rows] = 0
+
+    @property
+    def velocity(self) -> Optional[np.ndarray]:
+        """Velocidad estimada de cada coordenada (unidades/s)."""
+        return None if self._v is None else self._v.copy()
+
+    def _update(self, x, dt):
+        p00, p01, p11 = self._p
+        q = self.process_noise
+        # Predicción
+        self._x += self._v * dt
+        p00 += dt * (2 * p01 + dt * p11) + q * dt ** 3 / 3
+        p01 += dt * p11 + q * dt ** 2 / 2
+        p11 += q * dt
+        # Corrección
+        s = p00 + self.measurement_noise
+        k0, k1 = p00 / s, p01 / s
+        residual = x - self._x
+        self._x += k0 * residual
+        self._v += k1 * residual
+        self._p = [(1 - k0) * p00, (1 - k0) * p01, p11 - k1 * p01]
+
+
+FILTERS = {
+    'one_euro': OneEuroFilter,
+    'kalman': KalmanFilter,
+    'exponential': ExponentialFilter,
+}
+
+# Configuración por consumidor (coordenadas normalizadas 0..1, tiempo en segundos),
+# ajustada con src/benchmarks/landmark_filters.py
+FILTER_PRESETS: Dict[str, Dict[str, Any]] = {
+    # Cursor: quieto sin temblor, pero sin arrastrarse al mover rápido
+    'cursor': {'kind': 'one_euro', 'min_cutoff': 0.5, 'beta': 15.0, 'd_cutoff': 1.0},
+    # Rotación: la velocidad estimada también sirve para el ángulo y su predicción
+    'rotation': {'kind': 'kalman', 'process_noise': 0.3, 'measurement_noise': 1e-5},
+    # Clasificación: sólo quitar el ruido de alta frecuencia que hace parpadear el gesto
+    'classification': {'kind': 'one_euro', 'min_cutoff': 2.0, 'beta': 20.0, 'd_cutoff': 1.0},
+}
+
+
+def make_filter(consumer: str = 'cursor', **overrides) -> LandmarkFilter:
+    """
+    Crea el filtro configurado para un consumidor.
+
+    Args:
+        consumer: Clave de ``FILTER_PRESETS`` o directamente un tipo de ``FILTERS``
+        overrides: Parámetros que reemplazan a los del preset (incluido ``kind``)
+    """
+    if consumer in FILTER_PRESETS:
+        params = dict(FILTER_PRESETS[consumer], **overrides)
+    elif consumer in FILTERS:
+        params = dict(overrides, kind=consumer)
+    else:
+        raise ValueError(f"Consumidor o filtro desconocido: {consumer}")
+    kind = params.pop('kind')
+    return FILTERS[kind](**params)
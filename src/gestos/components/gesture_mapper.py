@@ -1,48 +1,95 @@
 import numpy as np
 
+from src.utils.config import CLICK_RELEASE_THRESHOLD, CLICK_THRESHOLD
+from src.gestos.components.landmarks import as_landmark_array, fingers_up, landmark_distance_sq
+
+# Nombres de gesto indexados por el código que retorna ``detect_batch`` (0 = ninguno)
+GESTURE_NAMES = (None, "CLICK", "POINTING", "OPEN_HAND", "FIST")
+GESTURE_CODES = {name: code for code, name in enumerate(GESTURE_NAMES) if name}
+
+# Tabla máscara de dedos levantados -> gesto (sin contar el clic)
+_FINGER_BITS = np.array([1, 2, 4, 8, 16])
+_MASK_TO_GESTURE = np.zeros(32, dtype=np.int8)
+_MASK_TO_GESTURE[0b00000] = GESTURE_CODES["FIST"]
+_MASK_TO_GESTURE[0b00010] = GESTURE_CODES["POINTING"]  # Sólo el índice
+_MASK_TO_GESTURE[0b11111] = GESTURE_CODES["OPEN_HAND"]
+
+
 class GestureMapper:
-    def __init__(self):
+    CLICK_THRESHOLD = CLICK_THRESHOLD  # Umbral de distancia pulgar-índice para el clic
+    CLICK_RELEASE_THRESHOLD = CLICK_RELEASE_THRESHOLD  # Distancia para soltar el clic
+
+    def __init__(self, click_threshold=CLICK_THRESHOLD, landmark_filter=None, click_release=None):
+        """
+        Args:
+            click_threshold: Distancia pulgar-índice bajo la que se detecta el clic
+            landmark_filter: Filtro opcional (p. ej. ``make_filter("classification")``)
+                aplicado en ``detect_gesture`` antes de clasificar
+            click_release: Distancia sobre la que ``detect_gesture`` suelta un clic
+                en curso (histéresis); por defecto escala con ``click_threshold``
+        """
         # Índices de los landmarks de las puntas de los dedos
         self.tip_ids = [4, 8, 12, 16, 20]
+        self.click_threshold = click_threshold
+        if click_release is None:
+            click_release = click_threshold * CLICK_RELEASE_THRESHOLD / CLICK_THRESHOLD
+        self.click_release = click_release
+        self.landmark_filter = landmark_filter
+        self._clicking = False
+
+    def detect_gesture(self, hand_landmarks, timestamp=None):
+        """
+        Clasifica una mano.
+
+        Mientras dura un clic el umbral pasa a ``click_release``, así la
+        distancia oscilando cerca de ``click_threshold`` no lo corta y reanuda.
+
+        Args:
+            hand_landmarks: Landmarks de MediaPipe, ``HandLandmarks`` o array ``(21, 3)``
+            timestamp: Segundos de la muestra para el filtro (por defecto, ahora)
 
-    def detect_gesture(self, hand_landmarks):
-        if not hand_landmarks:
+        Returns:
+            Nombre del gesto o None si no se reconoce ninguno
+        """
+        if hand_landmarks is None:
+            self._clicking = False
             return None
 
-        landmarks = hand_landmarks.landmark
-
-        # --- Contar dedos levantados ---
-        fingers_up = []
-        # Pulgar (eje X)
-        if landmarks[self.tip_ids[0]].x < landmarks[self.tip_ids[0] - 1].x:
-            fingers_up.append(1)
-        else:
-            fingers_up.append(0)
-        
-        # Otros 4 dedos (eje Y)
-        for i in range(1, 5):
-            if landmarks[self.tip_ids[i]].y < landmarks[self.tip_ids[i] - 2].y:
-                fingers_up.append(1)
-            else:
-                fingers_up.append(0)
-
-        total_fingers = fingers_up.count(1)
-
-        # --- Detección de gesto de clic ---
-        # Calcular distancia entre la punta del pulgar y el índice
-        thumb_tip = np.array([landmarks[4].x, landmarks[4].y])
-        index_tip = np.array([landmarks[8].x, landmarks[8].y])
-        distance = np.linalg.norm(thumb_tip - index_tip)
-
-        if distance < 0.05: # Umbral de distancia para el clic
-            return "CLICK"
-
-        # --- Mapeo de gestos basado en dedos levantados ---
-        if total_fingers == 1 and fingers_up[1]:
-            return "POINTING"
-        if total_fingers == 5:
-            return "OPEN_HAND"
-        if total_fingers == 0:
-            return "FIST"
-        
-        return None # Ningún gesto reconocido
+        landmarks = as_landmark_array(hand_landmarks)
+        if self.landmark_filter is not None:
+            landmarks = self.landmark_filter(landmarks, timestamp)
+        threshold = self.click_release if self._clicking else self.click_threshold
+        gesture = GESTURE_NAMES[int(self.detect_batch(landmarks, threshold))]
+        self._clicking = gesture == "CLICK"
+        return gesture
+
+    def detect_batch(self, landmarks, click_threshold=None):
+        """
+        Clasifica un lote de manos de forma vectorizada.
+
+        Args:
+            landmarks: Array ``(N, 21, 3)`` (o ``(21, 3)`` para una sola mano)
+            click_threshold: Umbral de clic para este lote (por defecto ``self.click_threshold``)
+
+        Returns:
+            Array ``int8`` de códigos de gesto (índices en ``GESTURE_NAMES``)
+        """
+        landmarks = np.asarray(landmarks)
+
+        # --- Dedos levantados como máscara de 5 bits (pulgar = bit 0) ---
+        mask = fingers_up(landmarks) @ _FINGER_BITS
+
+        # --- Distancia (al cuadrado) entre la punta del pulgar y el índice ---
+        distance_sq = landmark_distance_sq(landmarks)
+
+        # El clic tiene prioridad, salvo con la mano cerrada: en un puño el
+        # pulgar queda siempre junto al índice
+        if click_threshold is None:
+            click_threshold = self.click_threshold
+        click = (distance_sq < click_threshold ** 2) & (mask > 0)
+        return np.where(click, GESTURE_CODES["CLICK"], _MASK_TO_GESTURE[mask]).astype(np.int8)
+
+    @staticmethod
+    def gesture_names(codes):
+        """Convierte códigos de gesto en sus nombres."""
+        return [GESTURE_NAMES[int(code)] for code in np.ravel(codes)]
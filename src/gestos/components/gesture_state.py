@@ -0,0 +1,125 @@
+"""
+Máquina de estados que estabiliza los gestos clasificados frame a frame.
+
+Un frame mal clasificado no debe disparar un clic ni un arrastre. Todos los
+puntos de entrada (``GestureApp``, ``GestureController``, ``detector.main`` y
+el motor offline) pasan la clasificación cruda por ``GestureStateMachine``:
+
+    - Votación N de M sobre una ventana de *tiempo* (no de frames): el
+      comportamiento no cambia con los FPS de la cámara.
+    - Histéresis: un gesto se activa con ``enter_votes`` de los frames de la
+      ventana y se suelta recién cuando baja de ``exit_votes``.
+    - Cooldown: el mismo gesto no vuelve a disparar antes de ``cooldown``
+      segundos (``config.GESTURE_COOLDOWN``).
+    - Los gestos ``continuous`` (p. ej. mover el cursor) se reportan en cada
+      frame mientras están activos; los demás sólo al activarse, o cada
+      ``repeat`` segundos si se mantienen.
+"""
+import time
+from collections import deque
+from typing import Dict, Hashable, Iterable, Optional
+
+from src.utils.config import (
+    GESTURE_COOLDOWN,
+    GESTURE_ENTER_VOTES,
+    GESTURE_EXIT_VOTES,
+    GESTURE_VOTE_WINDOW,
+)
+
+
+class GestureStateMachine:
+    """
+    Estado estable del gesto de una mano.
+
+    Args:
+        window: Segundos de historia que votan
+        enter_votes: Fracción de frames de la ventana para activar un gesto
+        exit_votes: Fracción bajo la cual el gesto activo se suelta
+        min_frames: Frames mínimos a favor para activar (evita activar con uno solo)
+        cooldown: Segundos antes de que el mismo gesto pueda volver a disparar
+        repeat: Si no es None, un gesto discreto sostenido vuelve a disparar
+            cada ``repeat`` segundos
+        continuous: Gestos que se reportan en todos los frames mientras están activos
+    """
+
+    def __init__(
+        self,
+        window: float = GESTURE_VOTE_WINDOW,
+        enter_votes: float = GESTURE_ENTER_VOTES,
+        exit_votes: float = GESTURE_EXIT_VOTES,
+        min_frames: int = 2,
+        cooldown: float = GESTURE_COOLDOWN,
+        repeat: Optional[float] = None,
+        continuous: Iterable[Hashable] = (),
+    ):
+        if not 0 <= exit_votes < enter_votes <= 1:
+            raise ValueError("Se requiere 0 <= exit_votes < enter_votes <= 1")
+        self.window = window
+        self.enter_votes = enter_votes
+        self.exit_votes = exit_votes
+        self.min_frames = min_frames
+        self.cooldown = cooldown
+        self.repeat = repeat
+        self.continuous = frozenset(continuous)
+
+        self._frames = deque()
+        self._votes: Dict[Hashable, int] = {}
+        self._fired: Dict[Hashable, float] = {}
+        self.state: Optional[Hashable] = None
+        self.stats = {'frames': 0, 'transitions': 0, 'fired': 0, 'suppressed': 0}
+
+    def reset(self) -> None:
+        """Olvida la historia y el gesto activo (los cooldowns se conservan)."""
+        self._frames.clear()
+        self._votes.clear()
+        self.state = None
+
+    def update(self, gesture: Optional[Hashable], timestamp: Optional[float] = None) -> Optional[Hashable]:
+        """
+        Agrega la clasificación de un frame.
+
+        Args:
+            gesture: Gesto crudo del frame (None si no hay gesto o no hay mano)
+            timestamp: Segundos de la captura (por defecto ``time.perf_counter()``)
+
+        Returns:
+            El gesto que debe ejecutar su acción en este frame, o None
+        """
+        t = time.perf_counter() if timestamp is None else timestamp
+        self.stats['frames'] += 1
+        self._frames.append((t, gesture))
+        self._votes[gesture] = self._votes.get(gesture, 0) + 1
+        while self._frames[0][0] < t - self.window:
+            _, old = self._frames.popleft()
+            self._votes[old] -= 1
+
+        total = len(self._frames)
+        state = self.state
+        if state is not None and self._votes.get(state, 0) < self.exit_votes * total:
+            state = None
+
+        # El gesto nuevo con más votos reemplaza al activo si llega al umbral de entrada
+        candidate = gesture if gesture is not None else state
+        votes = self._votes.get(candidate, 0)
+        entered = (candidate is not None and candidate != state
+                   and votes >= self.min_frames and votes >= self.enter_votes * total)
+        if entered:
+            state = candidate
+        if state != self.state:
+            self.state = state
+            self.stats['transitions'] += 1
+        if state is None:
+            return None
+
+        # Los continuos se reportan siempre; los discretos al activarse (fuera
+        # del cooldown) o cada ``repeat`` segundos mientras se sostienen
+        if state not in self.continuous:
+            if entered:
+                if t - self._fired.get(state, float('-inf')) < self.cooldown:
+                    self.stats['suppressed'] += 1
+                    return None
+            elif self.repeat is None or t - self._fired[state] < self.repeat:
+                return None
+        self._fired[state] = t
+        self.stats['fired'] += 1
+        return state
@@ -1,8 +1,10 @@
 import cv2
 import mediapipe as mp
 
+from src.gestos.components.roi import RoiTracker
+
 class HandTracker:
-    def __init__(self, mode=False, max_hands=2, detection_con=0.5, track_con=0.5):
+    def __init__(self, mode=False, max_hands=2, detection_con=0.5, track_con=0.5, roi=False):
         self.mode = mode
         self.max_hands = max_hands
         self.detection_con = detection_con
@@ -11,10 +13,28 @@ class HandTracker:
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(self.mode, self.max_hands, 1, self.detection_con, self.track_con)
         self.mp_draw = mp.solutions.drawing_utils
+        # Inferencia sobre un recorte alrededor de las manos seguidas (src/gestos/components/roi.py);
+        # los recortes van a un Hands en modo imagen estática, sin el seguimiento del modo video
+        self.roi = None
+        if roi:
+            self.crop_hands = self.mp_hands.Hands(True, self.max_hands, 1, self.detection_con, self.track_con)
+            self.roi = RoiTracker(self.hands.process, max_hands, crop_infer=self.crop_hands.process)
+
+        # LandmarkRecorder opcional (src/gestos/offline/recording.py)
+        self.recorder = None
 
     def process_frame(self, frame):
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(frame_rgb)
+        if self.roi is not None:
+            results = self.roi.process(frame)
+        else:
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            results = self.hands.process(frame_rgb)
+        
+        # Grabar antes de dibujar para guardar el frame limpio; la UI puede
+        # quitar y cerrar el recorder en cualquier momento: leerlo una vez
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(results, frame)
         
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
@@ -0,0 +1,186 @@
+"""
+Etapa de inferencia en un hilo dedicado.
+
+Recibe frames etiquetados con su id, ejecuta ``HandTracker.process_frame`` (o
+cualquier función equivalente) fuera del hilo de la UI y entrega los resultados
+por una cola, de modo que captura, inferencia, mapeo y display se solapan.
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from src.utils.metrics import LatencyRecorder
+
+
+class InferenceResult(NamedTuple):
+    """Resultado de inferencia asociado al frame que lo produjo."""
+    frame_id: int
+    frame: Any
+    results: Any
+    capture_time: float
+    done_time: float
+
+
+class InferenceWorker:
+    """
+    Ejecuta la inferencia de manos en un hilo aparte.
+
+    Modos de contrapresión:
+        - ``"latest"``: sólo se conserva el frame pendiente más reciente; los
+          anteriores se descartan (mínima latencia).
+        - ``"queue"``: cola FIFO acotada; si está llena el frame nuevo se descarta
+          (no se pierde ningún frame encolado).
+    """
+
+    BACKPRESSURE_MODES = ("latest", "queue")
+
+    def __init__(
+        self,
+        process_fn: Callable[[Any], Any],
+        backpressure: str = "latest",
+        max_queue: int = 4,
+        latency: Optional[LatencyRecorder] = None,
+        on_result: Optional[Callable[[InferenceResult], None]] = None
+    ):
+        """
+        Args:
+            process_fn: Función ``frame -> (frame, results)``, p. ej. ``HandTracker.process_frame``
+            backpressure: ``"latest"`` o ``"queue"``
+            max_queue: Tamaño máximo de las colas de entrada y salida
+            latency: Registro de latencias compartido con el resto del pipeline
+            on_result: Callback opcional invocado desde el hilo del worker
+                (p. ej. para emitir una señal de Qt)
+        """
+        if backpressure not in self.BACKPRESSURE_MODES:
+            raise ValueError(f"Modo de contrapresión inválido: {backpressure}")
+
+        self.process_fn = process_fn
+        self.backpressure = backpressure
+        self.latency = latency if latency is not None else LatencyRecorder()
+        self.on_result = on_result
+
+        self._inbox: queue.Queue = queue.Queue(maxsize=1 if backpressure == "latest" else max_queue)
+        self._results: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self.running = False
+
+        self.submitted = 0
+        self.dropped = 0
+        self.processed = 0
+        self.errors = 0
+
+    def start(self) -> "InferenceWorker":
+        """Inicia el hilo de inferencia."""
+        if not self.running:
+            self.running = True
+            self._thread = threading.Thread(target=self._run, name="InferenceWorker", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, frame_id: int, frame: Any, capture_time: Optional[float] = None) -> bool:
+        """
+        Encola un frame para inferencia sin bloquear.
+
+        El worker toma posesión de ``frame``: el llamador no debe modificarlo después.
+
+        Returns:
+            True si el frame quedó encolado, False si se descartó
+        """
+        item = (frame_id, frame, capture_time if capture_time is not None else time.perf_counter(),
+                time.perf_counter())
+        self.submitted += 1
+
+        if self.backpressure == "latest":
+            # Reemplazar el frame pendiente (si lo hay) por el más reciente
+            try:
+                self._inbox.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self._inbox.put_nowait(item)
+            except queue.Full:
+                self.dropped += 1
+                return False
+            return True
+
+        try:
+            self._inbox.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        """Bucle del hilo de inferencia."""
+        while self.running:
+            try:
+                frame_id, frame, capture_time, submit_time = self._inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            start = time.perf_counter()
+            self.latency.record('queue', start - submit_time)
+            try:
+                frame, results = self.process_fn(frame)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ Error en inferencia: {e}")
+                continue
+            done = time.perf_counter()
+            self.latency.record('inference', done - start)
+            self.processed += 1
+
+            result = InferenceResult(frame_id, frame, results, capture_time, done)
+            if self.on_result:
+                self.on_result(result)
+            self._put_result(result)
+
+    def _put_result(self, result: InferenceResult):
+        """Entrega un resultado descartando el más antiguo si la cola está llena."""
+        while True:
+            try:
+                self._results.put_nowait(result)
+                return
+            except queue.Full:
+                try:
+                    self._results.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get_result(self, timeout: float = 0.0) -> Optional[InferenceResult]:
+        """Retorna el siguiente resultado o None si no hay ninguno disponible."""
+        try:
+            if timeout > 0:
+                return self._results.get(timeout=timeout)
+            return self._results.get_nowait()
+        except queue.Empty:
+            return None
+
+    def get_latest_result(self) -> Optional[InferenceResult]:
+        """Vacía la cola de resultados y retorna sólo el más reciente."""
+        latest = None
+        while True:
+            result = self.get_result()
+            if result is None:
+                return latest
+            latest = result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna contadores del worker y el reporte de latencia por etapa."""
+        return {
+            'backpressure': self.backpressure,
+            'submitted': self.submitted,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'latency': self.latency.report(),
+        }
+
+    def stop(self):
+        """Detiene el hilo de inferencia."""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
@@ -0,0 +1,135 @@
+"""
+Representación compacta de landmarks de mano sobre arrays de NumPy.
+
+Una mano son 21 landmarks (x, y, z) normalizados guardados en un único array
+``(21, 3)`` float32. Todas las funciones de este módulo aceptan además lotes
+``(N, 21, 3)`` y operan de forma vectorizada sobre el último par de ejes.
+"""
+from itertools import chain
+from typing import Any, List, NamedTuple, Optional
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# Índices de los landmarks de las puntas de los dedos (pulgar, índice, medio, anular, meñique)
+TIP_IDS = np.array([4, 8, 12, 16, 20])
+THUMB_TIP = 4
+INDEX_TIP = 8
+
+
+class Landmark(NamedTuple):
+    """Vista de un landmark compatible con ``landmark.x/.y/.z`` de MediaPipe."""
+    x: float
+    y: float
+    z: float
+
+
+class HandLandmarks:
+    """
+    Contenedor de los landmarks de una mano respaldado por un array ``(21, 3)``.
+
+    Se llena una sola vez por mano a partir del resultado de MediaPipe y desde
+    ahí toda la lógica trabaja sobre ``array`` sin acceder a atributos por landmark.
+    """
+
+    __slots__ = ('array', 'handedness')
+
+    def __init__(self, array: Optional[np.ndarray] = None, handedness: Optional[str] = None):
+        if array is None:
+            array = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self.array = np.asarray(array, dtype=np.float32).reshape(NUM_LANDMARKS, 3)
+        self.handedness = handedness
+
+    @classmethod
+    def from_mediapipe(cls, hand_landmarks: Any, handedness: Optional[str] = None) -> "HandLandmarks":
+        """Crea el contenedor a partir de un ``NormalizedLandmarkList`` de MediaPipe."""
+        hand = cls(handedness=handedness)
+        hand.fill(hand_landmarks)
+        return hand
+
+    def fill(self, hand_landmarks: Any) -> "HandLandmarks":
+        """Copia los landmarks de MediaPipe en el array existente (sin reasignarlo)."""
+        fill_landmarks(self.array, hand_landmarks)
+        return self
+
+    @property
+    def landmark(self) -> List[Landmark]:
+        """Acceso estilo MediaPipe para código que aún usa ``landmark[i].x``."""
+        return [Landmark(*map(float, row)) for row in self.array]
+
+    def to_pixels(self, width: int, height: int) -> np.ndarray:
+        """Retorna las coordenadas ``(21, 2)`` en píxeles."""
+        return (self.array[:, :2] * (width, height)).astype(np.int32)
+
+    def __len__(self) -> int:
+        return NUM_LANDMARKS
+
+
+def fill_landmarks(out: np.ndarray, hand_landmarks: Any) -> np.ndarray:
+    """
+    Copia una mano (MediaPipe, ``HandLandmarks`` o array) en ``out`` de forma ``(21, 3)``.
+    """
+    if isinstance(hand_landmarks, HandLandmarks):
+        np.copyto(out, hand_landmarks.array)
+    elif isinstance(hand_landmarks, np.ndarray):
+        np.copyto(out, hand_landmarks)
+    else:
+        values = np.fromiter(
+            chain.from_iterable((lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark),
+            dtype=np.float32,
+            count=NUM_LANDMARKS * 3
+        )
+        out[...] = values.reshape(NUM_LANDMARKS, 3)
+    return out
+
+
+def as_landmark_array(hand_landmarks: Any) -> Optional[np.ndarray]:
+    """
+    Normaliza cualquier representación de mano a un array ``(..., 21, 3)``.
+
+    Acepta arrays, ``HandLandmarks`` u objetos de MediaPipe (con ``.landmark``).
+    """
+    if hand_landmarks is None:
+        return None
+    if isinstance(hand_landmarks, np.ndarray):
+        return hand_landmarks
+    if isinstance(hand_landmarks, HandLandmarks):
+        return hand_landmarks.array
+    return HandLandmarks.from_mediapipe(hand_landmarks).array
+
+
+# Para cada dedo: (punta, articulación de referencia, eje comparado)
+_FINGER_REFS = TIP_IDS - np.array([1, 2, 2, 2, 2])
+_FINGER_AXES = np.array([0, 1, 1, 1, 1])
+_THUMB_SIGNS = {True: np.array([1, 1, 1, 1, 1]), False: np.array([-1, 1, 1, 1, 1])}
+
+
+def fingers_up(landmarks: np.ndarray, thumb_left: bool = True) -> np.ndarray:
+    """
+    Estado (levantado/bajado) de los cinco dedos.
+
+    El pulgar se mide en X contra su articulación anterior y los otros cuatro
+    dedos en Y contra su articulación PIP, todo en una sola indexación.
+
+    Args:
+        landmarks: Array ``(..., 21, 3)`` (también sirve en píxeles ``(..., 21, >=2)``)
+        thumb_left: Si True el pulgar cuenta como levantado cuando su punta queda
+            a la izquierda de la articulación anterior (imagen en espejo)
+
+    Returns:
+        Array booleano ``(..., 5)``
+    """
+    delta = landmarks[..., TIP_IDS, _FINGER_AXES] - landmarks[..., _FINGER_REFS, _FINGER_AXES]
+    return delta * _THUMB_SIGNS[thumb_left] < 0
+
+
+def landmark_distance_sq(landmarks: np.ndarray, a: int = THUMB_TIP, b: int = INDEX_TIP) -> np.ndarray:
+    """Distancia 2D al cuadrado entre dos landmarks (evita la raíz al comparar umbrales)."""
+    delta = landmarks[..., a, :2] - landmarks[..., b, :2]
+    return (delta * delta).sum(axis=-1)
+
+
+def landmark_distance(landmarks: np.ndarray, a: int = THUMB_TIP, b: int = INDEX_TIP) -> np.ndarray:
+    """Distancia 2D entre dos landmarks para cada mano del lote."""
+    return np.sqrt(landmark_distance_sq(landmarks, a, b))
@@ -0,0 +1,291 @@
+"""
+Varias manos a la vez: identidad estable y un pipeline de gestos por mano.
+
+MediaPipe entrega las manos de cada frame sin un orden fijo, así que la mano
+0 de un frame puede ser la 1 del siguiente. ``HandIdentityTracker`` asocia las
+detecciones con las manos seguidas por cercanía de la palma, penalizando que
+cambie la lateralidad (izquierda/derecha), y le da a cada mano un id estable y
+un slot fijo mientras se la sigue.
+
+``MultiHandGesturePipeline`` procesa todas las manos del frame juntas: filtro
+y clasificación son una sola operación vectorizada sobre el array de slots
+``(max_hands, 21, 3)``, así el costo casi no crece con la cantidad de manos.
+Cada mano tiene su propio ``GestureStateMachine`` y su histéresis de clic, y
+con dos manos en pinza se emite ``GestureEvent.ZOOM`` (pinch-zoom entre manos).
+"""
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.gestos.components.gesture_mapper import GESTURE_CODES, GESTURE_NAMES, GestureMapper
+from src.gestos.components.gesture_state import GestureStateMachine
+from src.gestos.components.landmarks import INDEX_TIP, NUM_LANDMARKS, THUMB_TIP
+from src.gestos.components.temporal import PALM_IDS
+from src.gestos.event_system import GestureEvent
+from src.gestos.offline.recording import HANDEDNESS_NAMES, handedness_code
+
+UNKNOWN_HANDEDNESS = -1
+
+
+def handedness_codes(handedness: Any, count: int) -> np.ndarray:
+    """
+    Lateralidad de ``count`` manos como códigos (0 = izquierda, 1 = derecha, -1 = desconocida).
+
+    Acepta None, un array de códigos o una lista de strings / clasificaciones de MediaPipe.
+    """
+    codes = np.full(count, UNKNOWN_HANDEDNESS, dtype=np.int8)
+    if handedness is None:
+        return codes
+    if isinstance(handedness, np.ndarray):
+        codes[:min(count, len(handedness))] = handedness[:count]
+        return codes
+    for i, item in enumerate(list(handedness)[:count]):
+        codes[i] = handedness_code(item)
+    return codes
+
+
+class HandIdentityTracker:
+    """
+    Asociación de detecciones con manos seguidas entre frames.
+
+    Args:
+        max_hands: Manos seguidas a la vez (cantidad de slots)
+        max_distance: Distancia máxima (0..1) de la palma entre frames para
+            considerar que es la misma mano
+        handedness_cost: Factor extra de la distancia si cambia la lateralidad
+            (1 = la duplica): desempata manos cercanas sin que un error suelto
+            de lateralidad le gane a la posición
+        max_missing: Segundos que una mano puede faltar antes de perder su id
+        handedness_smoothing: Peso de cada detección en la lateralidad de la
+            mano seguida (promedio exponencial: un error suelto no la cambia)
+    """
+
+    def __init__(self, max_hands: int = 2, max_distance: float = 0.25,
+                 handedness_cost: float = 1.0, max_missing: float = 0.3,
+                 handedness_smoothing: float = 0.2):
+        self.max_hands = max_hands
+        self.max_distance = max_distance
+        self.handedness_cost = handedness_cost
+        self.max_missing = max_missing
+        self.handedness_smoothing = handedness_smoothing
+
+        self.ids = np.full(max_hands, -1, dtype=np.int64)  # -1 = slot libre
+        self.palms = np.zeros((max_hands, 2), dtype=np.float64)
+        self.handedness = np.full(max_hands, UNKNOWN_HANDEDNESS, dtype=np.int8)
+        self._handedness_score = np.full(max_hands, np.nan)  # 0 = izquierda .. 1 = derecha
+        self.last_seen = np.zeros(max_hands, dtype=np.float64)
+        self._next_id = 0
+        self.stats = {'frames': 0, 'new_ids': 0, 'lost': 0}
+
+    def reset(self) -> None:
+        self.ids[:] = -1
+
+    def update(self, landmarks: np.ndarray, handedness: Any = None,
+               timestamp: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Asocia las manos del frame.
+
+        Args:
+            landmarks: Array ``(N, 21, 3)``; sólo se usan las primeras ``max_hands``
+            handedness: Lateralidad de cada mano (ver ``handedness_codes``)
+            timestamp: Segundos de la captura (por defecto ``time.perf_counter()``)
+
+        Returns:
+            ``(ids, slots, new)`` alineados con las primeras ``max_hands``
+            detecciones: id estable, slot y si la mano es nueva. Si no queda un
+            slot libre (una mano seguida falta hace menos de ``max_missing``)
+            la detección queda con id y slot -1
+        """
+        t = time.perf_counter() if timestamp is None else timestamp
+        self.stats['frames'] += 1
+        expired = (self.ids >= 0) & (t - self.last_seen > self.max_missing)
+        self.stats['lost'] += int(expired.sum())
+        self.ids[expired] = -1
+
+        n = min(len(landmarks), self.max_hands)
+        slots = np.full(n, -1, dtype=np.int64)
+        if n == 0:
+            return slots.copy(), slots, np.zeros(0, dtype=bool)
+        palms = landmarks[:n, PALM_IDS, :2].mean(axis=1)
+        hands = handedness_codes(handedness, n)
+
+        # Costo (detección x slot): distancia de palmas, mayor si cambia la lateralidad
+        delta = palms[:, None, :] - self.palms[None, :, :]
+        distance = np.sqrt((delta * delta).sum(axis=-1))
+        known = (hands[:, None] >= 0) & (self.handedness[None, :] >= 0)
+        cost = distance * (1.0 + self.handedness_cost * (known & (hands[:, None] != self.handedness[None, :])))
+        cost[(distance > self.max_distance) | (self.ids < 0)[None, :]] = np.inf
+
+        # Asignación greedy por costo creciente (óptima en la práctica con pocas manos)
+        taken = np.zeros(self.max_hands, dtype=bool)
+        for flat in np.argsort(cost, axis=None):
+            det, slot = divmod(int(flat), self.max_hands)
+            if not np.isfinite(cost[det, slot]):
+                break
+            if slots[det] < 0 and not taken[slot]:
+                slots[det] = slot
+                taken[slot] = True
+
+        new = slots < 0
+        free = np.flatnonzero((self.ids < 0) & ~taken)
+        for det, slot in zip(np.flatnonzero(new), free):
+            slots[det] = slot
+            self._handedness_score[slot] = np.nan
+            self.ids[slot] = self._next_id
+            self._next_id += 1
+            self.stats['new_ids'] += 1
+        new &= slots >= 0
+
+        kept = slots >= 0
+        tracked = slots[kept]
+        self.palms[tracked] = palms[kept]
+        self.last_seen[tracked] = t
+        # Lateralidad suavizada; una detección sin lateralidad no cambia la anterior
+        score = self._handedness_score[tracked]
+        observed = hands[kept].astype(np.float64)
+        score = np.where(np.isnan(score), observed, score + self.handedness_smoothing * (observed - score))
+        score = np.where(hands[kept] >= 0, score, self._handedness_score[tracked])
+        self._handedness_score[tracked] = score
+        self.handedness[tracked] = np.where(np.isnan(score), UNKNOWN_HANDEDNESS, score >= 0.5)
+        ids = np.where(kept, self.ids[np.maximum(slots, 0)], -1)
+        return ids, slots, new
+
+
+class HandResult(NamedTuple):
+    """Resultado por mano de ``MultiHandGesturePipeline.update``."""
+    hand_id: int
+    slot: int
+    handedness: Optional[str]
+    gesture: Optional[str]   # clasificación cruda del frame
+    action: Optional[str]    # gesto que dispara su acción en este frame (GestureStateMachine)
+    landmarks: np.ndarray    # landmarks filtrados (21, 3)
+
+
+Event = Tuple[GestureEvent, Dict[str, Any]]
+
+
+class MultiHandGesturePipeline:
+    """
+    Clasificación de gestos de todas las manos del frame, con estado por mano.
+
+    Args:
+        mapper: Clasificador (se usa ``detect_batch`` sobre todas las manos)
+        max_hands: Manos procesadas a la vez
+        landmark_filter: Filtro opcional aplicado al array de slots completo
+        tracker: ``HandIdentityTracker`` (uno por defecto con ``max_hands``)
+        state_kwargs: Parámetros del ``GestureStateMachine`` de cada mano
+        zoom_limits: Escala mínima y máxima del pinch-zoom
+        event_bus: ``GestureEventBus`` opcional donde emitir los eventos de dos manos
+    """
+
+    def __init__(
+        self,
+        mapper: Optional[GestureMapper] = None,
+        max_hands: int = 2,
+        landmark_filter=None,
+        tracker: Optional[HandIdentityTracker] = None,
+        state_kwargs: Optional[Dict[str, Any]] = None,
+        zoom_limits: Tuple[float, float] = (0.2, 5.0),
+        event_bus=None,
+    ):
+        self.mapper = mapper or GestureMapper()
+        self.max_hands = max_hands
+        self.landmark_filter = landmark_filter
+        self.tracker = tracker or HandIdentityTracker(max_hands)
+        self.state_kwargs = dict(state_kwargs or {})
+        self.zoom_limits = zoom_limits
+        self.event_bus = event_bus
+
+        self._slots = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self._reset = np.zeros(max_hands, dtype=bool)
+        self._clicking = np.zeros(max_hands, dtype=bool)
+        self._slot_ids = np.full(max_hands, -1, dtype=np.int64)
+        self.states = [GestureStateMachine(**self.state_kwargs) for _ in range(max_hands)]
+
+        self.scale = 1.0
+        self._zoom_start: Optional[Tuple[float, float]] = None  # (distancia, escala) al empezar
+
+    def update(self, landmarks: Any, handedness: Any = None,
+               timestamp: Optional[float] = None) -> Tuple[List[HandResult], List[Event]]:
+        """
+        Procesa las manos de un frame.
+
+        Args:
+            landmarks: Array ``(N, 21, 3)`` (o ``(21, 3)``), o None si no hay manos
+            handedness: Lateralidad de cada mano (ver ``handedness_codes``)
+            timestamp: Segundos de la captura (por defecto ``time.perf_counter()``)
+
+        Returns:
+            ``(manos, eventos)``: un ``HandResult`` por mano seguida en el frame
+            y los eventos de dos manos (``ZOOM``)
+        """
+        t = time.perf_counter() if timestamp is None else timestamp
+        hands = (np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32) if landmarks is None
+                 else np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3))
+        ids, slots, new = self.tracker.update(hands, handedness, t)
+        kept = slots >= 0
+        hands, ids, slots, new = hands[:len(slots)][kept], ids[kept], slots[kept], new[kept]
+
+        # Slots que cambiaron de mano: estado de gesto, clic y filtro desde cero
+        changed = self.tracker.ids != self._slot_ids
+        for slot in np.flatnonzero(changed):
+            self.states[slot].reset()
+        self._clicking[changed] = False
+        self._slot_ids[:] = self.tracker.ids
+
+        present = np.zeros(self.max_hands, dtype=bool)
+        present[slots] = True
+        self._slots[slots] = hands
+        filtered = self._slots
+        if self.landmark_filter is not None:
+            self._reset[:] = False
+            self._reset[slots[new]] = True
+            filtered = self.landmark_filter(self._slots, t, reset=self._reset)
+
+        # Clasificación de todas las manos en una sola llamada, con histéresis de clic por mano
+        thresholds = np.where(self._clicking[slots], self.mapper.click_release, self.mapper.click_threshold)
+        codes = self.mapper.detect_batch(filtered[slots], thresholds) if len(slots) else np.empty(0, np.int8)
+        self._clicking[:] = False
+        self._clicking[slots] = codes == GESTURE_CODES["CLICK"]
+
+        results = []
+        for hand_id, slot, code in zip(ids.tolist(), slots.tolist(), codes.tolist()):
+            gesture = GESTURE_NAMES[code]
+            results.append(HandResult(
+                hand_id, slot, HANDEDNESS_NAMES.get(int(self.tracker.handedness[slot])),
+                gesture, self.states[slot].update(gesture, t), filtered[slot].copy(),
+            ))
+        # Manos seguidas que faltan en este frame votan "sin gesto"
+        for slot in np.flatnonzero((self.tracker.ids >= 0) & ~present):
+            self.states[slot].update(None, t)
+
+        events = self._pinch_zoom(filtered, t)
+        if self.event_bus is not None:
+            for event, data in events:
+                self.event_bus.emit(event, data)
+        return results, events
+
+    def _pinch_zoom(self, filtered: np.ndarray, t: float) -> List[Event]:
+        """Dos manos en pinza: la escala sigue la razón entre la distancia actual y la inicial."""
+        pinching = [slot for slot, state in enumerate(self.states)
+                    if self.tracker.ids[slot] >= 0 and state.state == "CLICK"]
+        if len(pinching) < 2:
+            self._zoom_start = None
+            return []
+        a, b = pinching[:2]
+        points = (filtered[[a, b], THUMB_TIP, :2] + filtered[[a, b], INDEX_TIP, :2]) / 2
+        distance = float(np.linalg.norm(points[0] - points[1]))
+        if self._zoom_start is None:
+            self._zoom_start = (max(distance, 1e-6), self.scale)
+            return []
+        start_distance, start_scale = self._zoom_start
+        low, high = self.zoom_limits
+        scale = float(np.clip(start_scale * distance / start_distance, low, high))
+        if scale == self.scale:
+            return []
+        self.scale = scale
+        return [(GestureEvent.ZOOM, {
+            'scale': scale, 'ratio': distance / start_distance, 'distance': distance,
+            'hands': [int(self.tracker.ids[a]), int(self.tracker.ids[b])], 'timestamp': t,
+        })]
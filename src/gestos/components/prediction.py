@@ -0,0 +1,168 @@
+"""
+Predicción de movimiento para compensar la latencia del pipeline.
+
+Entre la captura del frame y el momento en que el cursor (o el holograma) se
+actualiza pasan varios frames; ``MotionPredictor`` extrapola la posición al
+instante de display a partir de la velocidad reciente:
+
+    - La velocidad es la pendiente por mínimos cuadrados de las últimas
+      ``history`` muestras, vectorizada sobre todo el array (la mano completa
+      o un ángulo).
+    - El horizonte es fijo, la latencia medida de una etapa de un
+      ``LatencyRecorder``, o el tiempo hasta el instante ``at`` indicado; se
+      limita a ``max_horizon``.
+    - La confianza de cada punto es la rectitud del movimiento reciente
+      (desplazamiento neto / recorrido): con jitter o cambios de dirección la
+      extrapolación se apaga sola; ``gain`` la escala globalmente.
+"""
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+from src.utils.metrics import LatencyRecorder
+
+
+class MotionPredictor:
+    """
+    Extrapola landmarks (o un ángulo) al instante de display.
+
+    Args:
+        horizon: Anticipación fija en segundos (si no hay ``latency``)
+        latency: Registro de latencias del pipeline; la mediana de ``stage``
+            se usa como horizonte
+        stage: Etapa de ``latency`` que mide captura → uso (p. ej. ``"total"``)
+        display_delay: Segundos extra desde el uso hasta que se ve (p. ej. un frame)
+        max_horizon: Anticipación máxima en segundos
+        history: Muestras usadas para estimar la velocidad
+        gain: Confianza global (0 = sin predicción, 1 = extrapolación completa)
+        min_speed: Velocidad (unidades/s) bajo la cual no se extrapola
+        period: Período de la magnitud (360 para ángulos en grados): las
+            muestras se desenvuelven y la predicción vuelve a ``[0, period)``
+        refresh: Cada cuántos segundos se recalcula el horizonte desde ``latency``
+    """
+
+    def __init__(
+        self,
+        horizon: float = 0.05,
+        latency: Optional[LatencyRecorder] = None,
+        stage: str = "total",
+        display_delay: float = 0.0,
+        max_horizon: float = 0.15,
+        history: int = 5,
+        gain: float = 1.0,
+        min_speed: float = 0.0,
+        period: Optional[float] = None,
+        refresh: float = 0.5,
+    ):
+        if history < 2:
+            raise ValueError("history debe ser al menos 2")
+        self.horizon = horizon
+        self.latency = latency
+        self.stage = stage
+        self.display_delay = display_delay
+        self.max_horizon = max_horizon
+        self.history = history
+        self.gain = gain
+        self.min_speed = min_speed
+        self.period = period
+        self.refresh = refresh
+
+        self._times = np.zeros(history, dtype=np.float64)
+        self._values: Optional[np.ndarray] = None
+        self._count = 0
+        self._measured_horizon = horizon
+        self._horizon_time = float("-inf")
+        self.confidence: Optional[np.ndarray] = None
+        self.velocity: Optional[np.ndarray] = None
+
+    def reset(self) -> None:
+        self._values = None
+        self._count = 0
+
+    def update(self, x: Any, timestamp: Optional[float] = None) -> None:
+        """Agrega una muestra (con la marca de tiempo de su captura)."""
+        x = np.asarray(x, dtype=np.float64)
+        t = time.perf_counter() if timestamp is None else timestamp
+        if self._values is None or self._values.shape[1:] != x.shape:
+            self._values = np.zeros((self.history,) + x.shape, dtype=np.float64)
+            self._count = 0
+        elif self.period is not None:
+            # Desenvolver respecto de la última muestra: 359° → 1° es +2°, no -358°
+            last = self._values[(self._count - 1) % self.history]
+            x = last + (x - last + self.period / 2) % self.period - self.period / 2
+        slot = self._count % self.history
+        self._values[slot] = x
+        self._times[slot] = t
+        self._count += 1
+
+    def _lead(self) -> float:
+        if self.latency is not None:
+            now = time.perf_counter()
+            if now - self._horizon_time > self.refresh:
+                samples = self.latency.samples(self.stage)
+                if samples.size:
+                    self._measured_horizon = float(np.median(samples))
+                self._horizon_time = now
+            return self._measured_horizon + self.display_delay
+        return self.horizon + self.display_delay
+
+    def predict(self, at: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Posición extrapolada.
+
+        Args:
+            at: Instante (mismo reloj que las marcas de tiempo) para el que se
+                predice; por defecto la última muestra más el horizonte
+
+        Returns:
+            Array con la forma de las muestras, o None si aún no hay ninguna
+        """
+        if self._values is None or self._count == 0:
+            return None
+        n = min(self._count, self.history)
+        order = np.arange(self._count - n, self._count) % self.history
+        times = self._times[order]
+        values = self._values[order]
+        last_t, last = times[-1], values[-1]
+
+        lead = self._lead() if at is None else at - last_t + self.display_delay
+        lead = min(max(lead, 0.0), self.max_horizon)
+        if n < 2 or lead == 0.0 or self.gain == 0.0:
+            return self._wrap(last.copy())
+
+        # Pendiente por mínimos cuadrados sobre la ventana
+        dt = times - times.mean()
+        denom = float((dt * dt).sum())
+        if denom <= 0:
+            return self._wrap(last.copy())
+        shape = (n,) + (1,) * (values.ndim - 1)
+        velocity = (dt.reshape(shape) * (values - values.mean(axis=0))).sum(axis=0) / denom
+
+        # Confianza: rectitud del recorrido reciente (por punto si hay un eje de coordenadas)
+        steps = np.diff(values, axis=0)
+        point_axis = -1 if values.ndim > 2 else None
+        if point_axis is None:
+            path = np.abs(steps).sum(axis=0)
+            net = np.abs(values[-1] - values[0])
+            speed = np.abs(velocity)
+        else:
+            path = np.sqrt((steps * steps).sum(axis=-1)).sum(axis=0)
+            net = np.sqrt(((values[-1] - values[0]) ** 2).sum(axis=-1))
+            speed = np.sqrt((velocity * velocity).sum(axis=-1))
+        confidence = np.where(path > 0, net / np.maximum(path, 1e-12), 0.0) * self.gain
+        confidence = np.where(speed >= self.min_speed, confidence, 0.0)
+        if point_axis is not None:
+            confidence = confidence[..., None]
+
+        self.velocity = velocity
+        self.confidence = confidence
+        return self._wrap(last + velocity * lead * confidence)
+
+    def __call__(self, x: Any, timestamp: Optional[float] = None, at: Optional[float] = None) -> np.ndarray:
+        """``update`` + ``predict``."""
+        self.update(x, timestamp)
+        return self.predict(at)
+
+    def _wrap(self, value: np.ndarray) -> np.ndarray:
+        return value % self.period if self.period is not None else value
@@ -0,0 +1,198 @@
+"""
+Región de interés (ROI) para reducir la imagen que procesa MediaPipe.
+
+La mano ocupa una fracción pequeña del frame de 640x480. Mientras hay manos
+seguidas, ``RoiTracker`` recorta un cuadrado alrededor de la caja de los
+landmarks del frame anterior (con margen), lo reduce a ``input_size`` y sólo
+convierte y procesa ese recorte; los landmarks se devuelven en coordenadas
+normalizadas del frame completo, así que el resto del pipeline no cambia.
+
+Se vuelve al frame completo cuando:
+    - no hay manos seguidas (primer frame o seguimiento perdido)
+    - el recorte no encuentra ninguna mano (se reintenta en el mismo frame)
+    - el recorte cubriría casi todo el frame
+    - cada ``redetect_interval`` frames si se siguen menos de ``max_hands``
+      manos, para descubrir manos nuevas fuera del recorte
+
+El recorte se mueve y cambia de escala entre frames, así que no debe pasar
+por el mismo ``Hands`` en modo video que el frame completo: su seguimiento
+supone imágenes consecutivas de la misma cámara. ``crop_infer`` permite usar
+otra instancia, en modo imagen estática, sólo para los recortes.
+"""
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.gestos.components.landmarks import NUM_LANDMARKS, HandLandmarks, fill_landmarks
+
+Region = Tuple[int, int, int]  # (x0, y0, lado) en píxeles
+
+
+class RoiTracker:
+    """
+    Inferencia de manos sobre un recorte alrededor de las manos seguidas.
+
+    Args:
+        infer: Función ``imagen RGB -> results`` para el frame completo
+            (p. ej. ``mp.solutions.hands.Hands.process``)
+        crop_infer: Función para los recortes (por defecto ``infer``); con
+            MediaPipe, un ``Hands`` aparte con ``static_image_mode=True``
+        max_hands: Manos que puede entregar ``infer``
+        margin: Margen alrededor de la caja de los landmarks, como fracción de su lado mayor
+        input_size: Lado máximo del recorte que se entrega a ``infer`` (no se amplía)
+        min_size: Lado mínimo del recorte, como fracción del lado menor del frame
+        max_size: Si el recorte supera esta fracción del lado menor, se usa el frame completo
+        redetect_interval: Frames entre detecciones completas con menos de ``max_hands`` manos
+        smoothing: Peso de cada medición en los tiempos medios (``full_ms`` y ``roi_ms``)
+    """
+
+    def __init__(
+        self,
+        infer: Callable[[np.ndarray], Any],
+        max_hands: int = 2,
+        margin: float = 0.35,
+        input_size: int = 256,
+        min_size: float = 0.3,
+        max_size: float = 0.9,
+        redetect_interval: int = 30,
+        smoothing: float = 0.1,
+        crop_infer: Optional[Callable[[np.ndarray], Any]] = None,
+    ):
+        self.infer = infer
+        self.crop_infer = crop_infer if crop_infer is not None else infer
+        self.max_hands = max_hands
+        self.margin = margin
+        self.input_size = input_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.redetect_interval = redetect_interval
+        self.smoothing = smoothing
+
+        # Landmarks (en el frame completo) de las manos seguidas
+        self._hands = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self._tracked = 0
+        self._since_full = 0
+        self._input = np.empty((input_size, input_size, 3), dtype=np.uint8)
+        # Recorte de la última inferencia (None si fue el frame completo)
+        self.region: Optional[Region] = None
+        self.stats = {
+            'frames': 0, 'roi': 0, 'hits': 0, 'fallbacks': 0, 'full': 0,
+            'full_ms': 0.0, 'roi_ms': 0.0, 'saved_ms': 0.0,
+        }
+
+    @property
+    def hit_rate(self) -> float:
+        """Fracción de frames resueltos sólo con el recorte."""
+        return self.stats['hits'] / self.stats['frames'] if self.stats['frames'] else 0.0
+
+    def reset(self) -> None:
+        """Olvida las manos seguidas; el próximo frame usa la imagen completa."""
+        self._tracked = 0
+        self.region = None
+
+    def process(self, frame: np.ndarray) -> Any:
+        """
+        Detecta las manos de un frame BGR.
+
+        Returns:
+            El resultado de ``infer`` con los landmarks en coordenadas
+            normalizadas del frame completo
+        """
+        stats = self.stats
+        stats['frames'] += 1
+        start = time.perf_counter()
+        region = self._next_region(frame.shape)
+        if region is not None:
+            stats['roi'] += 1
+            results = self._infer_region(frame, region)
+            if getattr(results, 'multi_hand_landmarks', None):
+                elapsed = (time.perf_counter() - start) * 1000
+                stats['hits'] += 1
+                stats['roi_ms'] = self._average(stats['roi_ms'], elapsed)
+                stats['saved_ms'] += stats['full_ms'] - elapsed
+                self._since_full += 1
+                self._track(results)
+                return results
+            stats['fallbacks'] += 1
+
+        full_start = time.perf_counter()
+        self.region = None
+        results = self.infer(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        stats['full'] += 1
+        stats['full_ms'] = self._average(stats['full_ms'], (time.perf_counter() - full_start) * 1000)
+        if region is not None:
+            # El recorte fallido es tiempo perdido respecto del frame completo
+            stats['saved_ms'] -= (full_start - start) * 1000
+        self._since_full = 0
+        self._track(results)
+        return results
+
+    def _average(self, mean: float, value: float) -> float:
+        return value if mean == 0.0 else mean + self.smoothing * (value - mean)
+
+    def _next_region(self, shape) -> Optional[Region]:
+        """Cuadrado alrededor de las manos seguidas, o None para usar el frame completo."""
+        if self._tracked == 0:
+            return None
+        if self._tracked < self.max_hands and self._since_full >= self.redetect_interval:
+            return None
+        height, width = shape[:2]
+        xy = self._hands[:self._tracked, :, :2].reshape(-1, 2) * (width, height)
+        low, high = xy.min(axis=0), xy.max(axis=0)
+        short = min(width, height)
+        side = max((high - low).max() * (1.0 + 2.0 * self.margin), self.min_size * short)
+        if side > self.max_size * short:
+            return None
+        side = int(np.ceil(side))
+        x0, y0 = ((low + high) / 2 - side / 2).astype(int)
+        x0 = int(np.clip(x0, 0, width - side))
+        y0 = int(np.clip(y0, 0, height - side))
+        return x0, y0, side
+
+    def _infer_region(self, frame: np.ndarray, region: Region) -> Any:
+        x0, y0, side = region
+        crop = frame[y0:y0 + side, x0:x0 + side]
+        if side > self.input_size:
+            # Bilineal: INTER_AREA con escalas no enteras cuesta más que la inferencia ahorrada
+            crop = cv2.resize(crop, (self.input_size, self.input_size), dst=self._input,
+                              interpolation=cv2.INTER_LINEAR)
+        self.region = region
+        results = self.crop_infer(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+        height, width = frame.shape[:2]
+        for hand in getattr(results, 'multi_hand_landmarks', None) or []:
+            _to_frame(hand, x0, y0, side, width, height)
+        return results
+
+    def _track(self, results: Any) -> None:
+        hands = getattr(results, 'multi_hand_landmarks', None) or []
+        self._tracked = min(len(hands), self.max_hands)
+        for i in range(self._tracked):
+            fill_landmarks(self._hands[i], hands[i])
+
+    def report(self) -> Dict[str, float]:
+        """Resumen de ``stats`` con la tasa de aciertos y el ahorro medio por frame."""
+        stats = self.stats
+        return dict(
+            stats,
+            hit_rate=self.hit_rate,
+            saved_ms_per_frame=stats['saved_ms'] / stats['frames'] if stats['frames'] else 0.0,
+        )
+
+
+def _to_frame(hand: Any, x0: int, y0: int, side: int, width: int, height: int) -> None:
+    """Pasa una mano de coordenadas del recorte a coordenadas del frame completo (in place)."""
+    sx, sy = side / width, side / height
+    ox, oy = x0 / width, y0 / height
+    if isinstance(hand, (HandLandmarks, np.ndarray)):
+        array = hand.array if isinstance(hand, HandLandmarks) else hand
+        array[:, 0] = ox + array[:, 0] * sx
+        array[:, 1] = oy + array[:, 1] * sy
+        # z de MediaPipe está en la escala del ancho de la imagen
+        array[:, 2] *= sx
+        return
+    for lm in hand.landmark:
+        lm.x = ox + lm.x * sx
+        lm.y = oy + lm.y * sy
+        lm.z = lm.z * sx
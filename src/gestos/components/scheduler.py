@@ -0,0 +1,206 @@
+"""
+Programador de la tasa de inferencia según la actividad de las manos.
+
+Procesar cada frame con MediaPipe compite por CPU con el renderer del
+holograma (en los kioscos corren en la misma máquina). ``InferenceScheduler``
+decide frame a frame si corresponde inferir:
+
+    - ``active``: una mano se movió hace menos de ``idle_after`` segundos →
+      hasta ``max_rate`` inferencias por segundo
+    - ``idle``: hay mano pero quieta → ``idle_rate`` (suficiente para notar
+      que empieza un gesto)
+    - ``probe``: no se ve ninguna mano desde hace ``probe_after`` segundos →
+      ``probe_rate``, sólo para detectar que vuelve a aparecer
+
+Además la tasa nunca supera ``cpu_budget / tiempo de inferencia``: con un
+presupuesto de 0.5 la inferencia usa como mucho medio núcleo. En los frames
+que no se procesan, ``interpolate`` extrapola los landmarks desde las últimas
+inferencias con ``MotionPredictor``.
+
+La extrapolación supone que la mano ``i`` es la misma en las inferencias
+consecutivas; MediaPipe no garantiza ese orden, así que ``observe`` recibe las
+manos por slot del ``HandIdentityTracker`` con sus ``ids`` y reinicia la
+predicción cuando cambian.
+"""
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.gestos.components.prediction import MotionPredictor
+from src.utils.config import INFERENCE_CPU_BUDGET
+from src.utils.metrics import LatencyRecorder
+
+
+class InferenceScheduler:
+    """
+    Decide qué frames pasan por la inferencia de manos.
+
+    Args:
+        max_rate: Inferencias por segundo con una mano en movimiento
+        idle_rate: Inferencias por segundo con una mano quieta
+        probe_rate: Inferencias por segundo sin manos
+        cpu_budget: Fracción de un núcleo que puede ocupar la inferencia
+        latency: Registro del pipeline; la mediana de ``stage`` es el costo de
+            una inferencia (si no, se usa el ``duration`` de ``observe``)
+        stage: Etapa de ``latency`` que mide la inferencia
+        motion_threshold: Velocidad media de los landmarks (unidades
+            normalizadas por segundo) a partir de la cual la mano se mueve
+        idle_after: Segundos sin movimiento para pasar a ``idle``
+        probe_after: Segundos sin manos para pasar a ``probe``
+        max_interpolation: Segundos máximos que ``interpolate`` extrapola (después
+            mantiene la última estimación)
+        refresh: Cada cuántos segundos se relee el costo desde ``latency``
+    """
+
+    MODES = ("active", "idle", "probe")
+
+    def __init__(
+        self,
+        max_rate: float = 30.0,
+        idle_rate: float = 15.0,
+        probe_rate: float = 4.0,
+        cpu_budget: float = INFERENCE_CPU_BUDGET,
+        latency: Optional[LatencyRecorder] = None,
+        stage: str = "inference",
+        motion_threshold: float = 0.15,
+        idle_after: float = 0.5,
+        probe_after: float = 1.0,
+        max_interpolation: float = 0.15,
+        refresh: float = 0.5,
+    ):
+        if cpu_budget <= 0:
+            raise ValueError("cpu_budget debe ser positivo")
+        self.rates = {'active': max_rate, 'idle': idle_rate, 'probe': probe_rate}
+        self.cpu_budget = cpu_budget
+        self.latency = latency
+        self.stage = stage
+        self.motion_threshold = motion_threshold
+        self.idle_after = idle_after
+        self.probe_after = probe_after
+        self.max_interpolation = max_interpolation
+        self.refresh = refresh
+
+        # Sin extrapolar el ruido de una mano quieta
+        self.predictor = MotionPredictor(history=2, max_horizon=max_interpolation, min_speed=motion_threshold)
+        self._cost = 0.0
+        self._cost_time = float('-inf')
+        self._last_run = float('-inf')
+        self._last_seen = float('-inf')
+        self._last_motion = float('-inf')
+        self._observed: Optional[np.ndarray] = None
+        self._observed_time = float('-inf')
+        self._observed_ids: Optional[np.ndarray] = None
+        self.mode = "probe"
+        self.stats = {'frames': 0, 'runs': 0, 'skipped': 0, 'interpolated': 0,
+                      'active': 0, 'idle': 0, 'probe': 0}
+
+    @property
+    def cost(self) -> float:
+        """Segundos de una inferencia (mediana de ``latency`` o promedio de ``observe``)."""
+        if self.latency is not None:
+            now = time.perf_counter()
+            if now - self._cost_time > self.refresh:
+                samples = self.latency.samples(self.stage)
+                if samples.size:
+                    self._cost = float(np.median(samples))
+                self._cost_time = now
+        return self._cost
+
+    @property
+    def interval(self) -> float:
+        """Segundos mínimos entre inferencias en el modo actual."""
+        return max(1.0 / self.rates[self.mode], self.cost / self.cpu_budget)
+
+    def _update_mode(self, t: float) -> str:
+        if t - self._last_seen > self.probe_after:
+            self.mode = "probe"
+        elif t - self._last_motion > self.idle_after:
+            self.mode = "idle"
+        else:
+            self.mode = "active"
+        return self.mode
+
+    def should_run(self, timestamp: Optional[float] = None) -> bool:
+        """
+        Indica si el frame capturado en ``timestamp`` debe pasar por la inferencia.
+
+        Un frame que llega hasta un 20 % antes del intervalo también se procesa,
+        para que el jitter de la cámara no salte frames a tasa completa.
+        """
+        t = time.perf_counter() if timestamp is None else timestamp
+        self.stats['frames'] += 1
+        mode = self._update_mode(t)
+        if t - self._last_run >= 0.8 * self.interval:
+            self._last_run = t
+            self.stats['runs'] += 1
+            self.stats[mode] += 1
+            return True
+        self.stats['skipped'] += 1
+        return False
+
+    def observe(self, hands: Optional[np.ndarray], timestamp: float, duration: Optional[float] = None,
+                ids: Optional[Any] = None) -> None:
+        """
+        Registra el resultado de una inferencia.
+
+        Args:
+            hands: Landmarks ``(N, 21, 3)`` detectados (None o vacío si no hay manos),
+                en un orden estable entre frames (p. ej. por slot)
+            timestamp: Captura del frame inferido
+            duration: Segundos que tomó la inferencia (si no hay ``latency``)
+            ids: Id estable de cada mano; si cambian (una mano reemplaza a otra o
+                el orden no es el de antes) la predicción empieza de nuevo
+        """
+        if duration is not None and self.latency is None:
+            self._cost = duration if self._cost == 0.0 else 0.8 * self._cost + 0.2 * duration
+        if hands is None or len(hands) == 0:
+            self._observed = None
+            self._observed_ids = None
+            self.predictor.reset()
+            return
+
+        hands = np.asarray(hands, dtype=np.float32)
+        if ids is not None:
+            ids = np.asarray(ids)
+            if self._observed_ids is None or not np.array_equal(ids, self._observed_ids):
+                # Otra mano en esa posición: la velocidad entre ambas no significa nada
+                self._observed = None
+                self.predictor.reset()
+            self._observed_ids = ids.copy()
+        if self._observed is not None and self._observed.shape == hands.shape:
+            dt = timestamp - self._observed_time
+            if dt > 0:
+                speed = np.abs(hands[..., :2] - self._observed[..., :2]).mean() / dt
+                if speed > self.motion_threshold:
+                    self._last_motion = timestamp
+        else:
+            # Una mano que aparece (o cambia la cantidad de manos) cuenta como movimiento
+            self._last_motion = timestamp
+        self._last_seen = timestamp
+        self._observed = hands.copy()
+        self._observed_time = timestamp
+        self.predictor.update(hands, timestamp)
+
+    def interpolate(self, timestamp: float) -> Optional[np.ndarray]:
+        """
+        Landmarks estimados para un frame que no pasó por la inferencia.
+
+        Returns:
+            Array ``(N, 21, 3)``, o None si la última inferencia no vio manos
+        """
+        if self._observed is None:
+            return None
+        self.stats['interpolated'] += 1
+        return self.predictor.predict(at=timestamp).astype(np.float32)
+
+    def report(self) -> Dict[str, Any]:
+        """``stats`` con el modo, la fracción de frames inferidos y el costo de una inferencia."""
+        stats = self.stats
+        frames = stats['frames']
+        return dict(
+            stats,
+            mode=self.mode,
+            run_fraction=stats['runs'] / frames if frames else 0.0,
+            cost_ms=self.cost * 1000,
+        )
@@ -0,0 +1,231 @@
+"""
+Reconocimiento temporal de gestos: swipes y rotación continua.
+
+``GestureMapper`` clasifica frames sueltos; ``TemporalGestureRecognizer``
+mira la historia reciente de cada mano:
+
+    - Un ring buffer preasignado ``(max_hands, capacity, 21, 3)`` guarda los
+      últimos landmarks de cada mano, junto con el centro de la palma y el
+      ángulo de la mano (muñeca → nudillo del medio) ya calculados.
+    - Cada frame compara la muestra nueva con la de hace ``window`` frames:
+      desplazamiento y velocidad de la palma para los swipes, y variación del
+      ángulo para la rotación. El costo por frame es constante (no recorre la
+      historia) y vectorizado sobre las manos.
+    - Emite los ``GestureEvent`` existentes (``SWIPE_*`` y ``ROTATION``) con
+      los datos del movimiento.
+
+Coordenadas normalizadas de imagen (``y`` crece hacia abajo); el frame ya
+viene espejado, así que ``SWIPE_RIGHT`` es hacia la derecha de la pantalla.
+"""
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.gestos.components.landmarks import NUM_LANDMARKS, as_landmark_array
+from src.gestos.event_system import GestureEvent
+
+# Muñeca y nudillos (MCP) de los cuatro dedos: su promedio es el centro de la palma
+PALM_IDS = np.array([0, 5, 9, 13, 17])
+WRIST = 0
+MIDDLE_MCP = 9
+
+
+def hand_roll(landmarks: np.ndarray) -> np.ndarray:
+    """
+    Ángulo (grados) de la mano en el plano de la imagen.
+
+    0° con los dedos hacia arriba, positivo en sentido horario.
+
+    Args:
+        landmarks: Array ``(..., 21, 3)``
+    """
+    vec = landmarks[..., MIDDLE_MCP, :2] - landmarks[..., WRIST, :2]
+    return np.degrees(np.arctan2(vec[..., 0], -vec[..., 1]))
+
+
+Event = Tuple[GestureEvent, Dict[str, Any]]
+
+
+class TemporalGestureRecognizer:
+    """
+    Detector en streaming de swipes y rotación sobre la historia de landmarks.
+
+    Args:
+        max_hands: Manos seguidas a la vez (historias de ``0`` a ``max_hands - 1``)
+        capacity: Frames de historia por mano en el ring buffer
+        window: Frames entre las dos muestras comparadas (menor que ``capacity``)
+        swipe_distance: Desplazamiento mínimo de la palma en la ventana (0..1)
+        swipe_speed: Velocidad mínima de la palma (unidades/s)
+        swipe_ratio: Cuántas veces el eje principal debe superar al otro
+        swipe_refractory: Segundos sin nuevos swipes de esa mano tras uno
+        rotation_deadband: Grados que debe girar la mano para emitir ``ROTATION``
+        rotation_speed: Velocidad angular mínima (grados/s) en la ventana
+        rotation_gain: Grados del holograma por grado de la mano
+        event_bus: ``GestureEventBus`` opcional donde emitir cada evento
+    """
+
+    def __init__(
+        self,
+        max_hands: int = 2,
+        capacity: int = 32,
+        window: int = 6,
+        swipe_distance: float = 0.15,
+        swipe_speed: float = 0.8,
+        swipe_ratio: float = 2.0,
+        swipe_refractory: float = 0.4,
+        rotation_deadband: float = 3.0,
+        rotation_speed: float = 30.0,
+        rotation_gain: float = 1.0,
+        event_bus=None,
+    ):
+        if not 0 < window < capacity:
+            raise ValueError("window debe estar entre 1 y capacity - 1")
+        self.max_hands = max_hands
+        self.capacity = capacity
+        self.window = window
+        self.swipe_distance = swipe_distance
+        self.swipe_speed = swipe_speed
+        self.swipe_ratio = swipe_ratio
+        self.swipe_refractory = swipe_refractory
+        self.rotation_deadband = rotation_deadband
+        self.rotation_speed = rotation_speed
+        self.rotation_gain = rotation_gain
+        self.event_bus = event_bus
+
+        # Ring buffers preasignados; el frame k de la mano h está en [h, k % capacity]
+        self._landmarks = np.zeros((max_hands, capacity, NUM_LANDMARKS, 3), dtype=np.float32)
+        self._times = np.zeros((max_hands, capacity), dtype=np.float64)
+        self._palm = np.zeros((max_hands, capacity, 2), dtype=np.float64)
+        self._roll = np.zeros((max_hands, capacity), dtype=np.float64)  # desenvuelto
+        self._count = np.zeros(max_hands, dtype=np.int64)
+
+        self._swipe_until = np.full(max_hands, -np.inf)
+        self._rotation_ref = np.zeros(max_hands)   # ángulo de la mano en la última emisión
+        self._angle = 0.0                          # heading acumulado, común a todas las manos
+        self._hands = np.arange(max_hands)
+        self._present = 0
+        self.stats = {'frames': 0, 'swipes': 0, 'rotations': 0}
+
+    def reset(self, hand: Optional[int] = None) -> None:
+        """Olvida la historia de una mano (o de todas); el ángulo acumulado se conserva."""
+        if hand is None:
+            self._count[:] = 0
+        else:
+            self._count[hand] = 0
+
+    def update(self, landmarks: Any, timestamp: Optional[float] = None,
+               slots: Optional[Any] = None, ids: Optional[Any] = None) -> List[Event]:
+        """
+        Agrega un frame y detecta gestos.
+
+        Args:
+            landmarks: Mano ``(21, 3)``, manos ``(N, 21, 3)`` (o cualquier
+                representación que acepte ``as_landmark_array``); None si no hay manos
+            timestamp: Segundos de la captura (por defecto ``time.perf_counter()``)
+            slots: Historia de cada mano (p. ej. ``HandResult.slot`` de
+                ``MultiHandGesturePipeline``). Sin ``slots`` la mano ``i`` es la
+                ``i``-ésima del frame y, como MediaPipe reordena las manos cuando
+                una aparece o se va, toda la historia se descarta al cambiar la
+                cantidad de manos
+            ids: Identificador estable de cada mano (``HandResult.hand_id``)
+                que se informa en ``'hand'``; por defecto, el slot
+
+        Returns:
+            Lista de ``(GestureEvent, datos)`` detectados en este frame
+        """
+        t = time.perf_counter() if timestamp is None else timestamp
+        self.stats['frames'] += 1
+        hands = as_landmark_array(landmarks)
+        n = 0 if hands is None else min(len(hands.reshape(-1, NUM_LANDMARKS, 3)), self.max_hands)
+        if slots is None:
+            if n != self._present:
+                self._count[:] = 0
+            idx = self._hands[:n]
+        else:
+            idx = np.asarray(slots, dtype=np.intp)[:n]
+        self._present = n
+        # Las manos ausentes pierden su historia
+        absent = np.ones(self.max_hands, dtype=bool)
+        absent[idx] = False
+        self._count[absent] = 0
+        if n == 0:
+            return []
+
+        hands = hands.reshape(-1, NUM_LANDMARKS, 3)[:n]
+        # Copia: los índices de abajo son los de antes de agregar esta muestra
+        count = self._count[idx]
+        slot = count % self.capacity
+        palm = hands[:, PALM_IDS, :2].mean(axis=1)
+        roll = hand_roll(hands)
+
+        # Desenvolver el ángulo respecto de la muestra anterior de cada mano
+        fresh = count == 0
+        prev = self._roll[idx, (count - 1) % self.capacity]
+        roll = np.where(fresh, roll, prev + (roll - prev + 180.0) % 360.0 - 180.0)
+        self._rotation_ref[idx[fresh]] = roll[fresh]
+
+        self._landmarks[idx, slot] = hands
+        self._times[idx, slot] = t
+        self._palm[idx, slot] = palm
+        self._roll[idx, slot] = roll
+        self._count[idx] += 1
+
+        # Comparar con la muestra de hace ``window`` frames (sel: posición en el frame)
+        sel = np.flatnonzero(count >= self.window)
+        if len(sel) == 0:
+            return []
+        ready = idx[sel]
+        hand_ids = ready if ids is None else np.asarray(ids)[:n][sel]
+        back = (count[sel] - self.window) % self.capacity
+        dt = np.maximum(t - self._times[ready, back], 1e-6)
+        disp = palm[sel] - self._palm[ready, back]
+        speed = np.sqrt((disp * disp).sum(axis=1)) / dt
+        roll = roll[sel]
+        roll_velocity = (roll - self._roll[ready, back]) / dt
+
+        events: List[Event] = []
+        major = np.abs(disp).max(axis=1)
+        minor = np.abs(disp).min(axis=1)
+        swipe = ((major >= self.swipe_distance) & (speed >= self.swipe_speed)
+                 & (major >= self.swipe_ratio * minor) & (t >= self._swipe_until[ready]))
+        for j in np.nonzero(swipe)[0]:
+            hand = int(ready[j])
+            dx, dy = float(disp[j, 0]), float(disp[j, 1])
+            if abs(dx) >= abs(dy):
+                event = GestureEvent.SWIPE_RIGHT if dx > 0 else GestureEvent.SWIPE_LEFT
+            else:
+                event = GestureEvent.SWIPE_DOWN if dy > 0 else GestureEvent.SWIPE_UP
+            self._swipe_until[hand] = t + self.swipe_refractory
+            events.append((event, {
+                'hand': int(hand_ids[j]), 'dx': dx, 'dy': dy, 'speed': float(speed[j]),
+                'duration': float(dt[j]), 'timestamp': t,
+            }))
+            self.stats['swipes'] += 1
+
+        # Rotación: la mano gira en el lugar (sin desplazarse como en un swipe)
+        delta = roll - self._rotation_ref[ready]
+        rotate = ((np.abs(delta) >= self.rotation_deadband)
+                  & (np.abs(roll_velocity) >= self.rotation_speed)
+                  & (speed < self.swipe_speed))
+        for j in np.nonzero(rotate)[0]:
+            hand = int(ready[j])
+            step = float(delta[j]) * self.rotation_gain
+            self._angle += step
+            self._rotation_ref[hand] = roll[j]
+            events.append((GestureEvent.ROTATION, {
+                'hand': int(hand_ids[j]), 'angle': float(self._angle % 360.0), 'delta': step,
+                'velocity': float(roll_velocity[j]) * self.rotation_gain, 'timestamp': t,
+            }))
+            self.stats['rotations'] += 1
+
+        if self.event_bus is not None:
+            for event, data in events:
+                self.event_bus.emit(event, data)
+        return events
+
+    def history(self, hand: int = 0) -> np.ndarray:
+        """Copia ``(n, 21, 3)`` de la historia de una mano, de la más vieja a la más nueva."""
+        n = int(min(self._count[hand], self.capacity))
+        order = np.arange(self._count[hand] - n, self._count[hand]) % self.capacity
+        return self._landmarks[hand, order]
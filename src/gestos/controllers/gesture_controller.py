@@ -7,8 +7,12 @@ from typing import Optional, Dict, Any
 
 from src.gestos.components.click_control import ClickController
 from src.gestos.components.drag_control import DragController
+from src.gestos.components.gesture_state import GestureStateMachine
+from src.gestos.components.prediction import MotionPredictor
 from src.gestos.components.scroll_control import ScrollController
 from src.gestos.utils.cursor_utils import CursorControl
+from src.utils.config import GESTURE_COOLDOWN
+from src.utils.metrics import LatencyRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -17,11 +21,18 @@ class GestureController:
     """Controlador que mapea gestos detectados a acciones del sistema."""
     
     # Configuración de cooldown para evitar eventos repetidos
-    COOLDOWN_SECONDS = 0.5
+    COOLDOWN_SECONDS = GESTURE_COOLDOWN
     
-    def __init__(self):
-        """Inicializa el controlador con todos los sistemas de control."""
+    def __init__(self, latency: Optional[LatencyRecorder] = None):
+        """
+        Inicializa el controlador con todos los sistemas de control.
+
+        Args:
+            latency: Registro de latencias del pipeline; si se indica, el cursor
+                anticipa la mano según la mediana de la etapa ``"total"``
+        """
         logger.info("Inicializando GestureController")
+        self.latency = latency
         
         # Controladores de acciones
         self.click_controller = ClickController()
@@ -31,7 +42,14 @@ class GestureController:
         # Control del cursor (se inicializa cuando se necesite)
         self.cursor_control: Optional[CursorControl] = None
         
-        # Estado de gestos
+        # Estado de gestos: votación, histéresis y cooldown compartidos con el
+        # resto de los puntos de entrada. Apuntar mueve el cursor en cada frame;
+        # los demás gestos se repiten cada cooldown mientras se sostienen
+        self.gesture_state = GestureStateMachine(
+            cooldown=self.COOLDOWN_SECONDS,
+            repeat=self.COOLDOWN_SECONDS,
+            continuous=('POINTING',),
+        )
         self.last_gesture: Optional[str] = None
         self.last_gesture_time: float = 0.0
         self.gesture_history: list = []
@@ -50,7 +68,8 @@ class GestureController:
         self,
         gesture: str,
         hand_landmarks: Any,
-        frame_shape: Optional[tuple] = None
+        frame_shape: Optional[tuple] = None,
+        timestamp: Optional[float] = None
     ) -> None:
         """
         Procesa un gesto detectado y ejecuta la acción correspondiente.
@@ -59,18 +78,20 @@ class GestureController:
             gesture: Nombre del gesto detectado
             hand_landmarks: Landmarks de la mano detectada
             frame_shape: Dimensiones del frame (height, width, channels)
+            timestamp: Segundos de la captura (por defecto, ahora)
         """
-        current_time = time.time()
+        current_time = time.perf_counter() if timestamp is None else timestamp
         
-        # Verificar cooldown para evitar acciones repetidas
-        if self._is_in_cooldown(gesture, current_time):
+        # Sólo actúa el gesto estable (un frame mal clasificado no dispara nada)
+        gesture = self.gesture_state.update(gesture, current_time)
+        if gesture is None:
             return
         
         # Ejecutar acción del gesto
         if gesture in self.gesture_actions:
             try:
                 logger.info(f"Ejecutando acción para gesto: {gesture}")
-                self.gesture_actions[gesture](hand_landmarks, frame_shape)
+                self.gesture_actions[gesture](hand_landmarks, frame_shape, current_time)
                 
                 # Actualizar historial
                 self._update_gesture_history(gesture, current_time)
@@ -80,14 +101,6 @@ class GestureController:
         else:
             logger.warning(f"Gesto no reconocido: {gesture}")
     
-    def _is_in_cooldown(self, gesture: str, current_time: float) -> bool:
-        """Verifica si el gesto está en período de cooldown."""
-        if gesture == self.last_gesture:
-            time_since_last = current_time - self.last_gesture_time
-            if time_since_last < self.COOLDOWN_SECONDS:
-                return True
-        return False
-    
     def _update_gesture_history(self, gesture: str, timestamp: float) -> None:
         """Actualiza el historial de gestos."""
         self.last_gesture = gesture
@@ -103,12 +116,14 @@ class GestureController:
     
     # ===== Handlers de Gestos =====
     
-    def _handle_click(self, hand_landmarks: Any, frame_shape: Optional[tuple]) -> None:
+    def _handle_click(self, hand_landmarks: Any, frame_shape: Optional[tuple],
+                      timestamp: Optional[float] = None) -> None:
         """Maneja el gesto de click (pulgar e índice juntos)."""
         logger.info("🖱️ Click detectado")
         self.click_controller.left_click()
     
-    def _handle_pointing(self, hand_landmarks: Any, frame_shape: Optional[tuple]) -> None:
+    def _handle_pointing(self, hand_landmarks: Any, frame_shape: Optional[tuple],
+                         timestamp: Optional[float] = None) -> None:
         """Maneja el gesto de apuntar (mover cursor)."""
         if frame_shape is None:
             return
@@ -118,15 +133,17 @@ class GestureController:
             import pyautogui
             screen_width, screen_height = pyautogui.size()
             h, w = frame_shape[0], frame_shape[1]
+            predictor = MotionPredictor(latency=self.latency) if self.latency is not None else None
             self.cursor_control = CursorControl(
-                screen_width, screen_height, w, h
+                screen_width, screen_height, w, h, predictor=predictor
             )
         
-        # Mover cursor según posición del índice
-        self.cursor_control.move_cursor(hand_landmarks)
+        # Mover cursor según posición del índice (filtro y predicción usan la captura)
+        self.cursor_control.move_cursor(hand_landmarks, timestamp)
         logger.debug("👆 Moviendo cursor")
     
-    def _handle_open_hand(self, hand_landmarks: Any, frame_shape: Optional[tuple]) -> None:
+    def _handle_open_hand(self, hand_landmarks: Any, frame_shape: Optional[tuple],
+                          timestamp: Optional[float] = None) -> None:
         """Maneja el gesto de mano abierta (scroll up o detener drag)."""
         # Si estaba arrastrando, soltar
         if self.drag_controller.is_dragging():
@@ -136,7 +153,8 @@ class GestureController:
             logger.info("⬆️ Scroll arriba")
             self.scroll_controller.scroll_up()
     
-    def _handle_fist(self, hand_landmarks: Any, frame_shape: Optional[tuple]) -> None:
+    def _handle_fist(self, hand_landmarks: Any, frame_shape: Optional[tuple],
+                     timestamp: Optional[float] = None) -> None:
         """Maneja el gesto de puño (scroll down o iniciar drag)."""
         # Alternar entre scroll y drag según contexto
         if self.drag_controller.is_dragging():
@@ -161,6 +179,7 @@ class GestureController:
             'unique_gestures': len(gesture_counts),
             'gesture_counts': gesture_counts,
             'last_gesture': self.last_gesture,
+            'state': dict(self.gesture_state.stats),
             'history': self.gesture_history[-5:]  # Últimos 5
         }
     
@@ -170,6 +189,7 @@ class GestureController:
         self.last_gesture = None
         self.last_gesture_time = 0.0
         self.gesture_history.clear()
+        self.gesture_state.reset()
         
         # Asegurar que no quede drag activo
         if self.drag_controller.is_dragging():
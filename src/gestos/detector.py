@@ -2,13 +2,21 @@
 
 import cv2
 import mediapipe as mp
+import numpy as np
 import time
 from src.network.client import EventClient
+from src.gestos.event_system import NetworkEventBridge
+from src.utils.config import GESTURE_COOLDOWN, HAND_ROI
+from src.gestos.components.multi_hand import MultiHandGesturePipeline
+from src.gestos.components.roi import RoiTracker
+from src.gestos.components.scheduler import InferenceScheduler
+from src.gestos.components.temporal import TemporalGestureRecognizer
+from src.gestos.components.landmarks import NUM_LANDMARKS, HandLandmarks, fill_landmarks, fingers_up
 
 # --- Clases para detección de gestos ---
 
 class HandDetector:
-    def __init__(self, mode=False, max_hands=1, detection_con=0.8, track_con=0.8):
+    def __init__(self, mode=False, max_hands=2, detection_con=0.8, track_con=0.8, roi=False):
         self.mode = mode
         self.max_hands = max_hands
         self.detection_con = detection_con
@@ -22,11 +30,32 @@ class HandDetector:
             min_tracking_confidence=self.track_con
         )
         self.mp_draw = mp.solutions.drawing_utils
+        # Inferencia sobre un recorte alrededor de las manos del frame anterior,
+        # con un Hands en modo imagen estática (el recorte se mueve entre frames)
+        self.roi = None
+        if roi:
+            self.crop_hands = self.mp_hands.Hands(
+                static_image_mode=True,
+                max_num_hands=self.max_hands,
+                min_detection_confidence=self.detection_con,
+                min_tracking_confidence=self.track_con
+            )
+            self.roi = RoiTracker(self.hands.process, max_hands, crop_infer=self.crop_hands.process)
         self.tip_ids = [4, 8, 12, 16, 20]
+        self.hand = HandLandmarks()
+        self.lm_list = np.empty((0, 3), dtype=np.int32)
+        # Array de posiciones reutilizado entre frames: columnas [id, cx, cy]
+        self._positions = np.zeros((NUM_LANDMARKS, 3), dtype=np.int32)
+        self._positions[:, 0] = np.arange(NUM_LANDMARKS)
+        # Todas las manos del frame: landmarks normalizados (max_hands, 21, 3)
+        self._hands = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
 
     def find_hands(self, img, draw=True):
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(img_rgb)
+        if self.roi is not None:
+            self.results = self.roi.process(img)
+        else:
+            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            self.results = self.hands.process(img_rgb)
         if self.results.multi_hand_landmarks:
             for hand_lms in self.results.multi_hand_landmarks:
                 if draw:
@@ -34,71 +63,106 @@ class HandDetector:
         return img
 
     def find_position(self, img, hand_no=0):
-        self.lm_list = []
+        """
+        Retorna un array ``(21, 3)`` con filas ``[id, cx, cy]`` en píxeles
+        (vacío si no hay mano). Es una copia propia de quien llama: no cambia
+        en los frames siguientes.
+        """
+        self.lm_list = np.empty((0, 3), dtype=np.int32)
         if self.results.multi_hand_landmarks:
             my_hand = self.results.multi_hand_landmarks[hand_no]
-            for id, lm in enumerate(my_hand.landmark):
-                h, w, c = img.shape
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                self.lm_list.append([id, cx, cy])
+            h, w, c = img.shape
+            self.hand.fill(my_hand)
+            self._positions[:, 1:] = self.hand.to_pixels(w, h)
+            self.lm_list = self._positions.copy()
         return self.lm_list
 
+    def find_all_hands(self):
+        """
+        Landmarks normalizados de todas las manos del último frame.
+
+        Returns:
+            ``(manos (N, 21, 3), lateralidades)``; vista sobre un array reutilizado
+        """
+        hands = self.results.multi_hand_landmarks or []
+        n = min(len(hands), self.max_hands)
+        for i in range(n):
+            fill_landmarks(self._hands[i], hands[i])
+        return self._hands[:n], (self.results.multi_handedness or [])[:n]
+
     def fingers_up(self):
-        fingers = []
-        # Pulgar (eje x)
-        if self.lm_list[self.tip_ids[0]][1] > self.lm_list[self.tip_ids[0] - 1][1]:
-            fingers.append(1)
-        else:
-            fingers.append(0)
-        # Otros 4 dedos (eje y)
-        for id in range(1, 5):
-            if self.lm_list[self.tip_ids[id]][2] < self.lm_list[self.tip_ids[id] - 2][2]:
-                fingers.append(1)
-            else:
-                fingers.append(0)
-        return fingers
+        # Pulgar (eje x, hacia la derecha) y otros 4 dedos (eje y)
+        return fingers_up(self.lm_list[:, 1:], thumb_left=False).astype(int).tolist()
 
 # --- Aplicación principal de gestos ---
 
+# Gesto estable de GestureMapper -> gesto enviado al holograma
+_SENT_GESTURES = {
+    "FIST": "fist",            # Puño cerrado (ningún dedo levantado)
+    "OPEN_HAND": "open_hand",  # Mano abierta (todos los dedos levantados)
+    "POINTING": "point",       # Apuntar (índice levantado)
+}
+
 def main():
     cap = cv2.VideoCapture(0)
-    detector = HandDetector()
-    event_client = EventClient("Gestos")
+    detector = HandDetector(roi=HAND_ROI)
+    event_client = EventClient("Gestos", topics=[])
     event_client.connect()
 
-    last_gesture = None
-    last_gesture_time = 0
-    cooldown = 1.0  # 1 segundo de cooldown
+    # El mismo pipeline que GestureApp: identidad estable por mano y, para
+    # cada una, votación, histéresis y cooldown (config.GESTURE_COOLDOWN); un
+    # gesto sostenido se reenvía cada cooldown. Con dos manos en pinza emite ZOOM
+    pipeline = MultiHandGesturePipeline(
+        max_hands=detector.max_hands, state_kwargs={'repeat': GESTURE_COOLDOWN})
+    # Inferencia a tasa completa sólo con manos en movimiento; en los demás
+    # frames se usan landmarks interpolados
+    scheduler = InferenceScheduler()
+    # Swipes, rotación (historia por slot) y zoom hacia el renderer
+    temporal = TemporalGestureRecognizer(max_hands=detector.max_hands)
+    renderer = NetworkEventBridge()
+    renderer.connect()
+    handedness = []
 
     while True:
         success, img = cap.read()
         if not success:
             break
 
-        img = detector.find_hands(img)
-        lm_list = detector.find_position(img)
-
-        current_gesture = None
-
-        if len(lm_list) != 0:
-            fingers = detector.fingers_up()
-            
-            # Gesto: Puño cerrado (ningún dedo levantado)
-            if fingers == [0, 0, 0, 0, 0]:
-                current_gesture = "fist"
-            # Gesto: Mano abierta (todos los dedos levantados)
-            elif fingers == [1, 1, 1, 1, 1]:
-                current_gesture = "open_hand"
-            # Gesto: Apuntar (índice levantado)
-            elif fingers == [0, 1, 0, 0, 0]:
-                current_gesture = "point"
-
-        # Enviar evento solo si el gesto cambia y ha pasado el cooldown
-        if current_gesture and (current_gesture != last_gesture or time.time() - last_gesture_time > cooldown):
-            event_client.send_event("gesture_detected", {"gesture": current_gesture})
-            print(f"Gesto enviado: {current_gesture}")
-            last_gesture = current_gesture
-            last_gesture_time = time.time()
+        now = time.perf_counter()
+        duration = None
+        if scheduler.should_run(now):
+            img = detector.find_hands(img)
+            hands, handedness = detector.find_all_hands()
+            # Clasificador, recognizer y programador trabajan con la imagen
+            # espejada (derecha = derecha del usuario)
+            hands = hands.copy()
+            hands[..., 0] = 1.0 - hands[..., 0]
+            duration = time.perf_counter() - now
+        else:
+            # Interpoladas por slot, con la lateralidad en el mismo orden
+            hands = scheduler.interpolate(now)
+            if hands is None:
+                hands = np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)
+            handedness = handedness[:len(hands)]
+        hand_results, two_hand_events = pipeline.update(hands, handedness, now)
+        tracked = np.stack([hand.landmarks for hand in hand_results]) if hand_results else None
+        if duration is not None:
+            # Por slot y con ids: que MediaPipe reordene las manos no es movimiento
+            scheduler.observe(tracked, now, duration, ids=[hand.hand_id for hand in hand_results])
+            handedness = [hand.handedness for hand in hand_results]
+
+        for hand in hand_results:
+            # Enviar evento sólo para el gesto estable de cada mano
+            gesture = _SENT_GESTURES.get(hand.action)
+            if gesture:
+                event_client.send_event("gesture_detected", {"gesture": gesture, "hand": hand.hand_id})
+                print(f"Gesto enviado: {gesture} (mano {hand.hand_id})")
+
+        # Historia temporal por slot: el orden de MediaPipe cambia entre frames
+        temporal_events = temporal.update(tracked, now, slots=[hand.slot for hand in hand_results],
+                                          ids=[hand.hand_id for hand in hand_results])
+        for event, data in temporal_events + two_hand_events:
+            renderer.send_gesture_event(event, data)
 
         cv2.imshow("Detector de Gestos", img)
         if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -107,6 +171,11 @@ def main():
     cap.release()
     cv2.destroyAllWindows()
     event_client.close()
+    renderer.disconnect()
+    if detector.roi is not None:
+        report = detector.roi.report()
+        print(f"ROI: {report['hit_rate']:.0%} de frames con recorte, "
+              f"{report['saved_ms_per_frame']:.1f} ms ahorrados por frame")
 
 if __name__ == "__main__":
     main()
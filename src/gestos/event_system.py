@@ -3,13 +3,16 @@ Sistema de eventos para conectar detección de gestos con el renderer 3D.
 Permite comunicación desacoplada entre módulos mediante un patrón Observer.
 """
 
+import queue
 import socket
 import json
 import threading
 import time
-from typing import Callable, Dict, List, Any
+from typing import Callable, Dict, List, Any, Tuple
 from enum import Enum
 
+from src.utils.metrics import LatencyRecorder
+
 
 class GestureEvent(Enum):
     """Tipos de eventos de gestos disponibles."""
@@ -26,17 +29,43 @@ class GestureEvent(Enum):
     SWIPE_UP = "swipe_up"
     SWIPE_DOWN = "swipe_down"
     ROTATION = "rotation"  # Evento especial para rotación continua
+    ZOOM = "zoom"  # Escala continua (pinch-zoom con dos manos)
 
 
 class GestureEventBus:
     """
     Bus de eventos para gestos.
     Permite suscribirse a eventos y emitirlos.
+
+    Modos de despacho:
+        - ``"sync"``: ``emit`` llama a los handlers en el hilo que emite.
+        - ``"async"``: ``emit`` encola y retorna de inmediato; ``workers`` hilos
+          ejecutan los handlers (con un solo worker se conserva el orden).
+          Después de ``shutdown`` los eventos se ejecutan en el hilo que emite.
+
+    Las listas de suscriptores son copy-on-write: ``subscribe``/``unsubscribe``
+    reemplazan la tupla bajo el lock y ``emit`` la lee sin tomarlo, así que
+    ningún handler corre con el lock tomado. Cada handler registra su tiempo
+    de ejecución en ``latency`` (etapa ``"<evento>:<handler>"``).
     """
     
-    def __init__(self):
-        self._subscribers: Dict[GestureEvent, List[Callable]] = {}
+    def __init__(self, dispatch: str = "sync", workers: int = 1, latency: LatencyRecorder = None):
+        if dispatch not in ("sync", "async"):
+            raise ValueError(f"Modo de despacho desconocido: {dispatch}")
+        self.dispatch = dispatch
+        self.latency = latency or LatencyRecorder()
+        self._subscribers: Dict[GestureEvent, Tuple[Callable, ...]] = {}
         self._lock = threading.Lock()
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        if dispatch == "async":
+            for i in range(workers):
+                worker = threading.Thread(target=self._worker_loop, name=f"GestureEventBus-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
     
     def subscribe(self, event: GestureEvent, callback: Callable):
         """
@@ -47,16 +76,16 @@ class GestureEventBus:
             callback: Función que será llamada cuando ocurra el evento
         """
         with self._lock:
-            if event not in self._subscribers:
-                self._subscribers[event] = []
-            self._subscribers[event].append(callback)
+            self._subscribers[event] = self._subscribers.get(event, ()) + (callback,)
             print(f"📢 Suscrito a evento: {event.value}")
     
     def unsubscribe(self, event: GestureEvent, callback: Callable):
         """Desuscribe un callback de un evento."""
         with self._lock:
-            if event in self._subscribers:
-                self._subscribers[event].remove(callback)
+            callbacks = list(self._subscribers.get(event, ()))
+            if callback in callbacks:
+                callbacks.remove(callback)
+                self._subscribers[event] = tuple(callbacks)
     
     def emit(self, event: GestureEvent, data: Dict[str, Any] = None):
         """
@@ -66,38 +95,117 @@ class GestureEventBus:
             event: Tipo de evento
             data: Datos adicionales del evento
         """
-        with self._lock:
-            if event in self._subscribers:
-                for callback in self._subscribers[event]:
-                    try:
-                        if data:
-                            callback(data)
-                        else:
-                            callback()
-                    except Exception as e:
-                        print(f"❌ Error en callback de {event.value}: {e}")
+        callbacks = self._subscribers.get(event)
+        if not callbacks:
+            return
+        if self.dispatch == "async":
+            # Encolar con el lock: shutdown no puede colar su señal de fin antes
+            with self._idle:
+                if self._workers:
+                    self._pending += 1
+                    self._queue.put((event, callbacks, data))
+                    return
+        self._run(event, callbacks, data)
+
+    def _run(self, event: GestureEvent, callbacks: Tuple[Callable, ...], data: Dict[str, Any]):
+        """Ejecuta los handlers de un evento midiendo cada uno."""
+        for callback in callbacks:
+            start = time.perf_counter()
+            try:
+                if data:
+                    callback(data)
+                else:
+                    callback()
+            except Exception as e:
+                print(f"❌ Error en callback de {event.value}: {e}")
+            self.latency.record(f"{event.value}:{_handler_name(callback)}", time.perf_counter() - start)
+
+    def _worker_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._run(*item)
+            with self._idle:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._idle.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Espera a que se ejecuten los eventos encolados. Retorna False si vence el timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def handler_timings(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles de ejecución por handler, del más lento (p95) al más rápido."""
+        report = self.latency.report()
+        return dict(sorted(report.items(), key=lambda item: item[1]['p95_ms'], reverse=True))
+
+    def shutdown(self, timeout: float = 1.0):
+        """Ejecuta lo pendiente y detiene los workers; luego ``emit`` corre los handlers en línea."""
+        if not self._workers:
+            return
+        self.flush(timeout)
+        with self._idle:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.join(timeout)
+
+
+def _handler_name(callback: Callable) -> str:
+    """Nombre legible de un handler para las métricas."""
+    name = getattr(callback, '__qualname__', None) or type(callback).__name__
+    return name.replace('.<locals>', '')
+
+
+# Eventos continuos: sólo importa el último valor dentro de cada intervalo de envío
+CONTINUOUS_EVENTS = frozenset({GestureEvent.ROTATION, GestureEvent.ZOOM})
 
 
 class NetworkEventBridge:
     """
     Puente de red para enviar eventos de gestos al renderer 3D mediante sockets.
     Útil cuando el renderer está en un proceso separado.
+
+    Los envíos los hace un hilo de fondo:
+        - Los eventos continuos (``CONTINUOUS_EVENTS``) se fusionan: dentro de
+          cada ``flush_interval`` sólo se envía el último valor de cada uno.
+        - Los eventos discretos despiertan al hilo de inmediato y todos los
+          pendientes salen juntos en una única escritura.
+    Con ``flush_interval=0`` cada evento se envía en el momento, sin hilo.
     """
     
-    def __init__(self, host='localhost', port=9999):
+    def __init__(self, host='localhost', port=9999, flush_interval=1 / 120):
         self.host = host
         self.port = port
+        self.flush_interval = flush_interval
         self.socket = None
         self.connected = False
         self._lock = threading.Lock()
+
+        # Lote pendiente: evento continuo -> último dato; discretos con clave única
+        self._batch: Dict[Any, tuple] = {}
+        self._discrete_seq = 0
+        self._has_discrete = False
+        self._cond = threading.Condition()
+        self._flush_thread = None
+        self._last_flush = 0.0
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self.writes = 0
     
     def connect(self):
         """Establece conexión con el servidor del renderer."""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.connect((self.host, self.port))
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.connected = True
             print(f"🌐 Conectado al renderer en {self.host}:{self.port}")
+            if self.flush_interval > 0:
+                self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flush_thread.start()
             return True
         except Exception as e:
             print(f"❌ Error al conectar: {e}")
@@ -106,7 +214,7 @@ class NetworkEventBridge:
     
     def send_gesture_event(self, event: GestureEvent, data: Dict[str, Any] = None):
         """
-        Envía un evento de gesto al renderer.
+        Encola un evento de gesto para el renderer.
         
         Args:
             event: Tipo de evento
@@ -114,31 +222,103 @@ class NetworkEventBridge:
         """
         if not self.connected:
             return
-        
+
+        with self._cond:
+            counter = self.counters.get(event.value)
+            if counter is None:
+                counter = self.counters[event.value] = {'queued': 0, 'merged': 0, 'sent': 0}
+            counter['queued'] += 1
+
+        if self._flush_thread is None:
+            self._send_batch([(event, data)])
+            return
+
+        with self._cond:
+            if event in CONTINUOUS_EVENTS:
+                # Reinsertar al final: el valor fusionado sale después de los
+                # discretos que llegaron antes que él
+                if self._batch.pop(event, None) is not None:
+                    counter['merged'] += 1
+                self._batch[event] = (event, data)
+            else:
+                self._discrete_seq += 1
+                self._batch[self._discrete_seq] = (event, data)
+                self._has_discrete = True
+            self._cond.notify()
+
+    def _flush_loop(self):
+        """Hilo de envío: espera eventos, respeta el intervalo y envía el lote."""
+        while self.connected:
+            with self._cond:
+                while not self._batch and self.connected:
+                    self._cond.wait()
+                # Sólo eventos continuos: esperar al fin del intervalo para fusionarlos
+                deadline = self._last_flush + self.flush_interval
+                while not self._has_discrete and self.connected:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = list(self._batch.values())
+                self._batch.clear()
+                self._has_discrete = False
+            if batch:
+                self._last_flush = time.perf_counter()
+                self._send_batch(batch)
+
+    def flush(self):
+        """Envía ya los eventos pendientes."""
+        with self._cond:
+            batch = list(self._batch.values())
+            self._batch.clear()
+            self._has_discrete = False
+        if batch:
+            self._send_batch(batch)
+
+    def _send_batch(self, batch):
+        """Serializa el lote como líneas JSON y lo envía en una sola escritura."""
+        timestamp = time.time()
+        payload = "".join(
+            json.dumps({'event': event.value, 'data': data or {}, 'timestamp': timestamp}) + '\n'
+            for event, data in batch
+        ).encode('utf-8')
+
         try:
-            message = {
-                'event': event.value,
-                'data': data or {},
-                'timestamp': time.time()
-            }
-            
-            json_data = json.dumps(message) + '\n'
-            
             with self._lock:
-                self.socket.sendall(json_data.encode('utf-8'))
-                
+                self.socket.sendall(payload)
+            with self._cond:
+                self.writes += 1
+                for event, _ in batch:
+                    self.counters[event.value]['sent'] += 1
         except Exception as e:
             print(f"❌ Error al enviar evento: {e}")
             self.connected = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Eventos encolados, fusionados y enviados por tipo, y escrituras al socket."""
+        with self._cond:
+            return {
+                'events': {name: dict(c) for name, c in self.counters.items()},
+                'writes': self.writes,
+            }
     
     def disconnect(self):
-        """Cierra la conexión."""
+        """Envía lo pendiente y cierra la conexión."""
         if self.socket:
+            # Detener primero el hilo: el lote que ya tomó sale antes que el resto
+            with self._cond:
+                was_connected = self.connected
+                self.connected = False
+                self._cond.notify()
+            if self._flush_thread is not None:
+                self._flush_thread.join(timeout=1.0)
+                self._flush_thread = None
+            if was_connected:
+                self.flush()
             try:
                 self.socket.close()
             except:
                 pass
-            self.connected = False
             print("🔴 Desconectado del renderer")
 
 
@@ -147,8 +327,9 @@ class GestureController:
     Controlador principal que une detección de gestos con acciones.
     """
     
-    def __init__(self, use_network=False):
-        self.event_bus = GestureEventBus()
+    def __init__(self, use_network=False, dispatch="sync"):
+        # Con dispatch="async" el loop de detección no espera a los handlers
+        self.event_bus = GestureEventBus(dispatch=dispatch)
         self.network_bridge = NetworkEventBridge() if use_network else None
         
         if self.network_bridge:
@@ -168,18 +349,18 @@ class GestureController:
         # Click
         self.event_bus.subscribe(
             GestureEvent.CLICK,
-            lambda: print("🖱️ Click detectado")
+            lambda data=None: print("🖱️ Click detectado")
         )
         
         # Swipes
         self.event_bus.subscribe(
             GestureEvent.SWIPE_LEFT,
-            lambda: print("👈 Swipe izquierda")
+            lambda data=None: print("👈 Swipe izquierda")
         )
         
         self.event_bus.subscribe(
             GestureEvent.SWIPE_RIGHT,
-            lambda: print("👉 Swipe derecha")
+            lambda data=None: print("👉 Swipe derecha")
         )
     
     def _handle_rotation(self, data):
@@ -217,7 +398,8 @@ class GestureController:
             print(f"⚠️ Gesto no reconocido: {gesture_name}")
     
     def shutdown(self):
-        """Cierra todas las conexiones."""
+        """Ejecuta los eventos pendientes y cierra todas las conexiones."""
+        self.event_bus.shutdown()
         if self.network_bridge:
             self.network_bridge.disconnect()
 
@@ -240,4 +422,7 @@ if __name__ == "__main__":
     controller.process_gesture("ROTATION", {"angle": 45, "speed": 2.5})
     
     # Limpiar
-    controller.shutdown()
\ No newline at end of file
+    controller.shutdown()
+
+    # Tiempo de ejecución por handler
+    print(controller.event_bus.latency.format_report())
\ No newline at end of file
@@ -1,7 +1,10 @@
 """
 Aplicación principal de control por gestos con interfaz PySide6.
 """
+import time
+from types import SimpleNamespace
 import cv2
+import numpy as np
 from pathlib import Path
 from PySide6.QtWidgets import QWidget, QLabel, QHBoxLayout, QVBoxLayout
 from PySide6.QtGui import QImage, QPixmap
@@ -10,8 +13,18 @@ from PySide6.QtCore import QTimer, Qt
 # IMPORTS ABSOLUTOS CORREGIDOS
 from src.gestos.components.ui_components import ControlPanel, LegendPanel
 from src.gestos.components.hand_tracking import HandTracker
+from src.gestos.components.filters import make_filter
 from src.gestos.components.gesture_mapper import GestureMapper
-from src.gestos.utils.camera_utils import inicializar_camara
+from src.gestos.components.inference_worker import InferenceWorker
+from src.gestos.components.landmarks import as_landmark_array
+from src.gestos.components.multi_hand import MultiHandGesturePipeline
+from src.gestos.components.scheduler import InferenceScheduler
+from src.gestos.components.temporal import TemporalGestureRecognizer
+from src.gestos.event_system import NetworkEventBridge
+from src.gestos.offline.recording import LandmarkRecorder
+from src.gestos.utils.camera_utils import ThreadedCamera
+from src.utils.metrics import LatencyRecorder
+from src.utils.config import HAND_ROI
 
 
 class GestureApp(QWidget):
@@ -25,6 +38,12 @@ class GestureApp(QWidget):
         # --- Estado ---
         self.detection_active = False
         self.last_gesture = None
+        self._last_frame_id = -1
+        self._frame_buffer = None
+        self._last_shown = float('-inf')
+        self._pending = None
+        self._last_handedness = None
+        self.latency = LatencyRecorder()
         
         # --- Inicializar componentes ---
         try:
@@ -39,9 +58,9 @@ class GestureApp(QWidget):
             raise
     
     def _init_camera(self):
-        """Inicializa la cámara."""
+        """Inicializa la cámara con captura en un hilo dedicado."""
         try:
-            self.cap = inicializar_camara(width=640, height=480)
+            self.cap = ThreadedCamera(width=640, height=480).start()
             print("✅ Cámara inicializada")
         except IOError as e:
             print(f"❌ Error de cámara: {e}")
@@ -52,16 +71,39 @@ class GestureApp(QWidget):
         try:
             self.hand_tracker = HandTracker(
                 mode=False,
-                max_hands=1,
+                max_hands=2,
                 detection_con=0.7,
-                track_con=0.7
+                track_con=0.7,
+                roi=HAND_ROI
             )
             self.gesture_mapper = GestureMapper()
+            # Identidad por mano, filtro y clasificación vectorizados, estado de gesto por mano
+            self.hand_pipeline = MultiHandGesturePipeline(
+                self.gesture_mapper,
+                max_hands=self.hand_tracker.max_hands,
+                landmark_filter=make_filter("classification")
+            )
+            self.temporal = TemporalGestureRecognizer(max_hands=self.hand_tracker.max_hands)
+            # Swipes, rotación y zoom hacia el renderer del holograma (si está corriendo)
+            self.renderer = NetworkEventBridge()
+            self.renderer.connect()
+            # Tasa de inferencia según la actividad, con el costo medido por el worker
+            self.scheduler = InferenceScheduler(latency=self.latency)
+            self.inference_worker = InferenceWorker(
+                self.hand_tracker.process_frame,
+                backpressure="latest",
+                latency=self.latency
+            ).start()
             print("✅ Componentes de detección inicializados")
         except Exception as e:
             print(f"⚠️ Advertencia al inicializar detección: {e}")
             self.hand_tracker = None
             self.gesture_mapper = None
+            self.hand_pipeline = None
+            self.temporal = None
+            self.renderer = None
+            self.scheduler = None
+            self.inference_worker = None
     
     def _init_ui(self):
         """Inicializa la interfaz de usuario."""
@@ -157,58 +199,145 @@ class GestureApp(QWidget):
         print(f"🎮 Detección: {status}")
     
     def update_frame(self):
-        """Actualiza el frame de la cámara y procesa gestos."""
+        """
+        Actualiza el frame de la cámara y procesa gestos.
+        
+        La captura y la inferencia corren en sus propios hilos; aquí sólo se
+        encola el frame más reciente y se consume el último resultado disponible.
+        """
         if not self.cap or not self.cap.isOpened():
             self.video_label.setText("❌ Cámara no disponible")
             return
         
-        ret, frame = self.cap.read()
-        if not ret:
-            self.video_label.setText("❌ Error al leer frame")
+        detecting = self.detection_active and self.inference_worker and self.gesture_mapper
+        
+        # Copiar el frame más reciente sin bloquear
+        frame_id, frame, capture_time = self.cap.buffer.read_latest(out=self._frame_buffer)
+        if frame is not None and frame_id != self._last_frame_id:
+            self._frame_buffer = frame
+            self._last_frame_id = frame_id
+            self.latency.record('capture', time.perf_counter() - capture_time)
+            
+            # Voltear para efecto espejo (cv2.flip crea un array nuevo que pasa al worker)
+            frame = cv2.flip(frame, 1)
+            if not detecting:
+                self._display_frame(frame)
+            elif self.scheduler.should_run(capture_time):
+                self.inference_worker.submit(frame_id, frame, capture_time)
+                self._pending = capture_time
+            else:
+                self._skip_frame(frame, capture_time)
+        
+        if not detecting:
             return
         
-        # Voltear para efecto espejo
-        frame = cv2.flip(frame, 1)
+        # Consumir sólo el resultado de inferencia más reciente
+        result = self.inference_worker.get_latest_result()
+        if result is None:
+            return
         
-        # Procesar detección si está activa
-        if self.detection_active and self.hand_tracker and self.gesture_mapper:
-            try:
-                # Procesar con HandTracker
-                frame, results = self.hand_tracker.process_frame(frame)
-                
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        # Detectar gesto
-                        gesture = self.gesture_mapper.detect_gesture(hand_landmarks)
-                        
-                        if gesture and gesture != self.last_gesture:
-                            # Mostrar gesto detectado
-                            print(f"✋ Gesto detectado: {gesture}")
-                            self.last_gesture = gesture
-                            
-                            # Mostrar en pantalla
-                            cv2.putText(
-                                frame,
-                                f"Gesto: {gesture}",
-                                (10, 50),
-                                cv2.FONT_HERSHEY_SIMPLEX,
-                                1.2,
-                                (0, 255, 0),
-                                3
-                            )
-                            
-                            # Aquí podrías agregar acciones:
-                            # if gesture == "CLICK":
-                            #     from src.gestos.components.click_control import click_izquierdo
-                            #     click_izquierdo()
+        frame = result.frame
+        if self._pending is not None and result.capture_time >= self._pending:
+            self._pending = None
+        with self.latency.measure('mapping'):
+            self._map_gestures(frame, result.results, result.capture_time)
+        # Un frame saltado más nuevo ya se mostró: no volver atrás en el video
+        if result.capture_time > self._last_shown:
+            self._last_shown = result.capture_time
+            self._display_frame(frame)
+        self.latency.record('total', time.perf_counter() - result.capture_time)
+    
+    def _skip_frame(self, frame, capture_time):
+        """Frame que el programador no manda a inferir: landmarks interpolados."""
+        # Con una inferencia en curso (más antigua) no se interpola, para que
+        # los gestos reciban los frames en orden; un resultado perdido se
+        # deja de esperar a los 0.25 s
+        if self._pending is not None and capture_time - self._pending < 0.25:
+            hands = None
+        else:
+            hands = self.scheduler.interpolate(capture_time)
+        if hands is not None:
+            results = SimpleNamespace(multi_hand_landmarks=list(hands), multi_handedness=self._last_handedness)
+            self._map_gestures(frame, results, capture_time, interpolated=True)
+        self._last_shown = capture_time
+        self._display_frame(frame)
+    
+    def _map_gestures(self, frame, results, capture_time=None, interpolated=False):
+        """Clasifica los gestos de las manos detectadas y los dibuja en el frame."""
+        try:
+            hands = results.multi_hand_landmarks
+            stacked = np.stack([as_landmark_array(h) for h in hands]) if hands else None
+            
+            # Todas las manos a la vez; cada una con su id y su estado de gesto
+            hand_results, two_hand_events = self.hand_pipeline.update(
+                stacked, getattr(results, 'multi_handedness', None), capture_time)
+            tracked = np.stack([hand.landmarks for hand in hand_results]) if hand_results else None
+            if not interpolated:
+                # El programador interpola por slot: que MediaPipe reordene las
+                # manos no es movimiento; la lateralidad queda en el mismo orden
+                self.scheduler.observe(tracked, capture_time, ids=[hand.hand_id for hand in hand_results])
+                self._last_handedness = [hand.handedness for hand in hand_results]
+            for event, data in two_hand_events:
+                print(f"🤲 Gesto de dos manos: {event.value} {data['scale']:.2f}x")
+                self.renderer.send_gesture_event(event, data)
+            
+            # Gestos temporales (swipes, rotación) sobre la historia de cada
+            # mano seguida: por slot, no en el orden de MediaPipe
+            for event, data in self.temporal.update(
+                    tracked, capture_time, slots=[hand.slot for hand in hand_results],
+                    ids=[hand.hand_id for hand in hand_results]):
+                print(f"↔️ Gesto temporal: {event.value} {data}")
+                self.renderer.send_gesture_event(event, data)
+            
+            height, width = frame.shape[:2]
+            for hand in hand_results:
+                if hand.action:
+                    print(f"✋ Mano {hand.hand_id} ({hand.handedness}): {hand.action}")
+                    self.last_gesture = hand.action
+                    
+                    # Aquí podrías agregar acciones:
+                    # if hand.action == "CLICK":
+                    #     from src.gestos.components.click_control import click_izquierdo
+                    #     click_izquierdo()
                 
-            except Exception as e:
-                print(f"⚠️ Error en detección: {e}")
+                # Mostrar el gesto estable de cada mano junto a su muñeca
+                state = self.hand_pipeline.states[hand.slot].state
+                if state:
+                    x, y = (hand.landmarks[0, :2] * (width, height)).astype(int)
+                    cv2.putText(
+                        frame,
+                        f"{hand.hand_id}: {state}",
+                        (int(x), int(y) + 30),
+                        cv2.FONT_HERSHEY_SIMPLEX,
+                        1.0,
+                        (0, 255, 0),
+                        2
+                    )
+        
+        except Exception as e:
+            print(f"⚠️ Error en detección: {e}")
+    
+    def _display_frame(self, frame):
+        """Dibuja los indicadores de estado y muestra el frame en la UI."""
+        start = time.perf_counter()
         
         # Indicador visual de estado
         status_color = (0, 255, 0) if self.detection_active else (128, 128, 128)
         cv2.circle(frame, (frame.shape[1] - 30, 30), 15, status_color, -1)
         
+        # Estadísticas de captura y modo de inferencia
+        stats = self.cap.get_stats()
+        mode = f" | Inferencia: {self.scheduler.mode}" if self.detection_active and self.scheduler else ""
+        cv2.putText(
+            frame,
+            f"Cam: {stats['fps']:.0f} FPS | Descartados: {stats['dropped']}{mode}",
+            (10, frame.shape[0] - 15),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.5,
+            (200, 200, 200),
+            1
+        )
+        
         # Convertir a QImage y mostrar
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         h, w, ch = rgb_frame.shape
@@ -222,6 +351,32 @@ class GestureApp(QWidget):
                 Qt.SmoothTransformation
             )
         )
+        self.latency.record('display', time.perf_counter() - start)
+    
+    def start_recording(self, path, frame_size=(160, 120)):
+        """
+        Graba los landmarks (y miniaturas de los frames) de la sesión en ``path``.
+        
+        La grabación se hace en ``HandTracker.process_frame``, dentro del hilo de inferencia.
+        """
+        if not self.hand_tracker:
+            print("⚠️ No hay detector de manos para grabar")
+            return
+        self.stop_recording()
+        self.hand_tracker.recorder = LandmarkRecorder(
+            path,
+            max_hands=self.hand_tracker.max_hands,
+            frame_size=frame_size
+        )
+        print(f"⏺️ Grabando sesión en: {path}")
+    
+    def stop_recording(self):
+        """Detiene la grabación en curso (si la hay)."""
+        recorder = getattr(getattr(self, 'hand_tracker', None), 'recorder', None)
+        if recorder is not None:
+            self.hand_tracker.recorder = None
+            recorder.close()
+            print(f"⏹️ Grabación finalizada ({recorder.records_written} frames)")
     
     def on_closing(self):
         """Maneja el cierre de la aplicación."""
@@ -231,6 +386,21 @@ class GestureApp(QWidget):
         if hasattr(self, 'timer'):
             self.timer.stop()
         
+        # Detener inferencia y mostrar latencias por etapa
+        if getattr(self, 'inference_worker', None):
+            self.inference_worker.stop()
+            print(self.latency.format_report())
+            if self.hand_tracker.roi is not None:
+                report = self.hand_tracker.roi.report()
+                print(f"ROI: {report['hit_rate']:.0%} de frames con recorte, "
+                      f"{report['saved_ms_per_frame']:.1f} ms ahorrados por frame")
+            report = self.scheduler.report()
+            print(f"Programador: {report['run_fraction']:.0%} de frames inferidos, "
+                  f"{report['interpolated']} interpolados")
+        self.stop_recording()
+        if getattr(self, 'renderer', None):
+            self.renderer.disconnect()
+        
         # Liberar cámara
         if hasattr(self, 'cap') and self.cap:
             self.cap.release()
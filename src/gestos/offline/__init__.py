@@ -0,0 +1,10 @@
+"""
+Herramientas offline: datasets de landmarks y evaluación por lotes sin cámara.
+
+El motor de evaluación vive en ``src.gestos.offline.batch_engine`` (ejecutable
+con ``python -m``), por eso no se re-exporta aquí.
+"""
+
+from .dataset import LandmarkDataset, synthetic_dataset
+
+__all__ = ['LandmarkDataset', 'synthetic_dataset']
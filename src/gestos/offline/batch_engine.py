@@ -0,0 +1,222 @@
+"""
+Motor de clasificación de gestos por lotes sobre landmarks grabados.
+
+Ejecuta ``GestureMapper`` y la lógica temporal (cooldown de gestos repetidos)
+sobre millones de frames sin cámara, y reporta matrices de confusión por
+gesto y throughput. Permite ajustar umbrales como la distancia de clic.
+
+Uso:
+    python -m src.gestos.offline.batch_engine --synthetic 1000000
+    python -m src.gestos.offline.batch_engine ruta/dataset --sweep 0.03,0.04,0.05,0.06
+    python -m src.gestos.offline.batch_engine sesion.hglm
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.gestos.components.gesture_mapper import GESTURE_NAMES, GestureMapper
+from src.gestos.components.gesture_state import GestureStateMachine
+from src.gestos.offline.dataset import UNLABELED, LandmarkDataset, label_names, synthetic_dataset
+from src.gestos.offline.recording import Recording
+from src.utils.config import GESTURE_COOLDOWN
+
+
+class BatchGestureEngine:
+    """Clasificación vectorizada por bloques y evaluación de un dataset completo."""
+
+    def __init__(
+        self,
+        mapper: Optional[GestureMapper] = None,
+        cooldown: float = GESTURE_COOLDOWN,
+        chunk_size: int = 65536,
+        debounce: bool = False
+    ):
+        """
+        Args:
+            mapper: Clasificador a evaluar (uno por defecto si es None)
+            cooldown: Segundos durante los que se suprime la repetición del mismo gesto
+                (mismo criterio que ``GestureController.COOLDOWN_SECONDS``)
+            chunk_size: Frames por bloque; acota la memoria temporal de cada paso
+            debounce: Reproducir los códigos con ``GestureStateMachine`` (votación
+                e histéresis, como en vivo) en lugar de sólo el cooldown
+        """
+        self.mapper = mapper or GestureMapper()
+        self.cooldown = cooldown
+        self.chunk_size = chunk_size
+        self.debounce = debounce
+
+    def classify(self, landmarks: np.ndarray) -> np.ndarray:
+        """Clasifica ``(N, 21, 3)`` landmarks y retorna ``N`` códigos de gesto."""
+        codes = np.empty(len(landmarks), dtype=np.int8)
+        for start in range(0, len(landmarks), self.chunk_size):
+            stop = start + self.chunk_size
+            codes[start:stop] = self.mapper.detect_batch(landmarks[start:stop])
+        return codes
+
+    def detect_events(self, codes: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Aplica la lógica temporal y retorna los índices de frame que dispararían una acción.
+
+        Un gesto dispara cuando es distinto del último disparado, o cuando es el
+        mismo pero ya pasó el cooldown. Se itera por tramos de código constante
+        (no por frame), así que el coste es proporcional al número de cambios.
+        """
+        if len(codes) == 0:
+            return np.empty(0, dtype=np.int64)
+        if self.debounce:
+            return self._debounced_events(codes, timestamps)
+
+        run_starts = np.flatnonzero(np.diff(codes, prepend=codes[0] - 1))
+        run_ends = np.append(run_starts[1:], len(codes))
+
+        events = []
+        last_code, last_time = 0, -np.inf
+        for start, end in zip(run_starts, run_ends):
+            code = codes[start]
+            if code == 0:
+                continue
+            times = timestamps[start:end]
+            allowed = last_time + self.cooldown if code == last_code else -np.inf
+            i = int(np.searchsorted(times, allowed))
+            while i < len(times):
+                events.append(start + i)
+                last_code, last_time = code, times[i]
+                i = max(i + 1, int(np.searchsorted(times, last_time + self.cooldown)))
+        return np.asarray(events, dtype=np.int64)
+
+    def _debounced_events(self, codes: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+        """Frames donde dispara ``GestureStateMachine`` (un paso por frame, como en vivo)."""
+        state = GestureStateMachine(cooldown=self.cooldown)
+        update = state.update
+        events = [i for i, (code, t) in enumerate(zip(codes.tolist(), timestamps.tolist()))
+                  if update(code or None, t) is not None]
+        return np.asarray(events, dtype=np.int64)
+
+    @staticmethod
+    def confusion_matrix(labels: np.ndarray, predictions: np.ndarray) -> np.ndarray:
+        """Matriz ``[etiqueta, predicción]`` sobre los frames etiquetados."""
+        k = len(GESTURE_NAMES)
+        mask = labels != UNLABELED
+        index = labels[mask].astype(np.int64) * k + predictions[mask]
+        return np.bincount(index, minlength=k * k).reshape(k, k)
+
+    def evaluate(self, dataset: LandmarkDataset) -> Dict[str, Any]:
+        """
+        Evalúa el dataset completo.
+
+        Returns:
+            Diccionario con throughput, eventos por gesto y, si el dataset está
+            etiquetado, matriz de confusión, precisión y recall por gesto
+        """
+        start = time.perf_counter()
+        codes = self.classify(dataset.landmarks)
+        classify_time = time.perf_counter() - start
+        events = self.detect_events(codes, np.asarray(dataset.timestamps))
+        total_time = time.perf_counter() - start
+
+        n = len(dataset)
+        names = label_names()
+        event_counts = np.bincount(codes[events], minlength=len(names))
+        report: Dict[str, Any] = {
+            'frames': n,
+            'seconds': total_time,
+            'frames_per_second': n / total_time if total_time > 0 else float('inf'),
+            'classify_frames_per_second': n / classify_time if classify_time > 0 else float('inf'),
+            'events': {names[c]: int(event_counts[c]) for c in range(1, len(names))},
+            'click_threshold': self.mapper.click_threshold,
+        }
+
+        labels = np.asarray(dataset.labels)
+        if dataset.labeled:
+            matrix = self.confusion_matrix(labels, codes)
+            true_pos = np.diag(matrix)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                precision = np.where(matrix.sum(0) > 0, true_pos / matrix.sum(0), 0.0)
+                recall = np.where(matrix.sum(1) > 0, true_pos / matrix.sum(1), 0.0)
+            report['confusion'] = matrix
+            report['accuracy'] = float(true_pos.sum() / max(matrix.sum(), 1))
+            report['per_gesture'] = {
+                names[c]: {'precision': float(precision[c]), 'recall': float(recall[c]),
+                           'support': int(matrix[c].sum())}
+                for c in range(len(names))
+            }
+        return report
+
+    def sweep_click_threshold(
+        self,
+        dataset: LandmarkDataset,
+        thresholds: Sequence[float]
+    ) -> List[Dict[str, Any]]:
+        """Evalúa el dataset con varios umbrales de clic."""
+        original = self.mapper.click_threshold
+        reports = []
+        try:
+            for threshold in thresholds:
+                self.mapper.click_threshold = threshold
+                reports.append(self.evaluate(dataset))
+        finally:
+            self.mapper.click_threshold = original
+        return reports
+
+
+def format_confusion(matrix: np.ndarray) -> str:
+    """Tabla de texto de una matriz de confusión (filas = etiqueta, columnas = predicción)."""
+    names = label_names()
+    width = max(len(n) for n in names) + 2
+    lines = [" " * width + "".join(f"{n:>{width}}" for n in names)]
+    for name, row in zip(names, matrix):
+        lines.append(f"{name:<{width}}" + "".join(f"{v:>{width}}" for v in row))
+    return "\n".join(lines)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Resumen legible de un reporte de ``BatchGestureEngine.evaluate``."""
+    lines = [
+        f"Umbral de clic: {report['click_threshold']:.3f}",
+        f"Frames: {report['frames']:,}  |  {report['frames_per_second']:,.0f} frames/s "
+        f"(clasificación {report['classify_frames_per_second']:,.0f} frames/s)",
+        "Eventos: " + ", ".join(f"{k}={v}" for k, v in report['events'].items()),
+    ]
+    if 'confusion' in report:
+        lines.append(f"Exactitud: {report['accuracy']:.4f}")
+        lines.append(format_confusion(report['confusion']))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluación offline de gestos por lotes")
+    parser.add_argument('dataset', nargs='?',
+                        help="Directorio del dataset o archivo de grabación de landmarks")
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help="Generar un dataset sintético con N frames")
+    parser.add_argument('--noise', type=float, default=0.004)
+    parser.add_argument('--click-threshold', type=float, default=GestureMapper.CLICK_THRESHOLD)
+    parser.add_argument('--cooldown', type=float, default=GESTURE_COOLDOWN)
+    parser.add_argument('--debounce', action='store_true',
+                        help="Eventos con votación e histéresis (GestureStateMachine)")
+    parser.add_argument('--sweep', help="Lista de umbrales de clic separados por comas")
+    args = parser.parse_args(argv)
+
+    if args.dataset and Path(args.dataset).is_file():
+        dataset = Recording(args.dataset).to_dataset()
+    elif args.dataset:
+        dataset = LandmarkDataset.load(args.dataset)
+    else:
+        dataset = synthetic_dataset(args.synthetic or 100_000, noise=args.noise)
+
+    engine = BatchGestureEngine(GestureMapper(args.click_threshold), cooldown=args.cooldown,
+                                debounce=args.debounce)
+    if args.sweep:
+        thresholds = [float(t) for t in args.sweep.split(',')]
+        for report in engine.sweep_click_threshold(dataset, thresholds):
+            print(format_report(report))
+            print("-" * 60)
+    else:
+        print(format_report(engine.evaluate(dataset)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Datasets de landmarks grabados para evaluación offline.
+
+Formato en disco: un directorio con un ``.npy`` por campo, de modo que los
+datasets grandes se abren con ``mmap_mode='r'`` sin cargarlos en memoria:
+
+    landmarks.npy   float32 (N, 21, 3)   landmarks normalizados
+    labels.npy      int8    (N,)         código de gesto esperado (-1 = sin etiqueta)
+    timestamps.npy  float64 (N,)         segundos desde el inicio de la sesión
+    sequences.npy   int64   (S,)         índice del primer frame de cada secuencia
+"""
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from src.gestos.components.gesture_mapper import GESTURE_CODES, GESTURE_NAMES
+from src.gestos.components.landmarks import NUM_LANDMARKS
+
+UNLABELED = -1
+
+_FIELDS = ('landmarks', 'labels', 'timestamps', 'sequences')
+
+
+class LandmarkDataset:
+    """Secuencias de landmarks con etiquetas de gesto y marcas de tiempo."""
+
+    def __init__(
+        self,
+        landmarks: np.ndarray,
+        labels: Optional[np.ndarray] = None,
+        timestamps: Optional[np.ndarray] = None,
+        sequences: Optional[np.ndarray] = None,
+        fps: float = 30.0
+    ):
+        n = len(landmarks)
+        if landmarks.shape[1:] != (NUM_LANDMARKS, 3):
+            raise ValueError(f"Se esperaban landmarks (N, 21, 3), no {landmarks.shape}")
+        self.landmarks = landmarks
+        self.labels = labels if labels is not None else np.full(n, UNLABELED, dtype=np.int8)
+        self.timestamps = timestamps if timestamps is not None else np.arange(n) / fps
+        self.sequences = sequences if sequences is not None else np.zeros(1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.landmarks)
+
+    @property
+    def labeled(self) -> bool:
+        return bool(np.any(self.labels != UNLABELED))
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Guarda el dataset en un directorio (se crea si no existe)."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / 'landmarks.npy', np.asarray(self.landmarks, dtype=np.float32))
+        np.save(path / 'labels.npy', np.asarray(self.labels, dtype=np.int8))
+        np.save(path / 'timestamps.npy', np.asarray(self.timestamps, dtype=np.float64))
+        np.save(path / 'sequences.npy', np.asarray(self.sequences, dtype=np.int64))
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "LandmarkDataset":
+        """Abre un dataset; con ``mmap`` los arrays se leen bajo demanda desde disco."""
+        path = Path(path)
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(path / f'{name}.npy', mmap_mode=mode) for name in _FIELDS}
+        return cls(**arrays)
+
+
+# ===== Poses canónicas para datasets sintéticos =====
+
+def _base_pose() -> np.ndarray:
+    """Mano con todos los dedos bajados y el pulgar separado del índice."""
+    pose = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+    pose[:, 0] = 0.5
+    pose[:, 1] = 0.6
+    # Pulgar a la derecha de su articulación (bajado) y lejos del índice
+    pose[3, 0], pose[4, 0] = 0.40, 0.45
+    pose[4, 1] = 0.55
+    # Articulaciones PIP de los otros dedos por encima de las puntas (dedos bajados)
+    for tip in (8, 12, 16, 20):
+        pose[tip - 2, 1] = 0.55
+        pose[tip, 1] = 0.65
+        pose[tip, 0] = pose[tip - 2, 0] = 0.5 + (tip - 12) * 0.01
+    return pose
+
+
+def canonical_poses() -> dict:
+    """Retorna una pose representativa ``(21, 3)`` por código de gesto."""
+    poses = {}
+    fist = _base_pose()
+    # Puño: pulgar recogido junto al índice
+    fist[4, :2] = fist[8, :2] + 0.01
+    poses[GESTURE_CODES['FIST']] = fist
+
+    open_hand = _base_pose()
+    open_hand[4, 0] = 0.30
+    for tip in (8, 12, 16, 20):
+        open_hand[tip, 1] = 0.30
+    poses[GESTURE_CODES['OPEN_HAND']] = open_hand
+
+    pointing = _base_pose()
+    pointing[8, 1] = 0.30
+    poses[GESTURE_CODES['POINTING']] = pointing
+
+    click = _base_pose()
+    click[8, 1] = 0.45
+    click[4, :2] = click[8, :2] + (0.015, 0.015)
+    poses[GESTURE_CODES['CLICK']] = click
+
+    # Ninguno: índice y medio levantados (gesto no mapeado)
+    peace = _base_pose()
+    peace[8, 1] = peace[12, 1] = 0.30
+    poses[0] = peace
+    return poses
+
+
+def synthetic_dataset(
+    n_frames: int,
+    noise: float = 0.004,
+    fps: float = 30.0,
+    mean_hold: float = 1.0,
+    seed: Optional[int] = 0
+) -> LandmarkDataset:
+    """
+    Genera un dataset etiquetado con segmentos de gestos sostenidos y ruido gaussiano.
+
+    Args:
+        n_frames: Número total de frames
+        noise: Desviación estándar del ruido por coordenada
+        fps: Frecuencia de muestreo simulada
+        mean_hold: Duración media (s) de cada gesto sostenido
+        seed: Semilla del generador aleatorio
+    """
+    rng = np.random.default_rng(seed)
+    poses = canonical_poses()
+    codes = np.array(sorted(poses), dtype=np.int8)
+    pose_table = np.stack([poses[c] for c in codes])
+
+    # Longitudes de segmento hasta cubrir n_frames
+    mean_len = max(1, int(mean_hold * fps))
+    lengths = rng.poisson(mean_len, size=n_frames // mean_len + 2) + 1
+    lengths = lengths[:np.searchsorted(np.cumsum(lengths), n_frames) + 1]
+    segment_codes = rng.integers(0, len(codes), size=len(lengths))
+    labels_idx = np.repeat(segment_codes, lengths)[:n_frames]
+
+    landmarks = pose_table[labels_idx]
+    landmarks += rng.normal(0.0, noise, size=landmarks.shape).astype(np.float32)
+    return LandmarkDataset(
+        landmarks=landmarks,
+        labels=codes[labels_idx],
+        timestamps=np.arange(n_frames, dtype=np.float64) / fps,
+    )
+
+
+def label_names() -> list:
+    """Nombres de las clases en el orden de los códigos (``NONE`` para el código 0)."""
+    return [name or 'NONE' for name in GESTURE_NAMES]
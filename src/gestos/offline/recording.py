@@ -0,0 +1,403 @@
+"""
+Grabación y reproducción de sesiones de landmarks.
+
+Formato de archivo (append-only, little-endian):
+
+    cabecera (64 bytes): magic ``HGLM``, versión, máximo de manos y tamaño
+                         de la miniatura del frame (0x0 si no se guardan frames)
+    registros de tamaño fijo, uno por frame procesado:
+        timestamp   f8                 segundos (time.time())
+        frame_id    i8
+        num_hands   u1
+        gesture     i1                 código de gesto (-1 = desconocido)
+        handedness  i1[max_hands]      0 = izquierda, 1 = derecha, -1 = ninguna
+        landmarks   f4[max_hands,21,3]
+
+Las miniaturas opcionales de los frames (BGR, ``u1[h, w, 3]``) van en un archivo
+paralelo ``<ruta>.frames``, un frame por registro y en el mismo orden, para que
+reproducir sólo landmarks no tenga que leer los frames del disco.
+
+Como todos los registros miden lo mismo, la reproducción abre los archivos con
+``np.memmap`` y cada frame/landmark es una vista sin copia sobre el archivo.
+"""
+import struct
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from src.gestos.components.landmarks import NUM_LANDMARKS, HandLandmarks, fill_landmarks
+from src.gestos.offline.dataset import LandmarkDataset
+
+MAGIC = b"HGLM"
+VERSION = 1
+HEADER = struct.Struct("<4sHBHH")
+HEADER_SIZE = 64
+
+HANDEDNESS_CODES = {'Left': 0, 'Right': 1}
+HANDEDNESS_NAMES = {code: name for name, code in HANDEDNESS_CODES.items()}
+
+
+def record_dtype(max_hands: int = 2) -> np.dtype:
+    """dtype estructurado de un registro con ``max_hands`` manos."""
+    return np.dtype([
+        ('timestamp', '<f8'),
+        ('frame_id', '<i8'),
+        ('num_hands', 'u1'),
+        ('gesture', 'i1'),
+        ('handedness', 'i1', (max_hands,)),
+        ('landmarks', '<f4', (max_hands, NUM_LANDMARKS, 3)),
+    ])
+
+
+def frames_path(path: Union[str, Path]) -> Path:
+    """Ruta del archivo de miniaturas asociado a una grabación."""
+    path = Path(path)
+    return path.with_name(path.name + '.frames')
+
+
+class LandmarkRecorder:
+    """
+    Graba landmarks (y opcionalmente frames reducidos) en un archivo append-only.
+
+    Se conecta a ``HandTracker`` asignándolo a ``hand_tracker.recorder``; cada
+    llamada a ``process_frame`` agrega un registro. ``record`` (hilo de
+    inferencia) y ``close`` (hilo de la UI) se excluyen con un lock; un
+    ``record`` después de ``close`` se ignora.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_hands: int = 2,
+        frame_size: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Args:
+            path: Archivo de salida; si ya existe se agregan registros al final
+            max_hands: Manos guardadas por frame
+            frame_size: ``(ancho, alto)`` de la miniatura; None para no guardar frames
+        """
+        self.path = Path(path)
+        self.max_hands = max_hands
+        self.frame_size = tuple(frame_size) if frame_size else None
+        self.dtype = record_dtype(max_hands)
+
+        exists = self.path.exists() and self.path.stat().st_size > 0
+        if exists:
+            header = read_header(self.path)
+            if (header['max_hands'], header['frame_size']) != (max_hands, self.frame_size):
+                raise ValueError(f"El archivo {self.path} usa otro formato de registro")
+
+        self._file = open(self.path, 'ab')
+        if not exists:
+            self._file.write(_pack_header(max_hands, self.frame_size))
+
+        # Registro y miniatura preasignados que se reescriben en cada frame
+        self._record = np.zeros(1, dtype=self.dtype)
+        self._frames_file = None
+        if self.frame_size:
+            width, height = self.frame_size
+            self._thumbnail = np.zeros((height, width, 3), dtype=np.uint8)
+            self._frames_file = open(frames_path(self.path), 'ab')
+        self._frame_id = 0
+        self.records_written = 0
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        results: Any,
+        frame: Optional[np.ndarray] = None,
+        gesture: int = -1,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """
+        Agrega un registro a partir de los resultados de MediaPipe.
+
+        Args:
+            results: Objeto con ``multi_hand_landmarks`` (y opcionalmente ``multi_handedness``)
+            frame: Frame BGR completo; se reduce a ``frame_size`` si se graban frames
+            gesture: Código de gesto asociado al frame
+            timestamp: Marca de tiempo (por defecto ``time.time()``)
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._record_locked(results, frame, gesture, timestamp)
+
+    def _record_locked(self, results, frame, gesture, timestamp):
+        rec = self._record[0]
+        rec['timestamp'] = time.time() if timestamp is None else timestamp
+        rec['frame_id'] = self._frame_id
+        rec['gesture'] = gesture
+        rec['handedness'] = -1
+
+        hands = getattr(results, 'multi_hand_landmarks', None) or []
+        handedness = getattr(results, 'multi_handedness', None) or []
+        num_hands = min(len(hands), self.max_hands)
+        rec['num_hands'] = num_hands
+        for i in range(num_hands):
+            fill_landmarks(rec['landmarks'][i], hands[i])
+            if i < len(handedness):
+                rec['handedness'][i] = handedness_code(handedness[i])
+
+        if self._frames_file is not None:
+            # Siempre un frame por registro para mantener la alineación
+            if frame is not None:
+                cv2.resize(frame, self.frame_size, dst=self._thumbnail, interpolation=cv2.INTER_AREA)
+            else:
+                self._thumbnail[...] = 0
+            self._frames_file.write(memoryview(self._thumbnail).cast('B'))
+
+        self._file.write(memoryview(self._record).cast('B'))
+        self._frame_id += 1
+        self.records_written += 1
+
+    def flush(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            if self._frames_file is not None:
+                self._frames_file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+            if self._frames_file is not None and not self._frames_file.closed:
+                self._frames_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def handedness_code(handedness: Any) -> int:
+    """Convierte la clasificación de MediaPipe (o un string) en 0/1."""
+    if handedness is None:
+        return -1
+    if isinstance(handedness, str):
+        label = handedness
+    else:
+        label = handedness.classification[0].label
+    return HANDEDNESS_CODES.get(label, -1)
+
+
+def _pack_header(max_hands: int, frame_size: Optional[Tuple[int, int]]) -> bytes:
+    width, height = frame_size or (0, 0)
+    return HEADER.pack(MAGIC, VERSION, max_hands, width, height).ljust(HEADER_SIZE, b"\0")
+
+
+def read_header(path: Union[str, Path]) -> dict:
+    """Lee y valida la cabecera de una grabación."""
+    with open(path, 'rb') as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f"Grabación truncada: {path}")
+    magic, version, max_hands, width, height = HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError(f"No es una grabación de landmarks: {path}")
+    if version != VERSION:
+        raise ValueError(f"Versión de grabación no soportada: {version}")
+    return {
+        'version': version,
+        'max_hands': max_hands,
+        'frame_size': (width, height) if width and height else None,
+    }
+
+
+class Recording:
+    """Grabación abierta con memoria mapeada; todos los accesos son vistas sin copia."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        header = read_header(self.path)
+        self.max_hands = header['max_hands']
+        self.frame_size = header['frame_size']
+        self.dtype = record_dtype(self.max_hands)
+
+        # Ignorar un registro final incompleto (grabación interrumpida)
+        count = (self.path.stat().st_size - HEADER_SIZE) // self.dtype.itemsize
+        self.frames = None
+        if self.frame_size:
+            width, height = self.frame_size
+            frame_file = frames_path(self.path)
+            frame_bytes = width * height * 3
+            n_frames = frame_file.stat().st_size // frame_bytes if frame_file.exists() else 0
+            count = min(count, n_frames)
+            if count > 0:
+                self.frames = np.memmap(frame_file, dtype=np.uint8, mode='r',
+                                        shape=(count, height, width, 3))
+            else:
+                self.frame_size = None
+
+        if count > 0:
+            self.records = np.memmap(self.path, dtype=self.dtype, mode='r',
+                                     offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def has_frames(self) -> bool:
+        return self.frame_size is not None
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.records['timestamp']
+
+    @property
+    def landmarks(self) -> np.ndarray:
+        """Vista ``(N, max_hands, 21, 3)``."""
+        return self.records['landmarks']
+
+    @property
+    def duration(self) -> float:
+        if len(self) < 2:
+            return 0.0
+        return float(self.timestamps[-1] - self.timestamps[0])
+
+    def to_dataset(self, hand: int = 0) -> LandmarkDataset:
+        """Dataset con la mano ``hand`` de los frames donde aparece (etiquetas = gesto grabado)."""
+        mask = self.records['num_hands'] > hand
+        if mask.all():
+            # Sin filtrado: vistas directas sobre el archivo
+            landmarks = self.landmarks[:, hand]
+            labels = self.records['gesture']
+            timestamps = self.timestamps - self.timestamps[0]
+        else:
+            landmarks = self.landmarks[mask, hand]
+            labels = self.records['gesture'][mask]
+            timestamps = self.timestamps[mask] - (self.timestamps[0] if len(self) else 0.0)
+        return LandmarkDataset(landmarks=landmarks, labels=labels, timestamps=timestamps)
+
+    def hands(self, index: int) -> list:
+        """Lista de ``HandLandmarks`` (vistas sobre el archivo) del registro ``index``."""
+        rec = self.records[index]
+        return [
+            HandLandmarks(rec['landmarks'][i], HANDEDNESS_NAMES.get(int(rec['handedness'][i])))
+            for i in range(int(rec['num_hands']))
+        ]
+
+
+class ReplaySource:
+    """
+    Fuente de frames con la interfaz de ``cv2.VideoCapture`` que reproduce una grabación.
+
+    En modo ``realtime`` respeta los tiempos originales; si no, entrega los
+    registros tan rápido como se pidan. Los frames son vistas sobre el archivo
+    mapeado (o un frame negro fijo si la grabación no guardó frames).
+    """
+
+    def __init__(
+        self,
+        recording: Union[Recording, str, Path],
+        realtime: bool = False,
+        loop: bool = False,
+        blank_size: Tuple[int, int] = (640, 480)
+    ):
+        self.recording = recording if isinstance(recording, Recording) else Recording(recording)
+        self.realtime = realtime
+        self.loop = loop
+        self.position = 0
+        self.current = -1
+        self._opened = True
+        self._start_wall = None
+        self._start_ts = None
+        if not self.recording.has_frames:
+            # Grabación sin miniaturas: siempre el mismo frame negro
+            width, height = blank_size
+            self._blank = np.zeros((height, width, 3), dtype=np.uint8)
+
+    def read(self, image: Optional[np.ndarray] = None):
+        """Retorna ``(ok, frame)`` con el siguiente registro."""
+        if not self._opened:
+            return False, None
+        if self.position >= len(self.recording):
+            if not self.loop or len(self.recording) == 0:
+                self._opened = False
+                return False, None
+            self.position = 0
+            self._start_wall = None
+
+        rec = self.recording.records[self.position]
+        if self.realtime:
+            self._wait_until(float(rec['timestamp']))
+        self.current = self.position
+        self.position += 1
+
+        frame = self.recording.frames[self.current] if self.recording.has_frames else self._blank
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def _wait_until(self, timestamp: float):
+        """Duerme hasta el instante de reproducción equivalente a ``timestamp``."""
+        now = time.perf_counter()
+        if self._start_wall is None:
+            self._start_wall, self._start_ts = now, timestamp
+            return
+        delay = (timestamp - self._start_ts) - (now - self._start_wall)
+        if delay > 0:
+            time.sleep(delay)
+
+    def hands(self) -> list:
+        """Landmarks grabados del último registro leído."""
+        return self.recording.hands(self.current) if self.current >= 0 else []
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.recording))
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        if prop_id == cv2.CAP_PROP_FPS:
+            duration = self.recording.duration
+            return (len(self.recording) - 1) / duration if duration > 0 else 0.0
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            self.position = int(value)
+            self._start_wall = None
+            return True
+        return False
+
+    def release(self):
+        self._opened = False
+
+
+class ReplayHandTracker:
+    """
+    Sustituto de ``HandTracker`` que entrega los landmarks grabados en lugar de
+    ejecutar MediaPipe. Cada llamada a ``process_frame`` avanza un registro.
+    """
+
+    def __init__(self, recording: Union[Recording, str, Path], loop: bool = True):
+        self.recording = recording if isinstance(recording, Recording) else Recording(recording)
+        self.loop = loop
+        self.position = 0
+
+    def process_frame(self, frame):
+        if self.position >= len(self.recording):
+            if not self.loop:
+                return frame, SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+            self.position = 0
+        hands = self.recording.hands(self.position)
+        self.position += 1
+        results = SimpleNamespace(
+            multi_hand_landmarks=hands or None,
+            multi_handedness=[h.handedness for h in hands] or None
+        )
+        return frame, results
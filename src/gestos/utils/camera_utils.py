@@ -1,4 +1,9 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
 import cv2
+import numpy as np
 
 
 def inicializar_camara(width=640, height=480):
@@ -10,3 +15,205 @@ def inicializar_camara(width=640, height=480):
     if not cap.isOpened():
         raise IOError("No se pudo acceder a la cámara.")
     return cap
+
+
+class FrameRingBuffer:
+    """
+    Buffer circular preasignado que siempre entrega el frame más reciente.
+
+    El productor escribe en el slot siguiente al último publicado (sin lock) y
+    sólo toma el lock para publicarlo. El consumidor copia el último frame
+    publicado bajo el lock, por lo que nunca lee un slot a medio escribir.
+    Los frames que se sobrescriben sin haber sido leídos cuentan como descartados.
+    """
+
+    def __init__(self, capacity: int = 3):
+        if capacity < 2:
+            raise ValueError("El buffer necesita al menos 2 slots")
+        self.capacity = capacity
+        self._frames: Optional[np.ndarray] = None
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._frame_ids = np.full(capacity, -1, dtype=np.int64)
+        self._latest = -1
+        self._next_id = 0
+        self._last_read_id = -1
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+
+    def allocate(self, shape: Tuple[int, ...], dtype=np.uint8) -> None:
+        """Reserva la memoria de todos los slots para frames de la forma dada."""
+        self._frames = np.empty((self.capacity,) + tuple(shape), dtype=dtype)
+
+    @property
+    def frame_shape(self) -> Optional[Tuple[int, ...]]:
+        return None if self._frames is None else self._frames.shape[1:]
+
+    def write_slot(self) -> np.ndarray:
+        """Retorna la vista del slot donde el productor debe escribir el próximo frame."""
+        return self._frames[(self._latest + 1) % self.capacity]
+
+    def publish(self, timestamp: Optional[float] = None) -> int:
+        """Publica el slot de escritura como frame más reciente y retorna su id."""
+        slot = (self._latest + 1) % self.capacity
+        with self._lock:
+            if self._latest >= 0 and self._frame_ids[self._latest] > self._last_read_id:
+                self._dropped += 1
+            frame_id = self._next_id
+            self._next_id += 1
+            self._frame_ids[slot] = frame_id
+            self._timestamps[slot] = time.perf_counter() if timestamp is None else timestamp
+            self._latest = slot
+            self._new_frame.notify_all()
+        return frame_id
+
+    def read_latest(
+        self,
+        out: Optional[np.ndarray] = None,
+        timeout: float = 0.0
+    ) -> Tuple[int, Optional[np.ndarray], float]:
+        """
+        Copia el frame más reciente.
+
+        Args:
+            out: Array destino preasignado (se crea uno nuevo si es None o no coincide)
+            timeout: Segundos a esperar por un frame nuevo (0 = no bloquear)
+
+        Returns:
+            Tupla (frame_id, frame, timestamp); frame_id es -1 si aún no hay frames
+        """
+        with self._lock:
+            if timeout > 0 and (self._latest < 0 or self._frame_ids[self._latest] <= self._last_read_id):
+                self._new_frame.wait(timeout)
+            if self._latest < 0:
+                return -1, None, 0.0
+            slot = self._latest
+            src = self._frames[slot]
+            if out is None or out.shape != src.shape or out.dtype != src.dtype:
+                out = src.copy()
+            else:
+                np.copyto(out, src)
+            frame_id = int(self._frame_ids[slot])
+            self._last_read_id = max(self._last_read_id, frame_id)
+            return frame_id, out, float(self._timestamps[slot])
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def published(self) -> int:
+        return self._next_id
+
+
+class ThreadedCamera:
+    """
+    Captura de cámara en un hilo dedicado.
+
+    Lee continuamente de un objeto tipo ``cv2.VideoCapture`` hacia un
+    ``FrameRingBuffer``, de modo que el hilo de la UI sólo copia el último
+    frame disponible y nunca se bloquea esperando a la cámara.
+    """
+
+    FPS_WINDOW = 30  # Frames usados para calcular los FPS de captura
+
+    def __init__(self, capture=None, width=640, height=480, buffer_size=3):
+        """
+        Args:
+            capture: Fuente con interfaz ``read()``/``isOpened()``/``release()``.
+                Si es None se abre la cámara con ``inicializar_camara``.
+            width: Ancho deseado del frame
+            height: Alto deseado del frame
+            buffer_size: Número de slots del buffer circular
+        """
+        self.capture = capture if capture is not None else inicializar_camara(width, height)
+        self.buffer = FrameRingBuffer(buffer_size)
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self.read_failures = 0
+        self._frame_times = np.zeros(self.FPS_WINDOW, dtype=np.float64)
+        self._frame_count = 0
+
+    def start(self) -> "ThreadedCamera":
+        """Inicia el hilo de captura."""
+        if self.running:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop, name="ThreadedCamera", daemon=True)
+        self.thread.start()
+        return self
+
+    def _capture_loop(self):
+        """Bucle del hilo de captura."""
+        while self.running:
+            if self.buffer.frame_shape is None:
+                ret, frame = self.capture.read()
+                if not ret:
+                    self._register_failure()
+                    continue
+                self.buffer.allocate(frame.shape, frame.dtype)
+                np.copyto(self.buffer.write_slot(), frame)
+            else:
+                slot = self.buffer.write_slot()
+                # cv2 escribe directamente en el slot si la forma coincide
+                ret, frame = self.capture.read(slot)
+                if not ret:
+                    self._register_failure()
+                    continue
+                if frame is not None and frame is not slot:
+                    if frame.shape != slot.shape:
+                        self.buffer.allocate(frame.shape, frame.dtype)
+                        slot = self.buffer.write_slot()
+                    np.copyto(slot, frame)
+
+            now = time.perf_counter()
+            self._frame_times[self._frame_count % self.FPS_WINDOW] = now
+            self._frame_count += 1
+            self.buffer.publish(now)
+
+    def _register_failure(self):
+        self.read_failures += 1
+        if not self.capture.isOpened():
+            self.running = False
+        else:
+            time.sleep(0.005)
+
+    def read_latest(self, out: Optional[np.ndarray] = None, timeout: float = 0.0):
+        """Retorna ``(frame_id, frame)`` con el frame más reciente (ver ``FrameRingBuffer``)."""
+        frame_id, frame, _ = self.buffer.read_latest(out, timeout)
+        return frame_id, frame
+
+    def read(self):
+        """Interfaz compatible con ``cv2.VideoCapture.read`` (no bloqueante)."""
+        frame_id, frame = self.read_latest()
+        return frame_id >= 0, frame
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    @property
+    def fps(self) -> float:
+        """FPS de captura sobre la ventana de los últimos frames."""
+        n = min(self._frame_count, self.FPS_WINDOW)
+        if n < 2:
+            return 0.0
+        newest = self._frame_times[(self._frame_count - 1) % self.FPS_WINDOW]
+        oldest = self._frame_times[(self._frame_count - n) % self.FPS_WINDOW]
+        return (n - 1) / (newest - oldest) if newest > oldest else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estadísticas de captura."""
+        return {
+            'fps': self.fps,
+            'captured': self.buffer.published,
+            'dropped': self.buffer.dropped,
+            'read_failures': self.read_failures,
+        }
+
+    def release(self):
+        """Detiene el hilo y libera la fuente de captura."""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        self.capture.release()
@@ -1,40 +1,40 @@
 import pyautogui
 import numpy as np
 
+from src.gestos.components.filters import make_filter
+from src.gestos.components.landmarks import INDEX_TIP, as_landmark_array
+
 # Desactivar el fail-safe de pyautogui para evitar interrupciones
 pyautogui.FAILSAFE = False
 
 class CursorControl:
-    def __init__(self, screen_width, screen_height, frame_width, frame_height):
+    def __init__(self, screen_width, screen_height, frame_width, frame_height, landmark_filter=None,
+                 predictor=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.frame_width = frame_width
         self.frame_height = frame_height
-        self.smoothening = 7 # Factor de suavizado
-        self.prev_x, self.prev_y = 0, 0
+        # Filtro adaptativo de la mano completa (One-Euro del preset "cursor")
+        self.filter = landmark_filter if landmark_filter is not None else make_filter("cursor")
+        # Predicción opcional (MotionPredictor) para compensar la latencia del pipeline
+        self.predictor = predictor
+        # Los landmarks están normalizados: el mapeo a pantalla es una escala
+        self._screen_scale = np.array([screen_width, screen_height], dtype=np.float32)
         self.curr_x, self.curr_y = 0, 0
 
-    def move_cursor(self, hand_landmarks):
-        if not hand_landmarks:
+    def move_cursor(self, hand_landmarks, timestamp=None):
+        if hand_landmarks is None:
             return
 
-        # Coordenadas del dedo índice
-        index_tip = hand_landmarks.landmark[8]
-        x = int(index_tip.x * self.frame_width)
-        y = int(index_tip.y * self.frame_height)
-
-        # Mapear a la pantalla
-        screen_x = np.interp(x, (0, self.frame_width), (0, self.screen_width))
-        screen_y = np.interp(y, (0, self.frame_height), (0, self.screen_height))
-
-        # Suavizar el movimiento
-        self.curr_x = self.prev_x + (screen_x - self.prev_x) / self.smoothening
-        self.curr_y = self.prev_y + (screen_y - self.prev_y) / self.smoothening
+        # Filtrar la mano completa y tomar el dedo índice
+        landmarks = self.filter(as_landmark_array(hand_landmarks), timestamp)
+        if self.predictor is not None:
+            landmarks = self.predictor(landmarks, timestamp)
+        screen = np.clip(landmarks[INDEX_TIP, :2], 0.0, 1.0) * self._screen_scale
+        self.curr_x, self.curr_y = float(screen[0]), float(screen[1])
 
         # Mover el cursor
         pyautogui.moveTo(self.curr_x, self.curr_y)
 
-        self.prev_x, self.prev_y = self.curr_x, self.curr_y
-
 def perform_click():
     pyautogui.click()
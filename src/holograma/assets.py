@@ -0,0 +1,396 @@
+"""
+Carga de modelos en segundo plano con caché en memoria y en disco.
+
+    - Los modelos se cargan en hilos de carga (``Loader.loadSync`` de C++), así
+      que el hilo de render no se bloquea; los callbacks se ejecutan en el hilo
+      principal desde ``AssetManager.poll`` (una vez por frame).
+    - Caché LRU en memoria indexada por ruta (y nivel de detalle) con un
+      presupuesto de bytes de geometría: cambiar a un modelo ya cargado es
+      instanciar un nodo, sin tocar el disco.
+    - Caché persistente de ``.bam`` ya convertidos (aplanados y simplificados):
+      la segunda vez un ``.egg``/``.gltf`` se lee directamente en el formato
+      nativo de Panda3D.
+    - Nivel de detalle según la resolución de salida: cada vista ocupa un
+      tercio del panel, así que la geometría se simplifica por agrupamiento de
+      vértices en una grilla de aproximadamente un vértice cada pocos píxeles.
+"""
+import hashlib
+import queue
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from panda3d.core import (
+    Filename, Geom, GeomTriangles, GeomVertexData, InternalName, Loader,
+    LoaderOptions, NodePath, VirtualFileSystem, getModelPath
+)
+
+from .scene import prepare_model
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "models"
+
+# Extensiones probadas al resolver una ruta sin extensión (como ``loader.loadModel``)
+MODEL_EXTENSIONS = ("", "bam", "egg", "egg.pz", "gltf", "glb", "obj")
+
+# Cambia si cambia la conversión, para no reutilizar .bam viejos
+CACHE_VERSION = 2
+
+_INDEX_TYPES = {Geom.NT_uint8: np.uint8, Geom.NT_uint16: np.uint16, Geom.NT_uint32: np.uint32}
+
+
+def resolve_model_path(path: str) -> Filename:
+    """Ruta absoluta del modelo según el ``model-path`` de Panda3D."""
+    vfs = VirtualFileSystem.getGlobalPtr()
+    for ext in MODEL_EXTENSIONS:
+        filename = Filename.fromOsSpecific(str(path))
+        if vfs.resolveFilename(filename, getModelPath().getValue(), ext):
+            if ext and not filename.getExtension():
+                filename = Filename(f"{filename}.{ext}")
+            return filename
+    raise FileNotFoundError(f"Modelo no encontrado: {path}")
+
+
+def lod_grid_for_resolution(output_size: Tuple[int, int], pixels_per_cell: int = 2) -> int:
+    """Celdas por eje de la grilla de simplificación para una salida en cruz de ``output_size``."""
+    view_pixels = min(output_size) // 3
+    return max(8, view_pixels // pixels_per_cell)
+
+
+def model_bytes(model: NodePath) -> int:
+    """Bytes de vértices e índices únicos del modelo."""
+    seen = set()
+    total = 0
+    for path in model.findAllMatches("**/+GeomNode"):
+        node = path.node()
+        for i in range(node.getNumGeoms()):
+            geom = node.getGeom(i)
+            data = geom.getVertexData()
+            if data not in seen:
+                seen.add(data)
+                total += sum(data.getArray(j).getDataSizeBytes() for j in range(data.getNumArrays()))
+            for j in range(geom.getNumPrimitives()):
+                prim = geom.getPrimitive(j)
+                if prim.isIndexed():
+                    total += prim.getVertices().getDataSizeBytes()
+    return total
+
+
+def _array_bytes(array) -> np.ndarray:
+    """Copia de los bytes de un ``GeomVertexArrayData`` como arreglo ``uint8``."""
+    return np.frombuffer(array.getHandle().getData(), np.uint8)
+
+
+def _triangle_indices(geom: Geom) -> Optional[np.ndarray]:
+    """Índices de todos los triángulos del Geom (None si tiene otras primitivas)."""
+    parts = []
+    for i in range(geom.getNumPrimitives()):
+        prim = geom.getPrimitive(i).decompose()
+        if not isinstance(prim, GeomTriangles):
+            return None
+        if prim.isIndexed():
+            parts.append(_array_bytes(prim.getVertices()).view(_INDEX_TYPES[prim.getIndexType()]))
+        else:
+            parts.append(np.arange(prim.getFirstVertex(), prim.getFirstVertex() + prim.getNumVertices()))
+    return np.concatenate(parts).astype(np.int64) if parts else None
+
+
+def _positions(data: GeomVertexData) -> Optional[np.ndarray]:
+    fmt = data.getFormat()
+    column = fmt.getColumn(InternalName.getVertex())
+    if column is None or column.getNumericType() != Geom.NT_float32 or column.getNumComponents() < 3:
+        return None
+    array = data.getArray(fmt.getArrayWith(InternalName.getVertex()))
+    stride = array.getArrayFormat().getStride()
+    raw = _array_bytes(array)
+    return np.ndarray((data.getNumRows(), 3), np.float32, raw, column.getStart(), (stride, 4))
+
+
+def _simplify_geom(geom: Geom, origin: np.ndarray, cell: float) -> Optional[Geom]:
+    """Agrupa los vértices por celda y conserva un vértice representante por celda."""
+    data = geom.getVertexData()
+    # Geometría animada (pesos por vértice): se deja intacta
+    if data.getTransformBlendTable() is not None or data.getFormat().getAnimation().getAnimationType() != Geom.AT_none:
+        return None
+    positions = _positions(data)
+    indices = _triangle_indices(geom)
+    if positions is None or indices is None:
+        return None
+
+    keys = np.floor((positions - origin) / cell).astype(np.int64)
+    _, representative, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    triangles = inverse.reshape(-1)[indices].reshape(-1, 3)
+    keep = ((triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2])
+            & (triangles[:, 0] != triangles[:, 2]))
+    if keep.all():
+        return None
+
+    # Vértices nuevos: las filas de los representantes, con el mismo formato
+    new_data = GeomVertexData(data)
+    new_data.uncleanSetNumRows(len(representative))
+    for j in range(data.getNumArrays()):
+        stride = data.getArray(j).getArrayFormat().getStride()
+        rows = _array_bytes(data.getArray(j)).reshape(-1, stride)
+        new_data.modifyArray(j).modifyHandle().setData(rows[representative].tobytes())
+
+    prim = GeomTriangles(Geom.UHStatic)
+    prim.setIndexType(Geom.NTUint32)
+    flat = triangles[keep].astype(np.uint32).reshape(-1)
+    handle = prim.modifyVertices()
+    handle.uncleanSetNumRows(len(flat))
+    memoryview(handle).cast("B").cast("I")[:] = flat
+    simplified = Geom(new_data)
+    simplified.addPrimitive(prim)
+    return simplified
+
+
+def simplify_model(model: NodePath, grid: int) -> NodePath:
+    """
+    Simplifica la geometría del modelo (en el lugar) con ``grid`` celdas por eje.
+
+    Conviene aplanarlo antes (``prepare_model``) para que las coordenadas de
+    todos los Geoms estén en el espacio del modelo.
+    """
+    bounds = model.getTightBounds()
+    if not bounds:
+        return model
+    low, high = (np.array(bound, dtype=np.float64) for bound in bounds)
+    cell = float((high - low).max()) / grid
+    if cell <= 0:
+        return model
+    for path in model.findAllMatches("**/+GeomNode"):
+        node = path.node()
+        for i in range(node.getNumGeoms()):
+            simplified = _simplify_geom(node.getGeom(i), low, cell)
+            if simplified is not None:
+                node.setGeom(i, simplified)
+    return model
+
+
+class ModelCache:
+    """
+    Caché LRU de modelos con presupuesto de memoria.
+
+    Al superar ``budget_bytes`` se descartan los modelos usados hace más
+    tiempo (el último agregado se conserva aunque exceda el presupuesto).
+    """
+
+    def __init__(self, budget_bytes: int = 256 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[object, Tuple[NodePath, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[NodePath]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, model: NodePath, size: Optional[int] = None) -> None:
+        size = model_bytes(model) if size is None else size
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old[1]
+            self._entries[key] = (model, size)
+            self.used_bytes += size
+            while self.used_bytes > self.budget_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.used_bytes -= evicted
+                self.evictions += 1
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AssetManager:
+    """
+    Carga de modelos para el holograma: en segundo plano, en caché y con LOD.
+
+    Los modelos entregados son nodos fuente compartidos: se muestran con
+    ``model.instanceTo(padre)`` y no deben reparentarse ni modificarse.
+
+    Args:
+        output_size: Resolución del panel de salida; define el nivel de detalle
+        budget_mb: Presupuesto de la caché en memoria
+        cache_dir: Directorio de ``.bam`` convertidos (None desactiva la caché en disco)
+        lod: Simplificar la geometría según la resolución de salida
+        workers: Hilos de carga
+    """
+
+    def __init__(
+        self,
+        output_size: Tuple[int, int] = (900, 900),
+        budget_mb: float = 256,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        lod: bool = True,
+        workers: int = 1,
+    ):
+        self.cache = ModelCache(int(budget_mb * 1024 * 1024))
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.lod = lod
+        self.set_output_size(output_size)
+        self.disk_hits = 0
+        self.conversions = 0
+
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._done: deque = deque()
+        self._pending: Dict[object, list] = {}
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"assets-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def set_output_size(self, output_size: Tuple[int, int]) -> None:
+        """Cambia la resolución de salida; los modelos se vuelven a simplificar al pedirlos."""
+        self.output_size = tuple(output_size)
+        self.grid = lod_grid_for_resolution(self.output_size) if self.lod else None
+
+    def _key(self, filename: Filename):
+        return (filename.getFullpath(), self.grid)
+
+    # Carga (hilos de carga o síncrona)
+
+    def _bam_path(self, filename: Filename, grid: Optional[int]) -> Path:
+        stamp = VirtualFileSystem.getGlobalPtr().getFile(filename).getTimestamp()
+        digest = hashlib.sha1(f"{filename.getFullpath()}|{stamp}|{grid}|{CACHE_VERSION}".encode()).hexdigest()
+        return self.cache_dir / f"{filename.getBasenameWoExtension()}-{digest[:12]}.bam"
+
+    def _read(self, filename: Filename, grid: Optional[int]) -> NodePath:
+        loader = Loader.getGlobalPtr()
+        options = LoaderOptions(LoaderOptions.LF_no_cache | LoaderOptions.LF_report_errors)
+        bam = self._bam_path(filename, grid) if self.cache_dir is not None else None
+        if bam is not None and bam.exists():
+            node = loader.loadSync(Filename.fromOsSpecific(str(bam)), options)
+            if node is not None:
+                self.disk_hits += 1
+                return NodePath(node)
+
+        node = loader.loadSync(filename, options)
+        if node is None:
+            raise IOError(f"No se pudo cargar el modelo: {filename}")
+        model = prepare_model(NodePath(node))
+        if grid is not None:
+            simplify_model(model, grid)
+        self.conversions += 1
+        if bam is not None:
+            bam.parent.mkdir(parents=True, exist_ok=True)
+            model.writeBamFile(Filename.fromOsSpecific(str(bam)))
+        return model
+
+    def _load_key(self, filename: Filename, key) -> NodePath:
+        model = self.cache.get(key)
+        if model is None:
+            model = self._read(filename, key[1])
+            self.cache.put(key, model)
+        return model
+
+    def load(self, path: str) -> NodePath:
+        """Carga síncrona (o desde la caché) del modelo."""
+        filename = resolve_model_path(path)
+        return self._load_key(filename, self._key(filename))
+
+    def get(self, path: str) -> Optional[NodePath]:
+        """Modelo ya cargado con el nivel de detalle actual, o None sin bloquear."""
+        try:
+            filename = resolve_model_path(path)
+        except FileNotFoundError:
+            return None
+        return self.cache.get(self._key(filename))
+
+    def load_async(self, path: str, callback: Optional[Callable[[NodePath], None]] = None,
+                   on_error: Optional[Callable[[Exception], None]] = None) -> None:
+        """
+        Carga el modelo en segundo plano.
+
+        ``callback(model)`` (u ``on_error(exc)``) se ejecuta en el próximo
+        ``poll`` del hilo principal; si el modelo ya está en caché, en ese mismo
+        ``poll`` sin pasar por los hilos de carga.
+        """
+        try:
+            filename = resolve_model_path(path)
+        except FileNotFoundError as exc:
+            self._done.append((on_error, exc))
+            return
+        key = self._key(filename)
+        model = self.cache.get(key)
+        if model is not None:
+            self._done.append((callback, model))
+            return
+        with self._lock:
+            waiting = self._pending.get(key)
+            if waiting is not None:
+                waiting.append((callback, on_error))
+                return
+            self._pending[key] = [(callback, on_error)]
+        self._jobs.put((filename, key))
+
+    def preload(self, paths) -> None:
+        """Carga en segundo plano un catálogo de modelos para cambiar entre ellos sin esperas."""
+        for path in paths:
+            self.load_async(path)
+
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            filename, key = job
+            try:
+                result, failed = self._read(filename, key[1]), False
+                self.cache.put(key, result)
+            except Exception as exc:
+                result, failed = exc, True
+            with self._lock:
+                waiting = self._pending.pop(key, [])
+            for callback, on_error in waiting:
+                self._done.append((on_error if failed else callback, result))
+
+    def poll(self) -> int:
+        """Ejecuta (en el hilo principal) los callbacks de las cargas terminadas."""
+        count = 0
+        while self._done:
+            callback, result = self._done.popleft()
+            if callback is not None:
+                callback(result)
+            count += 1
+        return count
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'cached_models': len(self.cache),
+            'cache_mb': self.cache.used_bytes / 1e6,
+            'hits': self.cache.hits,
+            'misses': self.cache.misses,
+            'evictions': self.cache.evictions,
+            'disk_hits': self.disk_hits,
+            'conversions': self.conversions,
+            'pending': self.pending,
+        }
+
+    def shutdown(self) -> None:
+        for _ in self._workers:
+            self._jobs.put(None)
+        for worker in self._workers:
+            worker.join(timeout=2.0)
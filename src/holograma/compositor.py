@@ -0,0 +1,152 @@
+"""
+Compositor offscreen para la salida en cruz del holograma.
+
+En lugar de dibujar cuatro copias del modelo en una misma escena, cada vista
+tiene su propia cámara que renderiza el modelo (una instancia por vista) a un
+buffer offscreen; la salida final son cuatro tarjetas 2D con esas texturas en
+la cruz Pepper's Ghost. Así el costo depende de la resolución del panel:
+
+    - Cada vista se renderiza a ``celda * escala`` píxeles, donde la celda es un
+      tercio del panel y la escala es configurable por vista.
+    - Una vista cuya transformación no cambió desde el último frame no se vuelve
+      a renderizar: su buffer se desactiva y la tarjeta sigue mostrando la
+      textura anterior.
+
+Funciona con el rasterizador por software (``p3tinydisplay``) y sin ventana.
+"""
+from typing import Dict, Tuple
+
+from panda3d.core import CardMaker, NodePath, TransparencyAttrib
+
+from .rotations import HologramViewSet
+from .scene import DEFAULT_VIEWS, prepare_model
+
+# Celda de la cruz (columna, fila) en una grilla de 3x3 según la posición de la vista
+DEFAULT_CELLS = {
+    "frontal": (1, 2),
+    "posterior": (1, 0),
+    "superior": (0, 1),
+    "inferior": (2, 1),
+}
+
+
+def _buffer_side(pixels: float, pow2: bool) -> int:
+    """Lado del buffer de una vista; potencia de dos (hacia abajo) si el GSG lo exige."""
+    side = max(1, int(pixels))
+    return 1 << (side.bit_length() - 1) if pow2 else side
+
+
+class HologramCompositor:
+    """
+    Renderiza cada vista a textura y las compone en la cruz de ``render2d``.
+
+    Args:
+        base: ``ShowBase`` (con ventana o buffer offscreen)
+        model: Modelo a mostrar; se aplana y se instancia una vez por vista
+        views: ``{nombre: (posición, hpr base)}`` como en ``DEFAULT_VIEWS``
+        panel_size: Resolución del panel de salida en píxeles
+        view_scale: Escala de resolución por vista (``float`` o ``{vista: float}``)
+        skip_unchanged: No renderizar vistas cuya transformación no cambió
+        camera_distance: Distancia de las cámaras de vista al modelo
+        cells: ``{vista: (columna, fila)}`` en la grilla de 3x3 de la salida
+    """
+
+    def __init__(
+        self,
+        base,
+        model: NodePath,
+        views: Dict[str, Tuple] = None,
+        panel_size: Tuple[int, int] = (900, 900),
+        view_scale=1.0,
+        skip_unchanged: bool = True,
+        camera_distance: float = 12.0,
+        cells: Dict[str, Tuple[int, int]] = None,
+    ):
+        self.base = base
+        self.views = DEFAULT_VIEWS if views is None else views
+        self.panel_size = panel_size
+        self.skip_unchanged = skip_unchanged
+        self.cells = DEFAULT_CELLS if cells is None else cells
+        self.rendered = 0
+        self.skipped = 0
+
+        prepare_model(model)
+        self.model = model
+        self.root2d = base.render2d.attachNewNode("compositor")
+
+        cell_w, cell_h = panel_size[0] // 3, panel_size[1] // 3
+        gsg = base.win.getGsg()
+        pow2 = gsg is not None and not gsg.getSupportsTexNonPow2()
+        self.buffers = {}
+        self.pivots = {}
+        self.cameras = {}
+        self.cards = {}
+        self.view_set = HologramViewSet()
+
+        for name, (_, hpr) in self.views.items():
+            scale = view_scale.get(name, 1.0) if isinstance(view_scale, dict) else view_scale
+            size = (_buffer_side(cell_w * scale, pow2), _buffer_side(cell_h * scale, pow2))
+
+            buffer = base.win.makeTextureBuffer(f"vista_{name}", *size)
+            buffer.setClearColor((0, 0, 0, 1))
+
+            # Escena propia de la vista: una instancia del modelo bajo un pivote
+            scene = NodePath(f"escena_{name}")
+            pivot = scene.attachNewNode("pivote")
+            model.instanceTo(pivot)
+            scene.setTransparency(TransparencyAttrib.M_alpha)
+
+            camera = base.makeCamera(buffer, aspectRatio=size[0] / size[1])
+            camera.node().setScene(scene)
+            camera.reparentTo(scene)
+            camera.setPos(0, -camera_distance, 0)
+            camera.lookAt(0, 0, 0)
+
+            self.buffers[name] = buffer
+            self.pivots[name] = pivot
+            self.cameras[name] = camera
+            self.cards[name] = self._make_card(name, buffer)
+            self.view_set.add_view(name, pivot, hpr)
+
+    def _make_card(self, name: str, buffer) -> NodePath:
+        """Tarjeta de ``render2d`` (coordenadas -1..1) en la celda de la vista."""
+        col, row = self.cells[name]
+        left = -1 + col * 2 / 3
+        top = 1 - row * 2 / 3
+        cm = CardMaker(f"tarjeta_{name}")
+        cm.setFrame(left, left + 2 / 3, top - 2 / 3, top)
+        card = self.root2d.attachNewNode(cm.generate())
+        card.setTexture(buffer.getTexture())
+        return card
+
+    def update(self, master_h: float) -> int:
+        """
+        Orienta cada vista según el heading del maestro y activa sólo las que cambiaron.
+
+        Returns:
+            Número de vistas que se renderizarán este frame
+        """
+        changed = self.view_set.update(master_h)
+        active = 0
+        for name, buffer in self.buffers.items():
+            render = name in changed or not self.skip_unchanged
+            buffer.setActive(render)
+            if render:
+                active += 1
+        self.rendered += active
+        self.skipped += len(self.pivots) - active
+        return active
+
+    def invalidate(self) -> None:
+        """Fuerza a renderizar todas las vistas en el próximo ``update``."""
+        self.view_set.invalidate()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'rendered': self.rendered, 'skipped': self.skipped}
+
+    def destroy(self) -> None:
+        for name, buffer in self.buffers.items():
+            self.cameras[name].removeNode()
+            self.base.graphicsEngine.removeWindow(buffer)
+        self.root2d.removeNode()
+        self.buffers.clear()
@@ -0,0 +1,88 @@
+"""
+Cola de eventos entrantes del holograma, drenada una vez por frame.
+
+Los hilos de red (``EventClient``, ``GestureNetworkReceiver``) sólo encolan;
+la tarea ``update`` de Panda3D drena la cola en el hilo principal, que es el
+único que toca los nodos de la escena.
+
+``collections.deque`` hace ``append`` y ``popleft`` de forma atómica, así que
+productor y consumidor no comparten ningún lock.
+"""
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class FrameEventQueue:
+    """
+    Cola productor/consumidor con presupuesto de tiempo por frame.
+
+    Args:
+        budget: Segundos por frame para ejecutar eventos discretos; los que no
+            entran quedan, en orden, para el frame siguiente
+        latest_only: Eventos de estado absoluto (p. ej. ``"rotation"``): de
+            todos los que llegaron en el frame sólo se aplica el último
+    """
+
+    def __init__(self, budget: float = 0.004, latest_only: Iterable[str] = ("rotation",)):
+        self.budget = budget
+        self.latest_only = frozenset(latest_only)
+        self._queue = deque()
+        self.stats = {'received': 0, 'applied': 0, 'collapsed': 0, 'deferred': 0}
+
+    def push(self, kind: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Encola un evento (se llama desde cualquier hilo)."""
+        self._queue.append((kind, data or {}))
+        self.stats['received'] += 1
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def drain(self, handlers: Dict[str, Callable[[Dict[str, Any]], None]]) -> int:
+        """
+        Ejecuta los eventos encolados hasta este momento (desde el hilo principal).
+
+        Los eventos ``latest_only`` se colapsan: sólo se aplica el último de cada
+        tipo, en la posición en que llegó, así que un estado absoluto nunca se
+        adelanta a un evento relativo anterior ni lo pisa uno posterior. Se
+        aplican aunque se haya agotado el presupuesto, salvo que ya se haya
+        diferido un evento anterior: entonces se difieren con él, en orden.
+
+        Returns:
+            Número de handlers ejecutados
+        """
+        deadline = time.perf_counter() + self.budget
+        deferred = []
+        applied = 0
+
+        # Sólo lo que había al empezar: lo que llegue durante el drenado es del próximo frame
+        pending = [self._queue.popleft() for _ in range(len(self._queue))]
+        last = {kind: i for i, (kind, _) in enumerate(pending) if kind in self.latest_only}
+
+        for i, (kind, data) in enumerate(pending):
+            latest = kind in self.latest_only
+            if latest and last[kind] != i:
+                self.stats['collapsed'] += 1
+            elif deferred or (not latest and applied and time.perf_counter() > deadline):
+                # Al menos un evento discreto por frame para no estancar la cola
+                deferred.append((kind, data))
+            else:
+                applied += self._apply(handlers, kind, data)
+
+        if deferred:
+            self._queue.extendleft(reversed(deferred))
+            self.stats['deferred'] += len(deferred)
+
+        self.stats['applied'] += applied
+        return applied
+
+    @staticmethod
+    def _apply(handlers, kind, data) -> int:
+        handler = handlers.get(kind)
+        if handler is None:
+            return 0
+        try:
+            handler(data)
+        except Exception as e:
+            print(f"❌ Error aplicando evento {kind}: {e}")
+        return 1
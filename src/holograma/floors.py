@@ -1,6 +1,26 @@
 # src/holograma/floors.py
 from panda3d.core import CardMaker, TransparencyAttrib
 
+# nombre: (posición, color RGBA)
+SUELOS = {
+    "centro": ((0, 0, -1), (0.3, 0.3, 0.3, 0.5)),
+    "frontal": ((3, 0, -1), (0.2, 0.4, 0.2, 0.3)),
+    "posterior": ((-3, 0, -1), (0.4, 0.2, 0.2, 0.3)),
+    "superior": ((0, 0, 2), (0.2, 0.2, 0.4, 0.3)),
+    "inferior": ((0, 0, -4), (0.4, 0.4, 0.2, 0.3)),
+}
+
+
+def _crear_suelo(parent, cm, name):
+    pos, color = SUELOS[name]
+    suelo = parent.attachNewNode(cm.generate())
+    suelo.setName(f"suelo_{name}")
+    suelo.setPos(*pos)
+    suelo.setHpr(0, -90, 0)
+    suelo.setColor(*color)
+    return suelo
+
+
 def crear_suelos(render):
     """
     Crea todos los pisos (centro, frontal, posterior, superior, inferior).
@@ -10,40 +30,27 @@ def crear_suelos(render):
     cm.setFrame(-10, 10, -10, 10)
 
     suelos = {}
+    for name in SUELOS:
+        suelos[name] = _crear_suelo(render, cm, name)
+        suelos[name].setTransparency(TransparencyAttrib.M_alpha)
+
+    return suelos
+
 
-    # Centro
-    suelos["centro"] = render.attachNewNode(cm.generate())
-    suelos["centro"].setPos(0, 0, -1)
-    suelos["centro"].setHpr(0, -90, 0)
-    suelos["centro"].setColor(0.3, 0.3, 0.3, 0.5)
-    suelos["centro"].setTransparency(TransparencyAttrib.M_alpha)
-
-    # Frontal
-    suelos["frontal"] = render.attachNewNode(cm.generate())
-    suelos["frontal"].setPos(3, 0, -1)
-    suelos["frontal"].setHpr(0, -90, 0)
-    suelos["frontal"].setColor(0.2, 0.4, 0.2, 0.3)
-    suelos["frontal"].setTransparency(TransparencyAttrib.M_alpha)
-
-    # Posterior
-    suelos["posterior"] = render.attachNewNode(cm.generate())
-    suelos["posterior"].setPos(-3, 0, -1)
-    suelos["posterior"].setHpr(0, -90, 0)
-    suelos["posterior"].setColor(0.4, 0.2, 0.2, 0.3)
-    suelos["posterior"].setTransparency(TransparencyAttrib.M_alpha)
-
-    # Superior
-    suelos["superior"] = render.attachNewNode(cm.generate())
-    suelos["superior"].setPos(0, 0, 2)
-    suelos["superior"].setHpr(0, -90, 0)
-    suelos["superior"].setColor(0.2, 0.2, 0.4, 0.3)
-    suelos["superior"].setTransparency(TransparencyAttrib.M_alpha)
-
-    # Inferior
-    suelos["inferior"] = render.attachNewNode(cm.generate())
-    suelos["inferior"].setPos(0, 0, -4)
-    suelos["inferior"].setHpr(0, -90, 0)
-    suelos["inferior"].setColor(0.4, 0.4, 0.2, 0.3)
-    suelos["inferior"].setTransparency(TransparencyAttrib.M_alpha)
+def crear_suelos_planos(render):
+    """
+    Crea los mismos pisos que ``crear_suelos`` como geometría estática aplanada.
+
+    Posición y color se hornean en los vértices y, como todos comparten el
+    mismo estado (transparencia alfa), quedan en un único Geom: una sola
+    llamada de dibujo en lugar de cinco. Retorna el nodo que los agrupa.
+    """
+    cm = CardMaker("suelo")
+    cm.setFrame(-10, 10, -10, 10)
 
+    suelos = render.attachNewNode("suelos")
+    for name in SUELOS:
+        _crear_suelo(suelos, cm, name)
+    suelos.setTransparency(TransparencyAttrib.M_alpha)
+    suelos.flattenStrong()
     return suelos
@@ -3,42 +3,87 @@
 from direct.showbase.ShowBase import ShowBase
 from panda3d.core import NodePath, WindowProperties, FrameBufferProperties, VBase3
 from src.network.client import EventClient
-import json
+from src.holograma.assets import AssetManager
+from src.holograma.event_queue import FrameEventQueue
 
 class HologramApp(ShowBase):
-    def __init__(self):
-        ShowBase.__init__(self)
+    def __init__(self, model_path="panda", catalog=(), use_network=True, headless=False):
+        ShowBase.__init__(self, windowType="offscreen" if headless else None)
 
-        # Cargar un modelo simple (un panda)
-        self.model = self.loader.loadModel("panda")
-        self.model.reparentTo(self.render)
+        # El modelo se carga en segundo plano; mientras tanto el nodo queda vacío.
+        # Los gestos transforman este nodo, no el modelo cargado
+        output_size = (self.win.getXSize(), self.win.getYSize()) if self.win else (900, 900)
+        self.assets = AssetManager(output_size=output_size)
+        self.model = self.render.attachNewNode("modelo")
         self.model.setScale(0.25, 0.25, 0.25)
         self.model.setPos(0, 5, 0)
+        self.show_model(model_path)
+        self.assets.preload(catalog)
+
+        # Los eventos llegan por el hilo del cliente y se aplican en update()
+        self.events = FrameEventQueue(latest_only=())
+        self.gesture_handlers = {
+            'fist': self.on_fist,
+            'open_hand': self.on_open_hand,
+            'point': self.on_point,
+        }
+        self._scale = 0.25
+        self._scale_dirty = False
 
         # Configurar cliente de eventos
-        self.event_client = EventClient("Holograma")
-        self.event_client.on_message_received = self.handle_event
-        self.event_client.connect()
+        self.event_client = None
+        if use_network:
+            self.event_client = EventClient("Holograma", topics=["gesture_detected"])
+            self.event_client.on_message_received = self.handle_event
+            self.event_client.connect()
 
         # Añadir tarea para procesar eventos de la red
         self.taskMgr.add(self.update, "update")
 
+    def show_model(self, path):
+        """Cambia el modelo mostrado; si ya está en caché el cambio es inmediato."""
+        self._wanted_model = path
+        model = self.assets.get(path)
+        if model is not None:
+            self._set_model(path, model)
+        else:
+            self.assets.load_async(path, lambda model: self._set_model(path, model),
+                                   on_error=lambda exc: print(f"[Holograma] {exc}"))
+
+    def _set_model(self, path, model):
+        # Una carga lenta no reemplaza a un modelo pedido después
+        if path != self._wanted_model:
+            return
+        self.model.getChildren().detach()
+        model.instanceTo(self.model)
+
     def handle_event(self, event):
+        """Hilo del cliente de red: sólo encola, nunca toca la escena."""
         if event.get('type') == 'gesture_detected':
-            gesture = event.get('data', {}).get('gesture')
-            print(f"[Holograma] Gesto recibido: {gesture}")
-            
-            # Realizar acciones basadas en el gesto
-            if gesture == 'fist':
-                self.model.hprInterval(1.0, self.model.getHpr() + VBase3(90, 0, 0)).start()
-            elif gesture == 'open_hand':
-                self.model.setScale(0.25, 0.25, 0.25)
-            elif gesture == 'point':
-                self.model.setScale(self.model.getScale() * 1.2)
+            data = event.get('data', {})
+            self.events.push(data.get('gesture'), data)
+
+    # Acciones por gesto (hilo principal, dentro de update)
+
+    def on_fist(self, data):
+        self.model.hprInterval(1.0, self.model.getHpr() + VBase3(90, 0, 0)).start()
+
+    def on_open_hand(self, data):
+        self._scale = 0.25
+        self._scale_dirty = True
+
+    def on_point(self, data):
+        self._scale *= 1.2
+        self._scale_dirty = True
 
     def update(self, task):
-        # Este método se asegura de que la app siga corriendo
-        # y procesando tareas de Panda3D.
+        # Aplica los eventos del frame; la escala se fija una sola vez
+        # aunque hayan llegado varios gestos que la cambian
+        self.assets.poll()
+        self.events.drain(self.gesture_handlers)
+        if self._scale_dirty:
+            self.model.setScale(self._scale)
+            self._scale_dirty = False
         return task.cont
 
 def main():
@@ -1,12 +1,16 @@
 from direct.showbase.ShowBase import ShowBase
-from panda3d.core import Filename, TransparencyAttrib, WindowProperties
+from panda3d.core import Filename, WindowProperties
 from direct.task.Task import Task
 import os
 import socket
 import json
 import threading
+import time
 
-from .rotations import aplicar_rotaciones
+from .event_queue import FrameEventQueue
+from .rotations import HologramViewSet
+from .compositor import HologramCompositor
+from .scene import DEFAULT_VIEWS, build_hologram_scene
 
 
 class GestureNetworkReceiver:
@@ -23,6 +27,7 @@ class GestureNetworkReceiver:
         self.running = False
         self.thread = None
         self.callbacks = {}
+        self.ready = threading.Event()
     
     def register_callback(self, event_name, callback):
         """Registra un callback para un tipo de evento."""
@@ -44,6 +49,10 @@ class GestureNetworkReceiver:
             self.server_socket.bind((self.host, self.port))
             self.server_socket.listen(1)
             
+            # Con port=0 el sistema asigna un puerto libre
+            self.port = self.server_socket.getsockname()[1]
+            self.ready.set()
+            
             print(f"⏳ Esperando conexión de detector de gestos...")
             
             self.client_socket, addr = self.server_socket.accept()
@@ -64,4 +73,183 @@ class GestureNetworkReceiver:
                         self._process_message(line)
                         
                 except Exception as e:
-                    print(f"❌ Error recibiendo datos:
\ No newline at end of file
+                    if self.running:
+                        print(f"❌ Error recibiendo datos: {e}")
+                    break
+        
+        except Exception as e:
+            if self.running:
+                print(f"❌ Error en servidor de gestos: {e}")
+        finally:
+            self.ready.set()
+            self._close_sockets()
+    
+    def _process_message(self, line):
+        """Decodifica un mensaje JSON y ejecuta el callback de su evento."""
+        if not line.strip():
+            return
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            print(f"⚠️ Mensaje inválido: {line}")
+            return
+        
+        callback = self.callbacks.get(message.get('event'))
+        if callback:
+            try:
+                callback(message.get('data', {}))
+            except Exception as e:
+                print(f"❌ Error en callback de {message.get('event')}: {e}")
+    
+    def _close_sockets(self):
+        for sock in (self.client_socket, self.server_socket):
+            if sock:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+    
+    def stop(self):
+        """Detiene el servidor de red."""
+        self.running = False
+        self._close_sockets()
+        print("🔴 Servidor de gestos detenido")
+
+
+class HologramRenderer(ShowBase):
+    """
+    Render Pepper's Ghost: cuatro instancias del modelo en cruz alrededor del centro,
+    sincronizadas con un modelo maestro que controlan los gestos.
+    """
+    
+    MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "assets", "models", "tu_modelo.glb")
+    
+    # (posición, hpr base) de cada vista en la cruz
+    VIEWS = DEFAULT_VIEWS
+    
+    ROTATION_STEP = 45  # Grados por swipe
+    ZOOM_LIMITS = (0.2, 5.0)  # Escala mínima y máxima del pinch-zoom
+    
+    def __init__(self, use_network=True, compositor=False, panel_size=(900, 900), view_scale=1.0,
+                 headless=False, rotation_predictor=None):
+        """
+        Args:
+            use_network: Recibir gestos con ``GestureNetworkReceiver``
+            compositor: Renderizar cada vista a textura y componer la cruz
+                (``HologramCompositor``) en lugar de una escena con cuatro instancias
+            panel_size: Resolución del panel de salida (modo compositor)
+            view_scale: Escala de resolución por vista (modo compositor)
+            headless: Renderizar a un buffer offscreen en lugar de abrir una ventana
+            rotation_predictor: ``MotionPredictor`` (con ``period=360``) que
+                extrapola el ángulo recibido al instante de cada frame
+        """
+        ShowBase.__init__(self, windowType="offscreen" if headless else None)
+        
+        if not headless:
+            props = WindowProperties()
+            props.setTitle("Holograma Pepper's Ghost")
+            self.win.requestProperties(props)
+        self.setBackgroundColor(0, 0, 0, 1)
+        self.disableMouse()
+        self.camera.setPos(0, -15, 0)
+        self.camera.lookAt(0, 0, 0)
+        
+        # Modelo maestro (invisible): su heading controla todas las vistas,
+        # que instancian un único modelo aplanado
+        self.compositor = None
+        if compositor:
+            self.master = self.render.attachNewNode("maestro")
+            self.compositor = HologramCompositor(
+                self, self._load_model(), self.VIEWS, panel_size, view_scale)
+            # La salida son sólo las tarjetas 2D del compositor
+            self.cam.node().setActive(False)
+        else:
+            self.scene = build_hologram_scene(self.render, self._load_model(), self.VIEWS)
+            self.master = self.scene.master
+            self.views = self.scene.views
+            self.base_hprs = self.scene.base_hprs
+            self.view_set = HologramViewSet(self.master, self.views, self.base_hprs)
+        
+        # Red: el hilo del receptor sólo encola; update() aplica una vez por frame
+        self.events = FrameEventQueue(latest_only=("rotation", "zoom"))
+        self.event_handlers = {
+            "rotation": self.on_rotation,
+            "zoom": self.on_zoom,
+            "swipe_left": lambda data: self.rotate_by(-self.ROTATION_STEP),
+            "swipe_right": lambda data: self.rotate_by(self.ROTATION_STEP),
+        }
+        self.rotation_predictor = rotation_predictor
+        self.swipe_offset = 0.0
+        self.receiver = None
+        if use_network:
+            self.receiver = GestureNetworkReceiver()
+            for name in self.event_handlers:
+                # Marca de recepción: la predicción mide desde ahí, no desde el drenado
+                self.receiver.register_callback(
+                    name, lambda data, name=name: self.events.push(name, dict(data, received=time.perf_counter())))
+            self.receiver.start()
+        
+        self.taskMgr.add(self.update, "update")
+    
+    def _load_model(self):
+        """Carga el modelo del proyecto o el panda de ejemplo si no existe."""
+        if os.path.exists(self.MODEL_PATH):
+            model = self.loader.loadModel(Filename.fromOsSpecific(os.path.abspath(self.MODEL_PATH)))
+        else:
+            model = self.loader.loadModel("panda")
+            model.setScale(0.2)
+        return model
+    
+    def on_rotation(self, data):
+        """Fija el heading del maestro al ángulo recibido más los swipes acumulados."""
+        heading = data.get('angle', 0) + self.swipe_offset
+        if self.rotation_predictor is not None:
+            self.rotation_predictor.update(heading, data.get('received'))
+        self.master.setH(heading)
+    
+    def on_zoom(self, data):
+        """Escala el modelo (compartido por todas las vistas) según el pinch-zoom."""
+        scale = min(max(float(data.get('scale', 1.0)), self.ZOOM_LIMITS[0]), self.ZOOM_LIMITS[1])
+        if self.compositor:
+            self.compositor.model.setScale(scale)
+            # Las vistas sólo se re-renderizan solas cuando cambia el heading
+            self.compositor.invalidate()
+        else:
+            self.scene.model.setScale(scale)
+    
+    def rotate_by(self, degrees):
+        # ROTATION trae un ángulo absoluto: el swipe se guarda como offset para no perderlo
+        self.swipe_offset += degrees
+        # Un salto discreto invalida la velocidad estimada del ángulo
+        if self.rotation_predictor is not None:
+            self.rotation_predictor.reset()
+        self.master.setH(self.master.getH() + degrees)
+    
+    def update(self, task):
+        """Aplica los eventos recibidos y sincroniza las vistas que cambiaron con el maestro."""
+        self.events.drain(self.event_handlers)
+        if self.rotation_predictor is not None:
+            predicted = self.rotation_predictor.predict(at=time.perf_counter())
+            if predicted is not None:
+                self.master.setH(float(predicted))
+        if self.compositor:
+            self.compositor.update(self.master.getH())
+        else:
+            self.view_set.update()
+        return Task.cont
+    
+    def shutdown(self):
+        # ShowBase también llama a shutdown() al iniciar (restart) y en destroy()
+        receiver, self.receiver = getattr(self, "receiver", None), None
+        if receiver:
+            receiver.stop()
+        ShowBase.shutdown(self)
+
+
+def main():
+    app = HologramRenderer()
+    app.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,95 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .scene import MIRRORED_VIEWS
+
+Hpr = Tuple[float, float, float]
+
+
+def _view_hpr(base_hpr, maestro_h, mirrored):
+    """HPR de una vista: el heading base más (o menos, en espejo) el del maestro."""
+    h = base_hpr[0] - maestro_h if mirrored else base_hpr[0] + maestro_h
+    return (h, base_hpr[1], base_hpr[2])
+
+
+class HologramViewSet:
+    """
+    Vistas del holograma sincronizadas con el heading del modelo maestro.
+
+    Guarda el último heading aplicado y la última HPR de cada vista: si el
+    maestro no giró no se toca ninguna vista, y si giró sólo se escribe la
+    transformación de las vistas cuya HPR cambió. Admite cualquier número de
+    vistas (pirámides de seis caras, otras disposiciones).
+
+    Args:
+        master: Nodo maestro cuyo heading controla las vistas (puede ser None
+            si siempre se pasa ``heading`` a ``update``)
+        views: ``{nombre: nodo}`` de cada vista
+        base_hprs: ``{nombre: hpr base}`` de cada vista
+        mirrored: Nombres de las vistas que giran en espejo
+    """
+
+    def __init__(self, master=None, views: Dict = None, base_hprs: Dict[str, Hpr] = None,
+                 mirrored: Iterable[str] = MIRRORED_VIEWS):
+        self.master = master
+        self.mirrored = frozenset(mirrored)
+        self.views = {}
+        self.base_hprs = {}
+        self._last_hpr: Dict[str, Optional[Hpr]] = {}
+        self._last_heading = None
+        self.applied = 0
+        self.skipped = 0
+        for name, view in (views or {}).items():
+            self.add_view(name, view, base_hprs[name])
+
+    def add_view(self, name: str, view, base_hpr: Hpr, mirrored: Optional[bool] = None) -> None:
+        """Agrega (o reemplaza) una vista; se orienta en el próximo ``update``."""
+        self.views[name] = view
+        self.base_hprs[name] = tuple(base_hpr)
+        self._last_hpr[name] = None
+        if mirrored is not None:
+            self.mirrored = self.mirrored | {name} if mirrored else self.mirrored - {name}
+        self._last_heading = None
+
+    def remove_view(self, name: str) -> None:
+        self.views.pop(name)
+        self.base_hprs.pop(name)
+        self._last_hpr.pop(name)
+
+    def invalidate(self) -> None:
+        """Fuerza a reescribir todas las vistas en el próximo ``update``."""
+        self._last_heading = None
+        for name in self._last_hpr:
+            self._last_hpr[name] = None
+
+    def update(self, heading: Optional[float] = None) -> List[str]:
+        """
+        Orienta las vistas según el heading del maestro (o ``heading``).
+
+        Returns:
+            Nombres de las vistas cuya transformación se actualizó
+        """
+        maestro_h = self.master.getH() if heading is None else heading
+        if maestro_h == self._last_heading:
+            self.skipped += len(self.views)
+            return []
+        self._last_heading = maestro_h
+
+        changed = []
+        for name, view in self.views.items():
+            hpr = _view_hpr(self.base_hprs[name], maestro_h, name in self.mirrored)
+            if hpr == self._last_hpr[name]:
+                continue
+            view.setHpr(*hpr)
+            self._last_hpr[name] = hpr
+            changed.append(name)
+        self.applied += len(changed)
+        self.skipped += len(self.views) - len(changed)
+        return changed
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'applied': self.applied, 'skipped': self.skipped}
+
+
 def aplicar_rotaciones(
     modelo_maestro,
     frontal, frontal_base_hpr,
@@ -10,35 +102,17 @@ def aplicar_rotaciones(
     - El heading (H) del maestro controla la rotación.
     - Frontal y superior giran normal.
     - Posterior e inferior giran en espejo.
+
+    Reescribe siempre las cuatro vistas; para omitir las que no cambiaron
+    usar ``HologramViewSet``.
     """
 
     # Heading del modelo maestro
     maestro_h = modelo_maestro.getH()
 
-    # Frontal
-    frontal.setHpr(
-        frontal_base_hpr[0] + maestro_h,
-        frontal_base_hpr[1],
-        frontal_base_hpr[2]
-    )
-
+    frontal.setHpr(*_view_hpr(frontal_base_hpr, maestro_h, False))
     # Posterior (espejo del frontal)
-    later.setHpr(
-        later_base_hpr[0] - maestro_h,
-        later_base_hpr[1],
-        later_base_hpr[2]
-    )
-
-    # Superior
-    topSide.setHpr(
-        topSide_base_hpr[0] + maestro_h,
-        topSide_base_hpr[1],
-        topSide_base_hpr[2]
-    )
-
+    later.setHpr(*_view_hpr(later_base_hpr, maestro_h, True))
+    topSide.setHpr(*_view_hpr(topSide_base_hpr, maestro_h, False))
     # Inferior (espejo del superior)
-    bottomSide.setHpr(
-        bottomSide_base_hpr[0] - maestro_h,
-        bottomSide_base_hpr[1],
-        bottomSide_base_hpr[2]
-    )
+    bottomSide.setHpr(*_view_hpr(bottomSide_base_hpr, maestro_h, True))
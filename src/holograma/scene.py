@@ -0,0 +1,151 @@
+"""
+Construcción de la escena Pepper's Ghost con instancias de un único modelo.
+
+En lugar de copiar la geometría del modelo en cada vista (``copyTo``), cada
+vista es un nodo con su propia transformación que instancia el mismo modelo
+(``instanceTo``): la geometría existe una sola vez en memoria y en la GPU,
+y sólo cambia la matriz con la que se dibuja. Los pisos estáticos se aplanan
+en un único Geom agrupado por estado.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+from panda3d.core import NodePath, SceneGraphReducer, TransparencyAttrib
+
+from .floors import crear_suelos_planos
+
+# nombre: (posición, hpr base) de cada vista en la cruz
+DEFAULT_VIEWS = {
+    "frontal": ((0, 0, -2.5), (0, 0, 0)),
+    "posterior": ((0, 0, 2.5), (180, 0, 180)),
+    "superior": ((-2.5, 0, 0), (90, 0, -90)),
+    "inferior": ((2.5, 0, 0), (-90, 0, 90)),
+}
+
+# Vistas que giran en espejo respecto del maestro (heading base - heading maestro)
+MIRRORED_VIEWS = frozenset({"posterior", "inferior"})
+
+Vec3 = Tuple[float, float, float]
+
+
+class HologramScene:
+    """Nodos de la escena holográfica construida por ``build_hologram_scene``."""
+
+    def __init__(self, root: NodePath, master: NodePath, model: NodePath,
+                 views: Dict[str, NodePath], base_hprs: Dict[str, Vec3],
+                 floors: Optional[NodePath] = None):
+        self.root = root
+        self.master = master
+        self.model = model
+        self.views = views
+        self.base_hprs = base_hprs
+        self.floors = floors
+
+    def remove(self):
+        """Elimina la escena del grafo."""
+        self.root.removeNode()
+
+
+def prepare_model(model: NodePath) -> NodePath:
+    """
+    Aplana un modelo estático para dibujarlo con el mínimo de Geoms.
+
+    Quita los ``ModelRoot`` intermedios para que ``flattenStrong`` pueda
+    combinar toda la geometría que comparte estado.
+    """
+    model.clearModelNodes()
+    # Como flattenStrong, pero el color queda como atributo de estado: hornearlo
+    # en los vértices agrega una columna que el rasterizador procesa por vértice
+    reducer = SceneGraphReducer()
+    reducer.applyAttribs(model.node(), SceneGraphReducer.TT_transform | SceneGraphReducer.TT_tex_matrix
+                         | SceneGraphReducer.TT_other)
+    reducer.flatten(model.node(), ~0)
+    reducer.makeCompatibleState(model.node())
+    reducer.collectVertexData(model.node(), ~0)
+    reducer.unify(model.node(), False)
+    return model
+
+
+def build_hologram_scene(
+    parent: NodePath,
+    model: NodePath,
+    views: Dict[str, Tuple[Vec3, Vec3]] = None,
+    floors: bool = False,
+    flatten_model: bool = True,
+) -> HologramScene:
+    """
+    Construye las vistas Pepper's Ghost instanciando un único modelo.
+
+    Args:
+        parent: Nodo bajo el que se crea la escena (normalmente ``render``)
+        model: Modelo a mostrar; no se copia, se instancia en cada vista
+        views: ``{nombre: (posición, hpr base)}``; por defecto la cruz de 4 vistas
+        floors: Si True agrega los pisos aplanados de ``crear_suelos_planos``
+        flatten_model: Aplanar el modelo antes de instanciarlo
+
+    Returns:
+        HologramScene con el nodo maestro (invisible) que controlan los gestos
+    """
+    views = DEFAULT_VIEWS if views is None else views
+    root = parent.attachNewNode("holograma")
+    master = root.attachNewNode("maestro")
+
+    # El modelo cuelga de un nodo fuera del grafo: sólo se dibujan sus instancias
+    source = NodePath("modelo")
+    model = model.copyTo(source) if model.hasParent() else model
+    model.reparentTo(source)
+    if flatten_model:
+        prepare_model(model)
+
+    view_nodes = {}
+    base_hprs = {}
+    for name, (pos, hpr) in views.items():
+        view = root.attachNewNode(f"vista_{name}")
+        view.setPos(*pos)
+        view.setHpr(*hpr)
+        model.instanceTo(view)
+        view_nodes[name] = view
+        base_hprs[name] = tuple(hpr)
+
+    # Un único atributo de transparencia heredado por todas las vistas
+    root.setTransparency(TransparencyAttrib.M_alpha)
+
+    floor_node = crear_suelos_planos(root) if floors else None
+    return HologramScene(root, master, model, view_nodes, base_hprs, floor_node)
+
+
+def draw_stats(root: NodePath) -> Dict[str, int]:
+    """
+    Estima el costo de dibujo de un subárbol tal como lo recorre el cull.
+
+    Cada Geom de cada camino (las instancias cuentan una vez por camino) es
+    una llamada de dibujo; cada ``RenderState`` distinto, un cambio de estado.
+    """
+    draw_calls = 0
+    states = set()
+    triangles = 0
+    for path in root.findAllMatches("**/+GeomNode"):
+        if path.isHidden():
+            continue
+        node = path.node()
+        net_state = path.getNetState()
+        for i in range(node.getNumGeoms()):
+            geom = node.getGeom(i)
+            draw_calls += 1
+            states.add(net_state.compose(node.getGeomState(i)))
+            triangles += sum(geom.getPrimitive(j).getNumFaces() for j in range(geom.getNumPrimitives()))
+    return {'draw_calls': draw_calls, 'state_changes': len(states), 'triangles': triangles}
+
+
+def unique_geometry_bytes(roots: Sequence[NodePath]) -> int:
+    """Bytes de vértices únicos (la geometría instanciada se cuenta una vez)."""
+    seen = set()
+    total = 0
+    for root in roots:
+        for path in root.findAllMatches("**/+GeomNode"):
+            node = path.node()
+            for i in range(node.getNumGeoms()):
+                data = node.getGeom(i).getVertexData()
+                if data not in seen:
+                    seen.add(data)
+                    total += sum(data.getArray(j).getDataSizeBytes() for j in range(data.getNumArrays()))
+    return total
@@ -8,9 +8,14 @@ from src.network.event_bus import main as event_bus_main
 from src.gestos.detector import main as gestos_main
 from src.holograma.holograma import main as holograma_main
 from src.ui.main_window import main as ui_main
-
-def run_process(target):
-    p = multiprocessing.Process(target=target)
+from src.network.shm_transport import SharedMemoryTransport, run_attached
+
+def run_process(target, transport=None):
+    # Con transporte compartido, los EventClient del hijo lo usan en lugar de TCP
+    if transport is not None:
+        p = multiprocessing.Process(target=run_attached, args=(target, transport.spec()))
+    else:
+        p = multiprocessing.Process(target=target)
     p.start()
     return p
 
@@ -19,22 +24,25 @@ if __name__ == "__main__":
 
     print("Iniciando la aplicación holográfica...")
 
-    # 1. Iniciar el Bus de Eventos
+    # Memoria compartida para los eventos entre procesos locales
+    transport = SharedMemoryTransport.create()
+
+    # 1. Iniciar el Bus de Eventos (también puentea la memoria compartida con TCP)
     print("Iniciando el Bus de Eventos...")
-    event_bus_process = run_process(event_bus_main)
+    event_bus_process = run_process(event_bus_main, transport)
     time.sleep(1) # Dar tiempo al bus para que se inicie
 
     # 2. Iniciar el renderizador de Holograma
     print("Iniciando el Holograma 3D...")
-    hologram_process = run_process(holograma_main)
+    hologram_process = run_process(holograma_main, transport)
 
     # 3. Iniciar el detector de Gestos
     print("Iniciando el detector de Gestos...")
-    gestos_process = run_process(gestos_main)
+    gestos_process = run_process(gestos_main, transport)
 
     # 4. Iniciar la Interfaz de Usuario
     print("Iniciando la Interfaz de Usuario...")
-    ui_process = run_process(ui_main)
+    ui_process = run_process(ui_main, transport)
 
     # Mantener el proceso principal vivo y manejar la salida
     try:
@@ -49,3 +57,5 @@ if __name__ == "__main__":
         hologram_process.terminate()
         gestos_process.terminate()
         ui_process.terminate()
+    finally:
+        transport.close()
@@ -1,25 +1,73 @@
 # src/network/client.py
 
 import socket
-import json
 import threading
 import time
 from src.utils.config import HOST, PORT
+from src.network.protocol import (
+    CODECS, HEADER, SUBSCRIBE, FrameDecoder, FrameEncoder, ProtocolError, decode_body
+)
+from src.network import shm_transport
+
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+SHM_WAIT_TIMEOUT = 0.1  # Máximo que duerme el lector sin escrituras (para notar el cierre)
 
 class EventClient:
-    def __init__(self, name):
+    def __init__(self, name, codec="binary", host=HOST, port=PORT, topics=None, transport="auto"):
+        """
+        Args:
+            name: Nombre con el que se firman los eventos enviados
+            codec: ``"binary"`` (eventos de alta frecuencia compactos) o
+                ``"json"`` (todo en JSON, útil para depurar)
+            host, port: Dirección del Event Bus
+            topics: Tipos de evento a recibir (p. ej. ``["gesture_detected"]``);
+                None recibe todos y una lista vacía ninguno (sólo productor)
+            transport: ``"auto"`` usa memoria compartida si el proceso la heredó
+                de src/main.py y el bus es local (el bus, adjunto al mismo
+                segmento, la puentea con los clientes TCP); ``"tcp"`` fuerza el socket
+        """
         self.name = name
+        self.topics = None if topics is None else list(topics)
+        self.host = host
+        self.port = port
+        self.transport = transport
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.connected = False
         self.on_message_received = None
+        # Eventos descartados por no caber en el transporte (p. ej. > 2 KB en memoria compartida)
+        self.dropped = 0
+
+        self._encoder = FrameEncoder(CODECS[codec])
+        self._decoder = FrameDecoder()
+        self._send_lock = threading.Lock()
+        self._shm = None
+
+    def _shared_memory(self):
+        """Transporte en memoria compartida a usar, o None para ir por TCP."""
+        if self.transport != "auto" or self.host not in LOCAL_HOSTS:
+            return None
+        return shm_transport.local_transport()
 
     def connect(self):
+        shared = self._shared_memory()
+        if shared is not None:
+            self._shm = shared.endpoint(self.topics)
+            self.connected = True
+            print(f"[{self.name}] Conectado por memoria compartida.")
+            listen_thread = threading.Thread(target=self._listen_shared_memory)
+            listen_thread.daemon = True
+            listen_thread.start()
+            return
+
         while not self.connected:
             try:
-                self.socket.connect((HOST, PORT))
+                self.socket.connect((self.host, self.port))
+                self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                 self.connected = True
                 print(f"[{self.name}] Conectado al Event Bus.")
-                
+                if self.topics is not None:
+                    self.send_event(SUBSCRIBE, {"topics": self.topics})
+
                 # Iniciar hilo para escuchar mensajes
                 listen_thread = threading.Thread(target=self.listen)
                 listen_thread.daemon = True
@@ -32,31 +80,74 @@ class EventClient:
     def listen(self):
         while self.connected:
             try:
-                message = self.socket.recv(1024)
-                if not message:
+                if not self._decoder.recv_from(self.socket):
                     self.connected = False
                     break
-                
-                if self.on_message_received:
+
+                for codec, body in self._decoder.frames():
                     try:
-                        event = json.loads(message.decode('utf-8'))
+                        event = decode_body(codec, body)
+                    except ProtocolError as e:
+                        # Un mensaje corrupto se descarta; el framing sigue sano
+                        print(f"[{self.name}] Mensaje descartado: {e}")
+                        continue
+                    if self.on_message_received:
                         self.on_message_received(event)
-                    except json.JSONDecodeError:
-                        print(f"[{self.name}] Error decodificando JSON: {message.decode('utf-8')}")
 
-            except ConnectionResetError:
+            except ProtocolError as e:
+                # Error de framing (p. ej. longitud excesiva): el stream ya no es confiable
+                print(f"[{self.name}] Error de protocolo: {e}")
+                self.connected = False
+                break
+            except OSError:
                 self.connected = False
                 break
-        
+
         print(f"[{self.name}] Desconectado del Event Bus.")
 
+    def _listen_shared_memory(self):
+        while self.connected:
+            try:
+                frames = self._shm.poll()
+                if not frames:
+                    self._shm.wait(SHM_WAIT_TIMEOUT)
+                    continue
+            except (AttributeError, ValueError):
+                # Transporte cerrado mientras se leía
+                break
+            for frame in frames:
+                try:
+                    event = decode_body(frame[HEADER.size - 1], memoryview(frame)[HEADER.size:])
+                except ProtocolError as e:
+                    print(f"[{self.name}] Mensaje descartado: {e}")
+                    continue
+                if self.on_message_received:
+                    self.on_message_received(event)
+
+        print(f"[{self.name}] Desconectado de la memoria compartida.")
+
+    def subscribe(self, topics):
+        """Reemplaza los tópicos suscritos (None = todos)."""
+        self.topics = None if topics is None else list(topics)
+        if self._shm is not None:
+            self._shm.set_topics(self.topics)
+            return
+        self.send_event(SUBSCRIBE, {"topics": self.topics})
+
     def send_event(self, event_type, data):
         if self.connected:
             event = {"source": self.name, "type": event_type, "data": data}
             try:
-                self.socket.sendall(json.dumps(event).encode('utf-8'))
+                with self._send_lock:
+                    if self._shm is not None:
+                        self._shm.send(event_type, self._encoder.encode(event))
+                    else:
+                        self.socket.sendall(self._encoder.encode(event))
             except socket.error:
                 self.connected = False
+            except ValueError:
+                # Mensaje que no cabe en un frame o en un slot de memoria compartida
+                self.dropped += 1
 
     def close(self):
         self.connected = False
@@ -1,58 +1,325 @@
 # src/network/event_bus.py
+"""
+Event Bus: reenvía los frames de cada cliente al resto de clientes.
 
+Corre sobre un único event loop de asyncio. Las escrituras nunca bloquean:
+cuando el socket de un cliente lento se llena, sus mensajes esperan en una
+cola propia acotada y, al desbordarse, se aplica la política configurada:
+
+    - ``drop_oldest``: se descarta el mensaje más antiguo de la cola
+    - ``coalesce``: el mensaje reemplaza al pendiente del mismo tipo de evento
+      (si no hay ninguno, se descarta el más antiguo)
+    - ``disconnect``: se desconecta al cliente
+
+Así un consumidor lento (p. ej. el holograma trabado en un frame) no frena
+a los productores ni a los demás consumidores.
+
+Cada cliente puede declarar los tópicos (tipos de evento) que le interesan con
+un evento ``SUBSCRIBE``; sin declaración recibe todo. El bus mantiene una tabla
+de ruteo precalculada tópico → destinatarios, de modo que el costo de reenviar
+un mensaje depende de los interesados y no del total de clientes.
+
+Si el proceso heredó el segmento de memoria compartida de src/main.py, el bus
+además hace de puente con él: reenvía a los clientes TCP lo que publican los
+clientes en memoria compartida y publica allí lo que llega por TCP.
+"""
+
+import argparse
+import asyncio
 import socket
 import threading
-import json
+import time
+from collections import deque
 from src.utils.config import HOST, PORT
+from src.network.protocol import (
+    HEADER, SUBSCRIBE, FrameDecoder, ProtocolError, decode_body, peek_event_type
+)
+from src.network import shm_transport
+
+SHM_WAIT_TIMEOUT = 0.1  # Máximo que duerme el puente sin escrituras (para notar el cierre)
+
+POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+
+class ClientConnection(asyncio.BufferedProtocol):
+    """Conexión de un cliente: recepción sin copias y cola de salida acotada."""
+
+    def __init__(self, bus: "EventBus"):
+        self.bus = bus
+        self.transport = None
+        self.address = None
+        self.decoder = FrameDecoder()
+        self.topics = None  # None = todos los tópicos
+        self.queue = deque()  # (tipo de evento, frame)
+        self.paused = False
+        self.closed = False
+
+        self.connected_at = time.perf_counter()
+        self.received = 0
+        self.sent = 0
+        self.bytes_sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_queue_depth = 0
+
+    # --- asyncio.BufferedProtocol ---
+
+    def connection_made(self, transport):
+        self.transport = transport
+        host, port = transport.get_extra_info('peername')[:2]
+        self.address = f"{host}:{port}"
+        self.bus._add_client(self)
+
+    def get_buffer(self, sizehint):
+        return self.decoder.get_buffer()
+
+    def buffer_updated(self, nbytes):
+        self.decoder.advance(nbytes)
+        try:
+            for frame in self.decoder.raw_frames():
+                codec, body = frame[HEADER.size - 1], frame[HEADER.size:]
+                event_type = peek_event_type(codec, body)
+                if event_type == SUBSCRIBE:
+                    try:
+                        topics = decode_body(codec, body).get('data', {}).get('topics')
+                    except ProtocolError as e:
+                        print(f"[EventBus] Suscripción inválida de {self.address}: {e}")
+                        continue
+                    self.topics = None if topics is None else frozenset(topics)
+                    self.bus._rebuild_routes()
+                    continue
+                self.received += 1
+                # Una sola copia por mensaje, compartida por todos los destinatarios
+                message = bytes(frame)
+                self.bus.broadcast(message, self, event_type)
+                self.bus.publish_shared(message, event_type)
+        except ProtocolError as e:
+            print(f"[EventBus] Error con cliente {self.address}: {e}")
+            self.transport.abort()
+
+    def pause_writing(self):
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+        self._flush()
+
+    def connection_lost(self, exc):
+        self.closed = True
+        self.queue.clear()
+        self.bus._remove_client(self)
+
+    # --- Envío ---
+
+    def send(self, frame: bytes, event_type: str):
+        """Envía un frame sin bloquear; si el socket está lleno lo encola."""
+        if self.closed:
+            return
+        if not self.paused and not self.queue:
+            self._write(frame)
+            return
+
+        if len(self.queue) >= self.bus.max_queue:
+            policy = self.bus.policy
+            if policy == "disconnect":
+                print(f"[EventBus] Cliente lento {self.address} desconectado")
+                self.bus.disconnected += 1
+                self.closed = True
+                self.transport.abort()
+                return
+            if policy == "coalesce" and self._coalesce(frame, event_type):
+                return
+            self.queue.popleft()
+            self.dropped += 1
+
+        self.queue.append((event_type, frame))
+        self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+
+    def _coalesce(self, frame: bytes, event_type: str) -> bool:
+        """Reemplaza el mensaje pendiente más reciente del mismo tipo de evento."""
+        for i in range(len(self.queue) - 1, -1, -1):
+            if self.queue[i][0] == event_type:
+                self.queue[i] = (event_type, frame)
+                self.coalesced += 1
+                return True
+        return False
+
+    def _flush(self):
+        while self.queue and not self.paused and not self.closed:
+            self._write(self.queue.popleft()[1])
+
+    def _write(self, frame: bytes):
+        self.transport.write(frame)
+        self.sent += 1
+        self.bytes_sent += len(frame)
+
+    def get_stats(self):
+        elapsed = time.perf_counter() - self.connected_at
+        return {
+            'topics': None if self.topics is None else sorted(self.topics),
+            'queue_depth': len(self.queue),
+            'max_queue_depth': self.max_queue_depth,
+            'write_buffer_bytes': self.transport.get_write_buffer_size() if self.transport else 0,
+            'received': self.received,
+            'sent': self.sent,
+            'bytes_sent': self.bytes_sent,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'sent_per_second': self.sent / elapsed if elapsed > 0 else 0.0,
+        }
+
 
 class EventBus:
-    def __init__(self):
+    def __init__(self, host=HOST, port=PORT, max_queue=256, policy="drop_oldest"):
+        """
+        Args:
+            host, port: Dirección de escucha (port=0 elige uno libre)
+            max_queue: Mensajes pendientes por cliente antes de aplicar la política
+            policy: ``"drop_oldest"``, ``"coalesce"`` o ``"disconnect"``
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Política desconocida: {policy}")
+        self.max_queue = max_queue
+        self.policy = policy
         self.clients = []
-        self.lock = threading.Lock()
+        self.disconnected = 0
+        # Tabla de ruteo: tópico -> destinatarios; el resto de tópicos va sólo
+        # a los clientes sin suscripción declarada
+        self._routes = {}
+        self._wildcard = ()
+        self.ready = threading.Event()
+
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.server_socket.bind((HOST, PORT))
+        self.server_socket.bind((host, port))
+        # Con port=0 el sistema asigna uno libre
+        self.host, self.port = self.server_socket.getsockname()[:2]
+
+        self._loop = None
+        self._stopping = None
+        # Extremo en memoria compartida (si el proceso heredó el segmento)
+        self._shm = None
+        self.shm_dropped = 0
 
-    def handle_client(self, client_socket):
-        with self.lock:
-            self.clients.append(client_socket)
-        
+    def _add_client(self, client):
+        self.clients.append(client)
+        self._rebuild_routes()
         print(f"[EventBus] Nuevo cliente conectado. Total: {len(self.clients)}")
 
-        try:
-            while True:
-                message = client_socket.recv(1024)
-                if not message:
-                    break
-                self.broadcast(message, client_socket)
-        finally:
-            with self.lock:
-                self.clients.remove(client_socket)
-            client_socket.close()
+    def _remove_client(self, client):
+        if client in self.clients:
+            self.clients.remove(client)
+            self._rebuild_routes()
             print(f"[EventBus] Cliente desconectado. Total: {len(self.clients)}")
 
-    def broadcast(self, message, sender_socket):
-        with self.lock:
-            for client in self.clients:
-                if client is not sender_socket:
-                    try:
-                        client.sendall(message)
-                    except socket.error:
-                        # Cliente podría haberse desconectado
-                        pass
+    def _rebuild_routes(self):
+        """Recalcula la tabla de ruteo (sólo al conectar, desconectar o suscribirse)."""
+        wildcard = tuple(c for c in self.clients if c.topics is None)
+        topics = set().union(*(c.topics for c in self.clients if c.topics is not None))
+        self._routes = {
+            topic: tuple(c for c in self.clients if c.topics is None or topic in c.topics)
+            for topic in topics
+        }
+        self._wildcard = wildcard
+
+    def broadcast(self, message, sender, event_type=None):
+        if event_type is None:
+            event_type = peek_event_type(message[HEADER.size - 1], memoryview(message)[HEADER.size:])
+        for client in self._routes.get(event_type, self._wildcard):
+            if client is not sender:
+                client.send(message, event_type)
+
+    def publish_shared(self, message, event_type):
+        """Publica en memoria compartida un mensaje recibido por TCP."""
+        if self._shm is None:
+            return
+        try:
+            self._shm.send(event_type, message)
+        except ValueError:
+            # No cabe en un slot: sólo lo reciben los clientes TCP
+            self.shm_dropped += 1
 
-    def start(self):
-        print(f"[EventBus] Iniciando en {HOST}:{PORT}")
+    def _forward_shared(self, endpoint, loop):
+        """Hilo del puente: reenvía a los clientes TCP lo publicado en memoria compartida."""
+        while self._shm is endpoint:
+            try:
+                frames = endpoint.poll()
+                if not frames:
+                    endpoint.wait(SHM_WAIT_TIMEOUT)
+                    continue
+                for frame in frames:
+                    loop.call_soon_threadsafe(self.broadcast, frame, None)
+            except (AttributeError, ValueError, RuntimeError):
+                # Transporte cerrado o bus detenido
+                break
+
+    def get_stats(self):
+        """Profundidad de cola y throughput por cliente (``host:puerto``)."""
+        return {
+            'clients': {client.address: client.get_stats() for client in list(self.clients)},
+            'disconnected': self.disconnected,
+            'shm_dropped': self.shm_dropped,
+            'policy': self.policy,
+            'max_queue': self.max_queue,
+        }
+
+    def format_stats(self):
+        stats = self.get_stats()
+        lines = [f"[EventBus] {len(stats['clients'])} clientes | política: {self.policy} | "
+                 f"desconectados por lentitud: {stats['disconnected']}"]
+        for address, s in stats['clients'].items():
+            lines.append(
+                f"  {address:<22} cola {s['queue_depth']:>4} (máx {s['max_queue_depth']:>4})  "
+                f"enviados {s['sent']:>8} ({s['sent_per_second']:,.0f}/s)  "
+                f"descartados {s['dropped']}  fusionados {s['coalesced']}"
+            )
+        return "\n".join(lines)
+
+    async def serve(self, stats_interval=None):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
         self.server_socket.listen()
-        while True:
-            client_socket, _ = self.server_socket.accept()
-            thread = threading.Thread(target=self.handle_client, args=(client_socket,))
-            thread.daemon = True
-            thread.start()
-
-def main():
-    bus = EventBus()
-    bus.start()
+        self.server_socket.setblocking(False)
+        server = await self._loop.create_server(lambda: ClientConnection(self), sock=self.server_socket)
+
+        shared = shm_transport.local_transport()
+        if shared is not None:
+            self._shm = shared.endpoint()
+            threading.Thread(target=self._forward_shared, args=(self._shm, self._loop), daemon=True).start()
+            print("[EventBus] Puente con la memoria compartida activo.")
+        self.ready.set()
+
+        try:
+            async with server:
+                while not self._stopping.is_set():
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=stats_interval)
+                    except asyncio.TimeoutError:
+                        print(self.format_stats())
+                for client in list(self.clients):
+                    client.transport.close()
+        finally:
+            self._loop = None
+            self._shm = None
+
+    def start(self, stats_interval=None):
+        print(f"[EventBus] Iniciando en {self.host}:{self.port}")
+        asyncio.run(self.serve(stats_interval))
+
+    def stop(self):
+        """Detiene el bus desde otro hilo."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Event Bus de gestos y holograma")
+    parser.add_argument('--max-queue', type=int, default=256)
+    parser.add_argument('--policy', choices=POLICIES, default="drop_oldest")
+    parser.add_argument('--stats-interval', type=float, help="Segundos entre reportes de clientes")
+    args = parser.parse_args(argv)
+
+    bus = EventBus(max_queue=args.max_queue, policy=args.policy)
+    bus.start(args.stats_interval)
 
 if __name__ == "__main__":
     main()
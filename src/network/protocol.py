@@ -0,0 +1,250 @@
+# src/network/protocol.py
+"""
+Protocolo de cable del Event Bus.
+
+Cada mensaje viaja en un frame con prefijo de longitud:
+
+    [longitud: u32 big-endian][codec: u8][cuerpo: longitud bytes]
+
+Codecs:
+    - ``CODEC_JSON``: el evento completo como JSON UTF-8 (legible, para depurar).
+    - ``CODEC_BINARY``: para eventos de alta frecuencia con esquema fijo
+      (rotación continua, posición del cursor):
+        [tipo: u8][len(source): u8][source UTF-8][campos: f32 big-endian...]
+
+Los eventos sin esquema binario (o con campos de más o de menos) se envían siempre en JSON,
+con ``type`` como primera clave para que el bus pueda enrutarlos sin decodificarlos.
+La recepción usa un ``bytearray`` reutilizable y vistas ``memoryview``, sin
+crear buffers nuevos por mensaje.
+"""
+
+import json
+import struct
+from typing import Any, Dict, Iterator, Tuple
+
+HEADER = struct.Struct("!IB")
+MAX_FRAME_SIZE = 1 << 20  # 1 MiB
+
+CODEC_JSON = 0
+CODEC_BINARY = 1
+CODECS = {"json": CODEC_JSON, "binary": CODEC_BINARY}
+
+# Evento de control con el que un cliente declara sus tópicos (no se reenvía)
+SUBSCRIBE = "__subscribe__"
+
+# Esquemas binarios: tipo de evento -> (id, campos float32 de ``data``)
+BINARY_EVENTS = {
+    "rotation": (1, ("angle", "speed")),
+    "cursor": (2, ("x", "y")),
+}
+
+_BINARY_HEAD = struct.Struct("!BB")
+_BINARY_SCHEMAS = {
+    event_type: (type_id, fields, struct.Struct("!" + "f" * len(fields)))
+    for event_type, (type_id, fields) in BINARY_EVENTS.items()
+}
+_BINARY_BY_ID = {type_id: (event_type, fields, packer)
+                 for event_type, (type_id, fields, packer) in _BINARY_SCHEMAS.items()}
+
+
+class ProtocolError(ValueError):
+    """Frame mal formado o que excede el tamaño máximo."""
+
+
+def _binary_schema(event: Dict[str, Any]):
+    """Retorna el esquema binario aplicable al evento o None si debe ir en JSON."""
+    schema = _BINARY_SCHEMAS.get(event.get("type"))
+    if schema is None:
+        return None
+    data = event.get("data") or {}
+    fields = schema[1]
+    # Un campo faltante no se rellena: el receptor no podría distinguirlo de 0.0
+    if set(data) != set(fields):
+        return None
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in data.values()):
+        return None
+    return schema
+
+
+class FrameEncoder:
+    """Codifica eventos en frames sobre un buffer reutilizable."""
+
+    def __init__(self, codec: int = CODEC_BINARY, capacity: int = 4096):
+        self.codec = codec
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+
+    def encode(self, event: Dict[str, Any]) -> memoryview:
+        """
+        Codifica un evento ``{"source", "type", "data"}``.
+
+        Returns:
+            Vista del frame completo, válida hasta la siguiente llamada
+        """
+        schema = _binary_schema(event) if self.codec == CODEC_BINARY else None
+        if schema is None:
+            body = json.dumps({"type": event.get("type"), **event}).encode("utf-8")
+            return self._write(CODEC_JSON, body)
+
+        type_id, fields, packer = schema
+        source = str(event.get("source", "")).encode("utf-8")[:255]
+        data = event.get("data") or {}
+        size = _BINARY_HEAD.size + len(source) + packer.size
+        self._reserve(HEADER.size + size)
+
+        HEADER.pack_into(self._buffer, 0, size, CODEC_BINARY)
+        offset = HEADER.size
+        _BINARY_HEAD.pack_into(self._buffer, offset, type_id, len(source))
+        offset += _BINARY_HEAD.size
+        self._buffer[offset:offset + len(source)] = source
+        offset += len(source)
+        packer.pack_into(self._buffer, offset, *(float(data[f]) for f in fields))
+        return self._view[:HEADER.size + size]
+
+    def _write(self, codec: int, body: bytes) -> memoryview:
+        if len(body) > MAX_FRAME_SIZE:
+            raise ProtocolError(f"Mensaje demasiado grande: {len(body)} bytes")
+        self._reserve(HEADER.size + len(body))
+        HEADER.pack_into(self._buffer, 0, len(body), codec)
+        self._buffer[HEADER.size:HEADER.size + len(body)] = body
+        return self._view[:HEADER.size + len(body)]
+
+    def _reserve(self, size: int):
+        if size > len(self._buffer):
+            self._view.release()
+            self._buffer = bytearray(max(size, 2 * len(self._buffer)))
+            self._view = memoryview(self._buffer)
+
+
+def encode_event(event: Dict[str, Any], codec: int = CODEC_BINARY) -> bytes:
+    """Codifica un evento en un frame nuevo (conveniencia; no reutiliza buffers)."""
+    return bytes(FrameEncoder(codec).encode(event))
+
+
+def decode_body(codec: int, body) -> Dict[str, Any]:
+    """Decodifica el cuerpo de un frame en un evento ``{"source", "type", "data"}``."""
+    if codec == CODEC_JSON:
+        try:
+            return json.loads(bytes(body).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ProtocolError(f"JSON inválido: {e}") from e
+
+    if codec == CODEC_BINARY:
+        try:
+            type_id, source_len = _BINARY_HEAD.unpack_from(body, 0)
+            schema = _BINARY_BY_ID.get(type_id)
+            if schema is None:
+                raise ProtocolError(f"Tipo binario desconocido: {type_id}")
+            event_type, fields, packer = schema
+            offset = _BINARY_HEAD.size
+            source = bytes(body[offset:offset + source_len]).decode("utf-8")
+            values = packer.unpack_from(body, offset + source_len)
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ProtocolError(f"Frame binario inválido: {e}") from e
+        return {"source": source, "type": event_type, "data": dict(zip(fields, values))}
+
+    raise ProtocolError(f"Codec desconocido: {codec}")
+
+
+_JSON_TYPE_PREFIX = b'{"type": "'
+
+
+def peek_event_type(codec: int, body) -> str:
+    """
+    Tipo de evento de un frame sin decodificar el cuerpo completo.
+
+    En binario es el primer byte; en JSON se lee la primera clave que escribe
+    ``FrameEncoder`` (y sólo si no está se decodifica el mensaje entero).
+    """
+    if codec == CODEC_BINARY:
+        schema = _BINARY_BY_ID.get(body[0])
+        return schema[0] if schema else ""
+    start = len(_JSON_TYPE_PREFIX)
+    if body[:start] == _JSON_TYPE_PREFIX:
+        head = bytes(body[start:start + 256])
+        end = head.find(b'"')
+        if end > 0 and b"\\" not in head[:end]:
+            return head[:end].decode("utf-8")
+    return decode_body(codec, body).get("type", "")
+
+
+class FrameDecoder:
+    """
+    Reensambla frames a partir de un flujo TCP sobre un buffer reutilizable.
+
+    Los segmentos partidos o agrupados se resuelven con el prefijo de longitud;
+    ``recv_from`` escribe directamente en el buffer con ``recv_into``.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._start = 0  # Inicio del primer frame sin consumir
+        self._end = 0    # Fin de los datos recibidos
+
+    def recv_from(self, sock) -> int:
+        """Lee del socket al buffer. Retorna los bytes leídos (0 = conexión cerrada)."""
+        n = sock.recv_into(self.get_buffer())
+        self.advance(n)
+        return n
+
+    def get_buffer(self) -> memoryview:
+        """Región libre del buffer donde escribir los próximos bytes recibidos."""
+        self._make_room()
+        return self._view[self._end:]
+
+    def advance(self, nbytes: int) -> None:
+        """Marca como recibidos ``nbytes`` escritos en la región de ``get_buffer``."""
+        self._end += nbytes
+
+    def feed(self, data: bytes) -> None:
+        """Agrega bytes recibidos por otra vía (p. ej. asyncio o tests)."""
+        data = memoryview(data)
+        while len(data):
+            self._make_room()
+            n = min(len(data), len(self._buffer) - self._end)
+            self._view[self._end:self._end + n] = data[:n]
+            self._end += n
+            data = data[n:]
+
+    def _make_room(self):
+        """Compacta el buffer (y lo agranda si un frame no cabe) antes de recibir."""
+        if self._start == self._end:
+            self._start = self._end = 0
+        elif self._start > 0 and self._end == len(self._buffer):
+            pending = self._end - self._start
+            self._view[:pending] = self._view[self._start:self._end]
+            self._start, self._end = 0, pending
+
+        if self._end == len(self._buffer):
+            # Frame más grande que el buffer: duplicar capacidad
+            self._view.release()
+            self._buffer.extend(bytes(len(self._buffer)))
+            self._view = memoryview(self._buffer)
+
+    def raw_frames(self) -> Iterator[memoryview]:
+        """
+        Itera sobre los frames completos (cabecera incluida) disponibles.
+
+        Las vistas sólo son válidas hasta la siguiente lectura del socket.
+        """
+        while self._end - self._start >= HEADER.size:
+            length, codec = HEADER.unpack_from(self._buffer, self._start)
+            if length > MAX_FRAME_SIZE:
+                raise ProtocolError(f"Frame demasiado grande: {length} bytes")
+            frame_end = self._start + HEADER.size + length
+            if frame_end > self._end:
+                break
+            frame = self._view[self._start:frame_end]
+            self._start = frame_end
+            yield frame
+
+    def frames(self) -> Iterator[Tuple[int, memoryview]]:
+        """Itera sobre ``(codec, cuerpo)`` de los frames completos disponibles."""
+        for frame in self.raw_frames():
+            yield frame[HEADER.size - 1], frame[HEADER.size:]
+
+    def events(self) -> Iterator[Dict[str, Any]]:
+        """Itera sobre los eventos decodificados de los frames completos."""
+        for codec, body in self.frames():
+            yield decode_body(codec, body)
@@ -0,0 +1,321 @@
+# src/network/shm_transport.py
+"""
+Transporte en memoria compartida entre procesos del mismo equipo.
+
+``src/main.py`` crea un único segmento de ``multiprocessing.shared_memory`` y lo
+hereda a cada proceso; ``EventClient`` lo usa automáticamente en lugar del
+socket cuando el Event Bus es local. Los mensajes son los mismos frames de
+``src.network.protocol``, sin pasar por el kernel ni por el bus.
+
+El segmento tiene dos zonas:
+
+    - Slots de último valor (seqlock), uno por tópico continuo de
+      ``LATEST_TOPICS`` (rotación, cursor, pose de la mano). Un lector sólo ve
+      el valor más reciente; los intermedios se descartan sin costo.
+    - Un anillo de difusión para eventos discretos (gestos). Cada lector lleva
+      su propio cursor, así que todos reciben todos los mensajes; si un lector
+      se atrasa más que el tamaño del anillo, pierde los más antiguos.
+
+Los escritores (varios procesos) se serializan con una
+``multiprocessing.Condition`` y la notifican después de cada escritura. Los
+lectores leen sin lock; sólo cuando no hay nada nuevo la toman para dormir en
+``ShmEndpoint.wait`` hasta la siguiente escritura.
+
+El Event Bus también se adjunta al segmento (``src/main.py`` lo lanza con el
+transporte) y hace de puente: lo que llega por TCP se publica en memoria
+compartida y viceversa, así que los clientes de ambos lados se ven entre sí.
+"""
+
+import os
+import struct
+import threading
+from multiprocessing import Condition, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Sequence
+
+from src.network.protocol import HEADER, peek_event_type
+
+LATEST_TOPICS = ("rotation", "cursor", "hand_pose")
+RING_SLOTS = 1024
+RING_SLOT_SIZE = 2048
+LATEST_SLOT_SIZE = 4096
+
+_COUNTER = struct.Struct("<Q")
+_ENTRY = struct.Struct("<QII")  # secuencia, origen, longitud
+
+
+def _attach_segment(name: str) -> SharedMemory:
+    """Abre un segmento existente sin registrarlo en el resource_tracker del proceso."""
+    try:
+        return SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        # Antes de 3.13 cada proceso que se adjunta registra el segmento y el
+        # tracker lo eliminaría al terminar ese proceso
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class LatestValueSlots:
+    """Slots de último valor protegidos con un seqlock (secuencia impar = escribiendo)."""
+
+    def __init__(self, buf: memoryview, count: int, slot_size: int):
+        self._buf = buf
+        self.count = count
+        self.slot_size = slot_size
+        self.capacity = slot_size - _ENTRY.size
+
+    def _offset(self, index: int) -> int:
+        return index * self.slot_size
+
+    def seq(self, index: int) -> int:
+        """Secuencia de la última escritura completa del slot."""
+        return _ENTRY.unpack_from(self._buf, self._offset(index))[0] & ~1
+
+    def write(self, index: int, origin: int, payload) -> None:
+        """Publica ``payload`` en el slot (los escritores deben estar serializados)."""
+        size = len(payload)
+        if size > self.capacity:
+            raise ValueError(f"Mensaje demasiado grande para memoria compartida: {size} bytes")
+        offset = self._offset(index)
+        seq = _COUNTER.unpack_from(self._buf, offset)[0]
+        _COUNTER.pack_into(self._buf, offset, seq + 1)
+        start = offset + _ENTRY.size
+        self._buf[start:start + size] = payload
+        _ENTRY.pack_into(self._buf, offset, seq + 2, origin, size)
+
+    def read(self, index: int, last_seq: int, retries: int = 8):
+        """
+        Lee el slot si cambió desde ``last_seq``.
+
+        Returns:
+            ``(seq, origen, bytes)`` o None si no hay un valor nuevo
+        """
+        offset = self._offset(index)
+        for _ in range(retries):
+            seq, origin, size = _ENTRY.unpack_from(self._buf, offset)
+            if seq == last_seq:
+                return None
+            if seq & 1:
+                continue
+            start = offset + _ENTRY.size
+            payload = bytes(self._buf[start:start + size])
+            if _COUNTER.unpack_from(self._buf, offset)[0] == seq:
+                return seq, origin, payload
+        return None
+
+
+class BroadcastRing:
+    """Anillo de difusión: un contador global de escritura y un cursor por lector."""
+
+    def __init__(self, buf: memoryview, slots: int, slot_size: int):
+        self._buf = buf
+        self.slots = slots
+        self.slot_size = slot_size
+        self.capacity = slot_size - _ENTRY.size
+
+    @property
+    def write_seq(self) -> int:
+        return _COUNTER.unpack_from(self._buf, 0)[0]
+
+    def _offset(self, seq: int) -> int:
+        return _COUNTER.size + (seq % self.slots) * self.slot_size
+
+    def write(self, origin: int, payload) -> None:
+        """Agrega un mensaje (los escritores deben estar serializados)."""
+        size = len(payload)
+        if size > self.capacity:
+            raise ValueError(f"Mensaje demasiado grande para memoria compartida: {size} bytes")
+        seq = self.write_seq
+        offset = self._offset(seq)
+        # Secuencia 0 = entrada en escritura; al terminar queda seq + 1
+        _ENTRY.pack_into(self._buf, offset, 0, origin, size)
+        start = offset + _ENTRY.size
+        self._buf[start:start + size] = payload
+        _COUNTER.pack_into(self._buf, offset, seq + 1)
+        _COUNTER.pack_into(self._buf, 0, seq + 1)
+
+    def read(self, cursor: int):
+        """
+        Lee desde ``cursor`` hasta el último mensaje publicado.
+
+        Returns:
+            ``(nuevo cursor, perdidos, [(origen, bytes), ...])``
+        """
+        end = self.write_seq
+        lost = 0
+        if end - cursor > self.slots:
+            lost = end - cursor - self.slots
+            cursor = end - self.slots
+
+        messages = []
+        for seq in range(cursor, end):
+            offset = self._offset(seq)
+            entry_seq, origin, size = _ENTRY.unpack_from(self._buf, offset)
+            if entry_seq != seq + 1:
+                lost += 1
+                continue
+            start = offset + _ENTRY.size
+            payload = bytes(self._buf[start:start + size])
+            if _COUNTER.unpack_from(self._buf, offset)[0] != entry_seq:
+                lost += 1
+                continue
+            messages.append((origin, payload))
+        return end, lost, messages
+
+
+class SharedMemoryTransport:
+    """Segmento compartido con los slots de último valor y el anillo de eventos."""
+
+    def __init__(self, shm: SharedMemory, cond, owner: bool):
+        self.shm = shm
+        # Serializa a los escritores y despierta a los lectores en espera
+        self.cond = cond
+        self.owner = owner
+
+        ring_size = _COUNTER.size + RING_SLOTS * RING_SLOT_SIZE
+        self._views = [shm.buf[:ring_size], shm.buf[ring_size:self.size()]]
+        self.ring = BroadcastRing(self._views[0], RING_SLOTS, RING_SLOT_SIZE)
+        self.latest = LatestValueSlots(self._views[1], len(LATEST_TOPICS), LATEST_SLOT_SIZE)
+
+    @staticmethod
+    def size() -> int:
+        return _COUNTER.size + RING_SLOTS * RING_SLOT_SIZE + len(LATEST_TOPICS) * LATEST_SLOT_SIZE
+
+    @classmethod
+    def create(cls, name: Optional[str] = None) -> "SharedMemoryTransport":
+        """Crea el segmento (lo hace el proceso lanzador, que también lo elimina)."""
+        shm = SharedMemory(name=name, create=True, size=cls.size())
+        shm.buf[:cls.size()] = bytes(cls.size())
+        return cls(shm, Condition(), owner=True)
+
+    @classmethod
+    def attach(cls, spec) -> "SharedMemoryTransport":
+        """Se adjunta a un segmento creado por otro proceso a partir de ``spec()``."""
+        name, cond = spec
+        return cls(_attach_segment(name), cond, owner=False)
+
+    def spec(self):
+        """Datos para adjuntarse desde un proceso hijo (se pasan como argumento)."""
+        return self.shm.name, self.cond
+
+    def endpoint(self, topics: Optional[Sequence[str]] = None) -> "ShmEndpoint":
+        return ShmEndpoint(self, topics)
+
+    def close(self):
+        self.ring = self.latest = None
+        for view in self._views:
+            view.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class ShmEndpoint:
+    """
+    Extremo de un cliente: publica frames y recoge los de los demás.
+
+    Los frames propios se ignoran al leer, igual que el bus no los devuelve
+    al emisor; ``topics`` filtra igual que la suscripción del bus.
+    """
+
+    def __init__(self, transport: SharedMemoryTransport, topics: Optional[Sequence[str]] = None):
+        self.transport = transport
+        self.origin = int.from_bytes(os.urandom(4), "little") or 1
+        self.cursor = transport.ring.write_seq
+        self.lost = 0
+        self._latest_seq = [0] * len(LATEST_TOPICS)
+        self._local_lock = threading.Lock()
+        self.set_topics(topics)
+
+    def set_topics(self, topics: Optional[Sequence[str]]) -> None:
+        """Cambia los tópicos recibidos (None = todos)."""
+        self.topics = None if topics is None else frozenset(topics)
+        self._latest_indices = [
+            i for i, topic in enumerate(LATEST_TOPICS)
+            if self.topics is None or topic in self.topics
+        ]
+
+    def send(self, event_type: str, frame) -> None:
+        """Publica un frame: tópicos continuos al slot, el resto al anillo."""
+        transport = self.transport
+        with self._local_lock, transport.cond:
+            if event_type in LATEST_TOPICS:
+                transport.latest.write(LATEST_TOPICS.index(event_type), self.origin, frame)
+            else:
+                transport.ring.write(self.origin, frame)
+            transport.cond.notify_all()
+
+    def _pending(self) -> bool:
+        """Hay escrituras que ``poll`` todavía no vio (incluidas las propias)."""
+        transport = self.transport
+        if transport.ring.write_seq != self.cursor:
+            return True
+        return any(transport.latest.seq(i) != self._latest_seq[i] for i in self._latest_indices)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Duerme hasta la próxima escritura de cualquier proceso (o ``timeout``).
+
+        Las escrituras se hacen con la condición tomada, así que una que llegue
+        entre ``poll`` y ``wait`` no se pierde.
+
+        Returns:
+            True si hay algo nuevo para ``poll``
+        """
+        cond = self.transport.cond
+        with cond:
+            if self._pending():
+                return True
+            return cond.wait(timeout)
+
+    def poll(self) -> List[bytes]:
+        """Frames nuevos de otros clientes: primero los discretos y luego los últimos valores."""
+        transport = self.transport
+        self.cursor, lost, messages = transport.ring.read(self.cursor)
+        self.lost += lost
+        frames = []
+        for origin, frame in messages:
+            if origin == self.origin:
+                continue
+            if self.topics is not None and \
+                    peek_event_type(frame[HEADER.size - 1], memoryview(frame)[HEADER.size:]) not in self.topics:
+                continue
+            frames.append(frame)
+
+        for i in self._latest_indices:
+            value = transport.latest.read(i, self._latest_seq[i])
+            if value is None:
+                continue
+            self._latest_seq[i], origin, frame = value
+            if origin != self.origin:
+                frames.append(frame)
+        return frames
+
+
+# Transporte heredado por los procesos lanzados desde src/main.py
+_local_transport: Optional[SharedMemoryTransport] = None
+
+
+def set_local_transport(transport: Optional[SharedMemoryTransport]) -> None:
+    global _local_transport
+    _local_transport = transport
+
+
+def local_transport() -> Optional[SharedMemoryTransport]:
+    """Transporte compartido del proceso actual, o None si no hay."""
+    return _local_transport
+
+
+def run_attached(target, spec) -> None:
+    """Punto de entrada de los procesos hijos: se adjunta al segmento y ejecuta ``target``."""
+    transport = SharedMemoryTransport.attach(spec)
+    set_local_transport(transport)
+    try:
+        target()
+    finally:
+        set_local_transport(None)
+        transport.close()
@@ -7,5 +7,13 @@ PORT = 65432        # Puerto para la comunicación
 # Configuración de la cámara
 CAMERA_INDEX = 0
 
+HAND_ROI = True  # Procesar sólo un recorte alrededor de las manos seguidas
+INFERENCE_CPU_BUDGET = 0.5  # Fracción de un núcleo para la inferencia (el renderer usa el resto)
+
 # Configuración de gestos
 GESTURE_COOLDOWN = 0.5  # Segundos de espera entre gestos
+GESTURE_VOTE_WINDOW = 0.15  # Segundos de historia que votan el gesto estable
+GESTURE_ENTER_VOTES = 0.6   # Fracción de frames para activar un gesto
+GESTURE_EXIT_VOTES = 0.3    # Fracción bajo la cual se suelta (histéresis)
+CLICK_THRESHOLD = 0.05          # Distancia pulgar-índice para entrar en clic
+CLICK_RELEASE_THRESHOLD = 0.065  # Distancia para salir del clic (histéresis)
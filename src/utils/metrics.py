@@ -0,0 +1,95 @@
+# src/utils/metrics.py
+"""
+Métricas de latencia por etapa para los pipelines de tiempo real.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+
+class LatencyRecorder:
+    """
+    Registra latencias por etapa en ventanas circulares preasignadas.
+
+    Cada etapa (captura, inferencia, mapeo, display...) guarda sus últimas
+    ``window`` muestras; ``report`` calcula percentiles sobre esa ventana.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: Dict[str, np.ndarray] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Registra una muestra de latencia (en segundos) para una etapa."""
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = np.zeros(self.window, dtype=np.float64)
+                self._counts[stage] = 0
+            samples[self._counts[stage] % self.window] = seconds
+            self._counts[stage] += 1
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Context manager que mide la duración del bloque."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    @property
+    def stages(self) -> List[str]:
+        return list(self._samples)
+
+    def samples(self, stage: str) -> np.ndarray:
+        """Retorna una copia de las muestras válidas de una etapa."""
+        with self._lock:
+            n = min(self._counts.get(stage, 0), self.window)
+            if n == 0:
+                return np.empty(0, dtype=np.float64)
+            return self._samples[stage][:n].copy()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Resumen por etapa en milisegundos.
+
+        Returns:
+            Diccionario ``{etapa: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}``
+        """
+        summary = {}
+        for stage in self.stages:
+            data = self.samples(stage) * 1000.0
+            if data.size == 0:
+                continue
+            p50, p95, p99 = np.percentile(data, [50, 95, 99])
+            summary[stage] = {
+                'count': self._counts[stage],
+                'mean_ms': float(data.mean()),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'max_ms': float(data.max()),
+            }
+        return summary
+
+    def format_report(self) -> str:
+        """Retorna el reporte como tabla de texto."""
+        lines = [f"{'etapa':<14}{'n':>8}{'media':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+        for stage, s in self.report().items():
+            lines.append(
+                f"{stage:<14}{s['count']:>8}{s['mean_ms']:>9.2f}{s['p50_ms']:>9.2f}"
+                f"{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
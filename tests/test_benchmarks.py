@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+from src.benchmarks import results
+from src.benchmarks.pipeline_latency import run_benchmark
+
+
+def test_pipeline_benchmark_reports_all_stages():
+    """El benchmark recorre el pipeline completo sin cámara ni ventana."""
+    report = run_benchmark(frames=60, fps=0)
+
+    assert report['events_sent'] > 0
+    assert report['events_received'] == report['events_sent']
+    for stage in ('source', 'tracking', 'mapping', 'controller', 'transport', 'reaction', 'total'):
+        assert report['stages'][stage]['p99_ms'] >= report['stages'][stage]['p50_ms']
+
+
+def test_headless_renderer_benchmark_runs_offscreen():
+    """El renderer corre sin ventana con el rasterizador por software (un ShowBase por proceso)."""
+    out = subprocess.run(
+        [sys.executable, "-m", "src.benchmarks.hologram_headless", "--frames", "20", "--no-save"],
+        capture_output=True, text=True, timeout=120
+    )
+    assert out.returncode == 0, out.stderr
+    assert "event_to_frame" in out.stdout
+
+
+def test_results_compare_against_previous_commit(tmp_path, monkeypatch):
+    """Las regresiones se marcan al comparar con la ejecución de otro commit."""
+    monkeypatch.setattr(results, 'current_commit', lambda: 'aaaaaaa')
+    results.save_result("demo", {'total': {'p95_ms': 1.0}, 'frames_per_second': 100}, tmp_path)
+
+    monkeypatch.setattr(results, 'current_commit', lambda: 'bbbbbbb')
+    text = results.compare_with_previous(
+        "demo", {'total': {'p95_ms': 2.0}, 'frames_per_second': 100}, tmp_path)
+
+    assert "aaaaaaa" in text
+    assert "⚠️ total.p95_ms" in text
+    assert "⚠️ frames_per_second" not in text
+    assert len(results.load_history("demo", tmp_path)) == 1
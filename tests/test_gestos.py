@@ -0,0 +1,529 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.gestos.components.gesture_mapper import GESTURE_CODES, GestureMapper
+from src.gestos.components.inference_worker import InferenceWorker
+from src.gestos.event_system import GestureEvent, GestureEventBus
+from src.gestos.offline.batch_engine import BatchGestureEngine
+from src.gestos.offline.dataset import LandmarkDataset, synthetic_dataset
+from src.gestos.offline.recording import LandmarkRecorder, Recording, ReplayHandTracker, ReplaySource
+from src.gestos.utils.camera_utils import FrameRingBuffer, ThreadedCamera
+
+
+class FakeCapture:
+    """Fuente simulada con la interfaz de cv2.VideoCapture."""
+
+    def __init__(self, n_frames=50, shape=(48, 64, 3), delay=0.0):
+        self.n_frames = n_frames
+        self.shape = shape
+        self.delay = delay
+        self.count = 0
+        self.opened = True
+
+    def read(self, image=None):
+        if self.count >= self.n_frames:
+            self.opened = False
+            return False, None
+        if self.delay:
+            time.sleep(self.delay)
+        frame = np.full(self.shape, self.count % 256, dtype=np.uint8)
+        self.count += 1
+        if image is not None and image.shape == frame.shape:
+            image[...] = frame
+            return True, image
+        return True, frame
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        self.opened = False
+
+
+def test_ring_buffer_serves_newest_and_counts_drops():
+    """El buffer entrega siempre el último frame y cuenta los no leídos como descartados."""
+    buffer = FrameRingBuffer(capacity=3)
+    buffer.allocate((2, 2, 3))
+    for value in range(5):
+        buffer.write_slot()[...] = value
+        buffer.publish()
+
+    frame_id, frame, _ = buffer.read_latest()
+    assert frame_id == 4
+    assert np.all(frame == 4)
+    assert buffer.dropped == 4
+
+    # Leer de nuevo no genera descartes adicionales
+    buffer.write_slot()[...] = 5
+    buffer.publish()
+    assert buffer.dropped == 4
+
+
+def test_ring_buffer_reuses_output_array():
+    """read_latest copia en el array destino cuando la forma coincide."""
+    buffer = FrameRingBuffer(capacity=2)
+    buffer.allocate((2, 2, 3))
+    buffer.write_slot()[...] = 7
+    buffer.publish()
+
+    out = np.zeros((2, 2, 3), dtype=np.uint8)
+    _, frame, _ = buffer.read_latest(out=out)
+    assert frame is out
+    assert np.all(out == 7)
+
+
+def test_ring_buffer_requires_two_slots():
+    with pytest.raises(ValueError):
+        FrameRingBuffer(capacity=1)
+
+
+def test_threaded_camera_captures_in_background():
+    """La captura corre en su propio hilo y reporta estadísticas."""
+    camera = ThreadedCamera(capture=FakeCapture(n_frames=20, delay=0.001)).start()
+    camera.thread.join(timeout=2.0)
+
+    frame_id, frame = camera.read_latest()
+    stats = camera.get_stats()
+    camera.release()
+
+    assert frame_id == 19
+    assert np.all(frame == 19)
+    assert stats['captured'] == 20
+    assert stats['dropped'] == 19
+    assert stats['fps'] > 0
+
+
+def test_inference_worker_returns_tagged_results():
+    """Los resultados llegan por la cola etiquetados con el id del frame."""
+    worker = InferenceWorker(lambda frame: (frame, frame * 2), backpressure="queue").start()
+    for frame_id in range(3):
+        assert worker.submit(frame_id, np.array([frame_id]))
+
+    results = [worker.get_result(timeout=1.0) for _ in range(3)]
+    worker.stop()
+
+    assert [r.frame_id for r in results] == [0, 1, 2]
+    assert [int(r.results[0]) for r in results] == [0, 2, 4]
+    report = worker.get_stats()['latency']
+    assert report['inference']['count'] == 3
+
+
+def test_inference_worker_latest_only_drops_stale_frames():
+    """En modo latest sólo se procesa el frame pendiente más reciente."""
+    worker = InferenceWorker(lambda frame: (frame, None), backpressure="latest")
+    for frame_id in range(5):
+        worker.submit(frame_id, frame_id)
+    worker.start()
+
+    result = worker.get_result(timeout=1.0)
+    worker.stop()
+
+    assert result.frame_id == 4
+    assert worker.dropped == 4
+
+
+def test_inference_worker_rejects_unknown_backpressure():
+    with pytest.raises(ValueError):
+        InferenceWorker(lambda frame: (frame, None), backpressure="block")
+
+
+def test_dataset_round_trip(tmp_path):
+    """Un dataset guardado se abre con memoria mapeada y conserva sus datos."""
+    dataset = synthetic_dataset(500, seed=1)
+    loaded = LandmarkDataset.load(dataset.save(tmp_path / "sesion"))
+
+    assert isinstance(loaded.landmarks, np.memmap)
+    assert np.array_equal(loaded.landmarks, dataset.landmarks)
+    assert np.array_equal(loaded.labels, dataset.labels)
+
+
+def test_batch_engine_confusion_on_clean_dataset():
+    """Sin ruido apreciable todas las etiquetas sintéticas se clasifican bien."""
+    report = BatchGestureEngine().evaluate(synthetic_dataset(5000, noise=0.001, seed=2))
+
+    assert report['frames'] == 5000
+    assert report['accuracy'] == 1.0
+    assert report['confusion'].sum() == 5000
+    assert report['frames_per_second'] > 0
+
+
+def test_batch_engine_events_respect_cooldown():
+    """Un gesto sostenido sólo se repite una vez por cooldown."""
+    engine = BatchGestureEngine(cooldown=0.5)
+    codes = np.array([1] * 20 + [0] * 3 + [1] * 3 + [2] * 3, dtype=np.int8)
+    timestamps = np.arange(len(codes)) / 30.0
+
+    events = engine.detect_events(codes, timestamps)
+    # Clic en t=0 y t=0.5; el clic tras el hueco cae en cooldown; luego POINTING
+    assert events.tolist() == [0, 15, 26]
+
+
+def _record_session(path, dataset, frame_size=None):
+    """Graba un dataset como si viniera de HandTracker."""
+    with LandmarkRecorder(path, max_hands=2, frame_size=frame_size) as recorder:
+        for i, hand in enumerate(dataset.landmarks):
+            results = SimpleNamespace(multi_hand_landmarks=[hand], multi_handedness=['Right'])
+            frame = np.full((48, 64, 3), i % 256, dtype=np.uint8)
+            recorder.record(results, frame, gesture=int(dataset.labels[i]), timestamp=100.0 + i / 30)
+
+
+def test_recording_replay_is_zero_copy(tmp_path):
+    """La grabación se reproduce como vistas sobre el archivo mapeado."""
+    dataset = synthetic_dataset(300, seed=3)
+    path = tmp_path / "sesion.hglm"
+    _record_session(path, dataset, frame_size=(32, 24))
+
+    recording = Recording(path)
+    assert len(recording) == 300
+    assert recording.duration == pytest.approx(299 / 30)
+
+    replay_set = recording.to_dataset()
+    assert np.shares_memory(replay_set.landmarks, recording.records)
+    assert np.allclose(replay_set.landmarks, dataset.landmarks)
+    assert np.array_equal(replay_set.labels, dataset.labels)
+
+    source = ReplaySource(recording)
+    ok, frame = source.read()
+    assert ok and frame.shape == (24, 32, 3)
+    assert np.shares_memory(frame, recording.frames)
+    assert source.hands()[0].handedness == 'Right'
+
+
+def test_recorder_appends_to_existing_file(tmp_path):
+    """Abrir una grabación existente agrega registros al final."""
+    path = tmp_path / "sesion.hglm"
+    dataset = synthetic_dataset(10, seed=4)
+    _record_session(path, dataset)
+    _record_session(path, dataset)
+    assert len(Recording(path)) == 20
+
+    with pytest.raises(ValueError):
+        LandmarkRecorder(path, max_hands=1)
+
+
+def test_recorder_ignores_records_after_close(tmp_path):
+    """Cerrar desde la UI mientras el hilo de inferencia graba no rompe ese hilo."""
+    recorder = LandmarkRecorder(tmp_path / "sesion.hglm", max_hands=1, frame_size=(32, 24))
+    results = SimpleNamespace(multi_hand_landmarks=[synthetic_dataset(1).landmarks[0]], multi_handedness=None)
+    recorder.record(results, np.zeros((48, 64, 3), dtype=np.uint8))
+    recorder.close()
+    recorder.record(results, np.zeros((48, 64, 3), dtype=np.uint8))
+    recorder.flush()
+    assert recorder.records_written == 1
+    assert len(Recording(tmp_path / "sesion.hglm")) == 1
+
+
+def test_replay_tracker_feeds_mapper(tmp_path):
+    """ReplayHandTracker sustituye a MediaPipe con los landmarks grabados."""
+    dataset = synthetic_dataset(60, noise=0.001, seed=5)
+    path = tmp_path / "sesion.hglm"
+    _record_session(path, dataset)
+
+    tracker = ReplayHandTracker(path)
+    source = ReplaySource(path)
+    mapper = GestureMapper()
+    codes = []
+    while True:
+        ok, frame = source.read()
+        if not ok:
+            break
+        _, results = tracker.process_frame(frame)
+        codes.append(GESTURE_CODES.get(mapper.detect_gesture(results.multi_hand_landmarks[0]), 0))
+    assert codes == dataset.labels.tolist()
+
+
+def test_event_bus_async_emit_does_not_wait_for_handlers():
+    """En modo async emit retorna de inmediato y cada handler queda medido."""
+    bus = GestureEventBus(dispatch="async")
+    received = []
+
+    def slow_handler(data):
+        time.sleep(0.05)
+        received.append(data['angle'])
+
+    bus.subscribe(GestureEvent.ROTATION, slow_handler)
+    bus.subscribe(GestureEvent.ROTATION, lambda data: bus.subscribe(GestureEvent.FIST, print))
+
+    start = time.perf_counter()
+    for angle in range(3):
+        bus.emit(GestureEvent.ROTATION, {'angle': angle})
+    assert time.perf_counter() - start < 0.05
+    assert bus.flush(timeout=2.0)
+    bus.shutdown()
+
+    assert received == [0, 1, 2]
+    timings = bus.handler_timings()
+    slowest = next(iter(timings))
+    assert slowest == "rotation:test_event_bus_async_emit_does_not_wait_for_handlers.slow_handler"
+    assert timings[slowest]['count'] == 3
+    assert timings[slowest]['p50_ms'] >= 45
+
+
+def test_event_bus_runs_inline_after_shutdown():
+    """Tras shutdown no quedan eventos encolados sin worker: flush no espera su timeout."""
+    bus = GestureEventBus(dispatch="async")
+    received = []
+    bus.subscribe(GestureEvent.FIST, lambda data: received.append(data['i']))
+    bus.shutdown()
+
+    bus.emit(GestureEvent.FIST, {'i': 1})
+    assert received == [1]
+    start = time.perf_counter()
+    assert bus.flush(timeout=1.0)
+    assert time.perf_counter() - start < 0.1
+
+
+def test_one_euro_filter_removes_jitter_without_lagging_fast_motion():
+    """En reposo filtra el ruido; en un barrido rápido sigue la mano mejor que el factor fijo."""
+    from src.gestos.components.filters import make_filter
+
+    rng = np.random.default_rng(0)
+    still = 0.5 + rng.normal(0, 0.003, size=(60, 21, 3)).astype(np.float32)
+    one_euro = make_filter("cursor")
+    out = np.stack([one_euro(frame, i / 30) for i, frame in enumerate(still)])
+    assert np.diff(out[20:], axis=0).std() < np.diff(still[20:], axis=0).std() / 2
+
+    one_euro, legacy = make_filter("cursor"), make_filter("exponential", smoothening=7)
+    for i in range(30):
+        hand = np.full((21, 3), 0.1 + 0.03 * i, dtype=np.float32)
+        fast, slow = one_euro(hand, i / 30), legacy(hand, i / 30)
+    assert abs(fast - hand).max() < abs(slow - hand).max() / 3
+
+
+def test_kalman_filter_tracks_constant_velocity():
+    """Con velocidad constante el Kalman converge sin retardo y estima la velocidad."""
+    from src.gestos.components.filters import make_filter
+
+    kalman = make_filter("rotation")
+    for i in range(60):
+        out = kalman(np.full((2, 21, 3), 0.01 * i, dtype=np.float32), i / 30)
+    assert np.allclose(out, 0.59, atol=1e-3)
+    assert np.allclose(kalman.velocity, 0.3, atol=0.02)
+
+
+def test_motion_predictor_extrapolates_lines_and_wraps_angles():
+    """Movimiento recto: predicción exacta; jitter sin dirección: casi no extrapola."""
+    from src.gestos.components.prediction import MotionPredictor
+
+    predictor = MotionPredictor(horizon=0.1)
+    for i in range(5):
+        out = predictor(np.full((21, 3), 0.3 * i / 30, dtype=np.float32), i / 30)
+    assert np.allclose(out, 0.04 + 0.03, atol=1e-6)
+    assert np.allclose(predictor.confidence, 1.0)
+
+    rng = np.random.default_rng(0)
+    for i in range(5, 10):
+        out = predictor(0.5 + rng.normal(0, 0.003, size=(21, 3)), i / 30)
+    assert predictor.confidence.mean() < 0.6
+
+    angle = MotionPredictor(horizon=0.1, period=360.0)
+    for i, value in enumerate([350.0, 355.0, 0.0, 5.0]):
+        predicted = angle(value, i / 30)
+    assert predicted == pytest.approx(20.0)
+
+
+def test_temporal_recognizer_detects_swipe_and_rotation():
+    """Un swipe a la derecha dispara una vez; un giro de 60° se acumula en ROTATION."""
+    from src.benchmarks.temporal_gestures import _pose, hand_template
+    from src.gestos.components.temporal import TemporalGestureRecognizer
+    from src.gestos.event_system import GestureEvent
+
+    template = hand_template()
+    recognizer = TemporalGestureRecognizer(max_hands=1)
+    events = []
+    t = 0.0
+    for x in [0.3] * 10 + list(np.linspace(0.3, 0.7, 8)) + [0.7] * 10:
+        events += recognizer.update(_pose(template, np.array([x, 0.5]), 0.0), t)
+        t += 1 / 30
+    assert [e for e, _ in events] == [GestureEvent.SWIPE_RIGHT]
+    assert events[0][1]['dx'] > 0.15
+
+    events = []
+    for roll in list(np.linspace(0.0, 60.0, 15)) + [60.0] * 10:
+        events += recognizer.update(_pose(template, np.array([0.7, 0.5]), roll), t)
+        t += 1 / 30
+    assert {e for e, _ in events} == {GestureEvent.ROTATION}
+    assert sum(d['delta'] for _, d in events) == pytest.approx(60.0, abs=1.0)
+    assert events[-1][1]['angle'] == pytest.approx(60.0, abs=1.0)
+    assert recognizer.history(0).shape == (32, 21, 3)
+
+
+def test_temporal_recognizer_ignores_still_hands_and_hands_leaving():
+    """Una mano quieta no dispara nada, ni cuando otra mano sale y cambia el orden."""
+    from src.benchmarks.temporal_gestures import _pose, hand_template
+    from src.gestos.components.temporal import TemporalGestureRecognizer
+
+    template = hand_template()
+    left, right = _pose(template, np.array([0.2, 0.5]), 0.0), _pose(template, np.array([0.8, 0.5]), 0.0)
+    for slots in (None, [0, 1]):
+        recognizer = TemporalGestureRecognizer(max_hands=2)
+        events = []
+        for i in range(20):
+            events += recognizer.update(left, i / 30)
+        # Entra la derecha y luego se va la izquierda: la derecha pasa al índice 0
+        for i in range(20, 40):
+            events += recognizer.update(np.stack([left, right]), i / 30, slots=slots)
+        for i in range(40, 60):
+            events += recognizer.update(right[None], i / 30, slots=None if slots is None else [1])
+        assert events == []
+
+
+def test_temporal_recognizer_shares_heading_between_hands():
+    """Dos manos que giran suman sobre un único heading y se informan por su id estable."""
+    from src.benchmarks.temporal_gestures import _pose, hand_template
+    from src.gestos.components.temporal import TemporalGestureRecognizer
+
+    template = hand_template()
+    recognizer = TemporalGestureRecognizer(max_hands=2)
+    events = []
+    t = 0.0
+    rolls = list(np.linspace(0.0, 60.0, 15)) + [60.0] * 10
+    for slot, x in ((0, 0.3), (1, 0.7)):
+        for roll in [0.0] * 10 + rolls:
+            events += recognizer.update(_pose(template, np.array([x, 0.5]), roll)[None], t,
+                                        slots=[slot], ids=[slot + 10])
+            t += 1 / 30
+    assert {d['hand'] for _, d in events} == {10, 11}
+    assert events[-1][1]['angle'] == pytest.approx(120.0, abs=2.0)
+    angle = 0.0
+    for _, data in events:
+        angle = (angle + data['delta']) % 360.0
+        assert data['angle'] == pytest.approx(angle)
+
+
+def test_gesture_state_machine_ignores_flicker_at_any_frame_rate():
+    """Un frame suelto no dispara; el gesto sostenido dispara una vez, a 30 y a 120 FPS."""
+    from src.gestos.components.gesture_state import GestureStateMachine
+
+    for fps in (30, 120):
+        machine = GestureStateMachine(window=0.15, cooldown=0.5)
+        n = int(fps)
+        raw = [None] * n
+        raw[n // 4] = "CLICK"                    # clic espurio de un frame
+        raw[n // 2:] = ["FIST"] * (n - n // 2)   # puño sostenido medio segundo
+        for i in range(n // 2 + n // 4, n // 2 + n // 4 + 1):
+            raw[i] = "OPEN_HAND"                 # parpadeo dentro del puño
+        fired = [(i, g) for i, g in enumerate(raw) if machine.update(g, i / fps)]
+        assert [g for _, g in fired] == ["FIST"]
+        assert (fired[0][0] - n // 2) / fps < 0.1
+        assert machine.state == "FIST"
+
+
+def test_batch_engine_debounce_matches_state_machine():
+    """Con ``debounce`` el motor offline descarta los parpadeos como en vivo."""
+    engine = BatchGestureEngine(cooldown=0.5, debounce=True)
+    codes = np.array([1] * 20 + [0] * 3 + [1] * 3 + [2] * 3 + [0, 3, 0, 0], dtype=np.int8)
+    events = engine.detect_events(codes, np.arange(len(codes)) / 30.0)
+    assert codes[events].tolist() == [1, 2]
+
+
+def test_hand_identity_survives_order_swaps():
+    """El id sigue a la mano aunque MediaPipe cambie el orden de las detecciones."""
+    from src.gestos.components.multi_hand import HandIdentityTracker
+
+    tracker = HandIdentityTracker(max_hands=2)
+    left = np.zeros((21, 3), dtype=np.float32) + (0.3, 0.5, 0.0)
+    right = np.zeros((21, 3), dtype=np.float32) + (0.7, 0.5, 0.0)
+    first, _, new = tracker.update(np.stack([left, right]), ['Left', 'Right'], 0.0)
+    assert new.all()
+    ids, _, new = tracker.update(np.stack([right + 0.01, left - 0.01]), ['Right', 'Left'], 1 / 30)
+    assert ids.tolist() == first[::-1].tolist() and not new.any()
+    # Una mano que falta más de max_missing pierde su id
+    for t in (0.2, 0.4):
+        tracker.update(np.stack([left]), None, t)
+    ids, _, new = tracker.update(np.stack([left, right]), None, 0.5)
+    assert ids[0] == first[0] and new.tolist() == [False, True]
+
+
+def test_two_hand_pinch_zoom_scales_with_distance():
+    """Dos manos en pinza: separarlas 1.5x emite ZOOM con escala 1.5."""
+    from src.gestos.components.multi_hand import MultiHandGesturePipeline
+    from src.gestos.event_system import GestureEvent
+    from src.gestos.offline.dataset import canonical_poses
+
+    click = canonical_poses()[GESTURE_CODES['CLICK']]
+    pipeline = MultiHandGesturePipeline(max_hands=2)
+    events = []
+    for i, offset in enumerate([0.2] * 8 + [0.25, 0.3]):
+        hands = np.stack([click - (offset, 0, 0), click + (offset, 0, 0)])
+        results, frame_events = pipeline.update(hands, ['Left', 'Right'], i / 30)
+        events += frame_events
+    assert [r.gesture for r in results] == ["CLICK", "CLICK"]
+    assert [e for e, _ in events] == [GestureEvent.ZOOM, GestureEvent.ZOOM]
+    assert events[-1][1]['scale'] == pytest.approx(1.5, rel=1e-3)
+
+
+def test_roi_tracker_crops_around_hands_and_falls_back():
+    """Tras detectar en el frame completo, infiere sobre un recorte y reporta en coordenadas del frame."""
+    from src.benchmarks.roi_tracking import SimulatedDetector
+    from src.gestos.components.roi import RoiTracker
+    from src.gestos.offline.dataset import canonical_poses
+
+    detector = SimulatedDetector(frame_size=(640, 480))
+    roi = RoiTracker(detector, max_hands=1)
+    detector.roi = roi
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    hand = canonical_poses()[GESTURE_CODES['OPEN_HAND']] * 0.2 + (0.3, 0.3, 0.0)
+    shapes = []
+    # Los recortes van a su propia inferencia (Hands en modo imagen estática)
+    roi.infer = lambda image: shapes.append(('full', image.shape[:2])) or detector(image)
+    roi.crop_infer = lambda image: shapes.append(('crop', image.shape[:2])) or detector(image)
+
+    for offset in (0.0, 0.01, 0.02, 0.5):
+        detector.hands = (hand + (offset, 0.0, 0.0))[None]
+        results = roi.process(frame)
+        np.testing.assert_allclose(results.multi_hand_landmarks[0], detector.hands[0], atol=1e-5)
+    # Completo, dos recortes, y un salto fuera del recorte que se repite completo
+    assert [kind for kind, _ in shapes] == ['full', 'crop', 'crop', 'crop', 'full']
+    assert shapes[0][1] == (480, 640) and max(shapes[1][1]) < 480 and shapes[-1][1] == (480, 640)
+    assert roi.stats['hits'] == 2 and roi.stats['fallbacks'] == 1 and roi.stats['full'] == 2
+    assert roi.hit_rate == 0.5
+
+
+def test_inference_scheduler_adapts_rate_to_activity():
+    """Tasa completa con la mano en movimiento, menor quieta, sondeo sin manos y tope de CPU."""
+    from src.gestos.components.scheduler import InferenceScheduler
+
+    def runs(scheduler, seconds, hand_at, start=0.0, fps=30):
+        count = 0
+        for t in start + np.arange(int(seconds * fps)) / fps:
+            if scheduler.should_run(t):
+                count += 1
+                hand = hand_at(t)
+                scheduler.observe(None if hand is None else hand[None], t, 0.01)
+        return count
+
+    base = np.zeros((21, 3), dtype=np.float32) + (0.3, 0.5, 0.0)
+    moving = lambda t: base + (0.3 * t, 0.0, 0.0)
+    scheduler = InferenceScheduler(cpu_budget=1.0)
+    assert runs(scheduler, 2.0, moving) == 60 and scheduler.mode == "active"
+    # Entre inferencias la mano sigue su trayectoria
+    np.testing.assert_allclose(scheduler.interpolate(2.0)[0], moving(2.0), atol=1e-4)
+    assert runs(scheduler, 2.0, lambda t: base, start=2.0) < 40 and scheduler.mode == "idle"
+    assert runs(scheduler, 4.0, lambda t: None, start=4.0) < 30 and scheduler.mode == "probe"
+    assert scheduler.interpolate(8.0) is None
+
+    # Con 10 ms por inferencia y un 10 % de CPU: como mucho 10 por segundo
+    limited = InferenceScheduler(cpu_budget=0.1)
+    assert runs(limited, 2.0, moving) <= 21
+
+
+def test_inference_scheduler_restarts_prediction_when_hand_ids_change():
+    """Dos manos que cambian de posición (o de id) no se interpolan como una que salta."""
+    from src.gestos.components.scheduler import InferenceScheduler
+
+    left = np.zeros((21, 3), dtype=np.float32) + (0.2, 0.5, 0.0)
+    right = np.zeros((21, 3), dtype=np.float32) + (0.8, 0.5, 0.0)
+    scheduler = InferenceScheduler()
+    scheduler.observe(np.stack([left, right]), 0.0, ids=[0, 1])
+    scheduler.observe(np.stack([right, left]), 1 / 30, ids=[1, 0])
+    np.testing.assert_allclose(scheduler.interpolate(2 / 30), np.stack([right, left]))
+
+    # Sin ids la misma secuencia extrapola el salto entre manos
+    unordered = InferenceScheduler()
+    unordered.observe(np.stack([left, right]), 0.0)
+    unordered.observe(np.stack([right, left]), 1 / 30)
+    assert not np.allclose(unordered.interpolate(2 / 30), np.stack([right, left]))
@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 from types import SimpleNamespace
 from src.gestos.components.gesture_mapper import GestureMapper
+from src.gestos.components.landmarks import HandLandmarks, fingers_up
 
 @pytest.fixture
 def gesture_mapper():
@@ -53,3 +55,50 @@ def test_detect_click(gesture_mapper):
     mock_hand = create_mock_landmarks(states)
     gesture = gesture_mapper.detect_gesture(mock_hand)
     assert gesture == "CLICK"
+
+def test_hand_landmarks_from_mediapipe():
+    """El contenedor copia los landmarks en un array (21, 3) float32."""
+    mock_hand = create_mock_landmarks({8: 'up'})
+    hand = HandLandmarks.from_mediapipe(mock_hand)
+    assert hand.array.shape == (21, 3)
+    assert hand.array.dtype == np.float32
+    assert hand.landmark[8].y == pytest.approx(0.1)
+    assert fingers_up(hand.array).tolist() == [False, True, False, False, False]
+
+def test_detect_gesture_accepts_arrays(gesture_mapper):
+    """detect_gesture acepta HandLandmarks y arrays además de objetos MediaPipe."""
+    hand = HandLandmarks.from_mediapipe(create_mock_landmarks({8: 'up'}))
+    assert gesture_mapper.detect_gesture(hand) == "POINTING"
+    assert gesture_mapper.detect_gesture(hand.array) == "POINTING"
+
+def test_detect_batch_matches_single_frame(gesture_mapper):
+    """La clasificación por lotes coincide con la de cada mano por separado."""
+    states = [
+        {4: 'left', 8: 'up', 12: 'up', 16: 'up', 20: 'up'},
+        {4: 'right'},
+        {8: 'up'},
+        {'click': True},
+    ]
+    hands = [create_mock_landmarks(s) for s in states]
+    batch = np.stack([HandLandmarks.from_mediapipe(h).array for h in hands] * 250)
+
+    codes = gesture_mapper.detect_batch(batch)
+    assert codes.shape == (1000,)
+    expected = [gesture_mapper.detect_gesture(h) for h in hands] * 250
+    assert gesture_mapper.gesture_names(codes) == expected
+
+def test_click_hysteresis_keeps_click_near_threshold():
+    """Con el clic activo, una distancia entre ambos umbrales no lo suelta."""
+    mapper = GestureMapper(click_threshold=0.05, click_release=0.065)
+    hand = create_mock_landmarks({8: 'up'})
+    hand.landmark[4].x, hand.landmark[4].y = 0.5, 0.5
+    hand.landmark[3].x = 0.4  # Pulgar bajado: sin clic queda POINTING
+
+    def at(distance):
+        hand.landmark[8].x, hand.landmark[8].y = 0.5 + distance, 0.5
+        return mapper.detect_gesture(hand)
+
+    assert at(0.058) == "POINTING"
+    assert at(0.03) == "CLICK"
+    assert at(0.058) == "CLICK"
+    assert at(0.07) == "POINTING"
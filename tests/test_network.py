@@ -0,0 +1,378 @@
+import functools
+import multiprocessing
+import socket
+import threading
+import time
+
+import pytest
+
+from src.network.client import EventClient
+from src.network.event_bus import EventBus
+from src.network.protocol import (
+    CODEC_BINARY, CODEC_JSON, HEADER, FrameDecoder, ProtocolError, encode_event, peek_event_type
+)
+from src.network.shm_transport import (
+    RING_SLOTS, SharedMemoryTransport, run_attached, set_local_transport
+)
+
+
+def test_binary_codec_roundtrip():
+    """Los eventos con esquema binario ocupan pocos bytes y se decodifican igual."""
+    event = {"source": "Gestos", "type": "rotation", "data": {"angle": 12.5, "speed": -0.25}}
+    frame = encode_event(event)
+
+    decoder = FrameDecoder()
+    decoder.feed(frame)
+    (codec, body), = list(decoder.frames())
+
+    assert codec == CODEC_BINARY
+    assert len(frame) < 24
+    assert peek_event_type(codec, body) == "rotation"
+    decoder.feed(frame)
+    assert list(decoder.events()) == [event]
+
+
+def test_json_fallback_for_unknown_fields():
+    """Campos sin esquema binario (o el codec de depuración) viajan en JSON."""
+    event = {"source": "Gestos", "type": "rotation", "data": {"angle": 1.0, "frame_id": 7}}
+    decoder = FrameDecoder()
+    decoder.feed(encode_event(event))
+    decoder.feed(encode_event({"source": "G", "type": "cursor", "data": {"x": 1}}, CODEC_JSON))
+
+    codecs = [codec for codec, _ in decoder.frames()]
+    assert codecs == [CODEC_JSON, CODEC_JSON]
+
+    # Un campo faltante no se rellena con 0.0
+    partial = {"source": "Gestos", "type": "rotation", "data": {"angle": 3.0}}
+    decoder.feed(encode_event(partial))
+    assert list(decoder.events()) == [partial]
+
+
+def test_truncated_binary_frame_raises_protocol_error():
+    """Un frame binario corrupto es un ProtocolError, no un struct.error."""
+    frame = encode_event({"source": "G", "type": "cursor", "data": {"x": 0.5, "y": 0.5}})
+    body = frame[HEADER.size:-2]
+    decoder = FrameDecoder()
+    decoder.feed(HEADER.pack(len(body), CODEC_BINARY) + body)
+    with pytest.raises(ProtocolError):
+        list(decoder.events())
+
+    bad_source = bytes([2, 1, 0xff]) + bytes(8)
+    decoder.feed(HEADER.pack(len(bad_source), CODEC_BINARY) + bad_source)
+    with pytest.raises(ProtocolError):
+        list(decoder.events())
+
+
+def test_decoder_reassembles_split_and_coalesced_segments():
+    """Segmentos TCP partidos o agrupados no corrompen los mensajes."""
+    events = [{"source": "G", "type": "cursor", "data": {"x": float(i), "y": 0.5}} for i in range(50)]
+    events.append({"source": "G", "type": "gesture_detected", "data": {"gesture": "fist" * 300}})
+    stream = b"".join(encode_event(e) for e in events)
+
+    decoder = FrameDecoder(capacity=64)
+    received = []
+    for i in range(0, len(stream), 7):
+        decoder.feed(stream[i:i + 7])
+        received.extend(decoder.events())
+
+    assert received == events
+
+
+def test_decoder_rejects_oversized_frames():
+    decoder = FrameDecoder()
+    decoder.feed(b"\xff\xff\xff\xff\x00")
+    with pytest.raises(ProtocolError):
+        list(decoder.frames())
+
+
+def _start_bus(**kwargs):
+    bus = EventBus(port=0, **kwargs)
+    threading.Thread(target=bus.start, daemon=True).start()
+    bus.ready.wait(2.0)
+    return bus
+
+
+def _wait_clients(bus, n):
+    for _ in range(500):
+        if len(bus.clients) >= n:
+            return
+        threading.Event().wait(0.01)
+
+
+def test_event_bus_forwards_complete_frames():
+    """Una ráfaga de eventos atraviesa el bus sin pérdidas ni mensajes mezclados."""
+    bus = _start_bus()
+
+    received = []
+    done = threading.Event()
+    consumer = EventClient("Holograma", port=bus.port)
+    consumer.on_message_received = lambda e: (received.append(e), len(received) == 500 and done.set())
+    consumer.connect()
+    producer = EventClient("Gestos", codec="json", port=bus.port)
+    producer.connect()
+
+    _wait_clients(bus, 2)
+    for i in range(500):
+        producer.send_event("rotation", {"angle": float(i)})
+    assert done.wait(5.0)
+
+    assert [e["data"]["angle"] for e in received] == [float(i) for i in range(500)]
+    assert received[0]["source"] == "Gestos"
+    producer.close()
+    consumer.close()
+    bus.stop()
+
+
+def test_client_skips_malformed_frame_and_stays_connected():
+    """Un JSON corrupto entre dos frames válidos se descarta sin desconectar al receptor."""
+    bus = _start_bus()
+
+    received = []
+    done = threading.Event()
+    consumer = EventClient("Holograma", port=bus.port)
+    consumer.on_message_received = lambda e: (received.append(e), len(received) == 2 and done.set())
+    consumer.connect()
+    producer = socket.create_connection(("localhost", bus.port))
+
+    _wait_clients(bus, 2)
+    bad = b'{"type": "rotation", "data": {"angle": '
+    producer.sendall(
+        encode_event({"source": "G", "type": "rotation", "data": {"angle": 1.0}}, CODEC_JSON)
+        + HEADER.pack(len(bad), CODEC_JSON) + bad
+        + encode_event({"source": "G", "type": "rotation", "data": {"angle": 2.0}}, CODEC_JSON)
+    )
+    assert done.wait(5.0)
+
+    assert [e["data"]["angle"] for e in received] == [1.0, 2.0]
+    assert consumer.connected
+    producer.close()
+    consumer.close()
+    bus.stop()
+
+
+@pytest.mark.parametrize("policy", ["drop_oldest", "coalesce", "disconnect"])
+def test_slow_consumer_does_not_block_others(policy):
+    """Un cliente que no lee no frena al productor ni a los consumidores rápidos."""
+    bus = _start_bus(max_queue=8, policy=policy)
+
+    slow = socket.create_connection((bus.host, bus.port))
+    slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    received = []
+    done = threading.Event()
+    fast = EventClient("Holograma", port=bus.port)
+    fast.on_message_received = lambda e: (received.append(e), len(received) == 300 and done.set())
+    fast.connect()
+    producer = EventClient("Gestos", port=bus.port)
+    producer.connect()
+    _wait_clients(bus, 3)
+
+    payload = "x" * 50000
+    for i in range(300):
+        producer.send_event("gesture_detected", {"i": i, "payload": payload})
+    assert done.wait(10.0)
+    assert [e["data"]["i"] for e in received] == list(range(300))
+
+    stats = bus.get_stats()
+    if policy == "disconnect":
+        assert stats['disconnected'] == 1
+        assert len(stats['clients']) == 2
+    else:
+        slow_stats = stats['clients']["%s:%d" % slow.getsockname()]
+        assert slow_stats['queue_depth'] <= 8
+        assert slow_stats['dropped'] + slow_stats['coalesced'] > 0
+
+    slow.close()
+    producer.close()
+    fast.close()
+    bus.stop()
+
+
+def test_bus_routes_only_subscribed_topics():
+    """Cada cliente recibe sólo los tópicos a los que se suscribió."""
+    bus = _start_bus()
+    inboxes = {}
+    clients = []
+    for name, topics in (("Holograma", ["gesture_detected"]), ("UI", ["cursor"]), ("Log", None)):
+        inboxes[name] = []
+        client = EventClient(name, port=bus.port, topics=topics)
+        client.on_message_received = inboxes[name].append
+        client.connect()
+        clients.append(client)
+    producer = EventClient("Gestos", port=bus.port, topics=[])
+    producer.connect()
+    clients.append(producer)
+    _wait_clients(bus, 4)
+    # Esperar a que el bus procese las suscripciones
+    while len(bus._routes) < 2:
+        threading.Event().wait(0.01)
+
+    producer.send_event("cursor", {"x": 0.5, "y": 0.5})
+    producer.send_event("gesture_detected", {"gesture": "fist"})
+    producer.send_event("rotation", {"angle": 3.0})
+    for _ in range(500):
+        if len(inboxes["Log"]) == 3:
+            break
+        threading.Event().wait(0.01)
+    threading.Event().wait(0.05)
+
+    assert [e["type"] for e in inboxes["Holograma"]] == ["gesture_detected"]
+    assert [e["type"] for e in inboxes["UI"]] == ["cursor"]
+    assert [e["type"] for e in inboxes["Log"]] == ["cursor", "gesture_detected", "rotation"]
+    for client in clients:
+        client.close()
+    bus.stop()
+
+
+def test_shared_memory_ring_and_latest_slots():
+    """Discretos por el anillo (todos llegan) y continuos por slot (sólo el último)."""
+    transport = SharedMemoryTransport.create()
+    try:
+        producer = transport.endpoint()
+        hologram = transport.endpoint(["gesture_detected", "rotation"])
+        ui = transport.endpoint(["cursor"])
+
+        for angle in range(10):
+            producer.send("rotation", encode_event({"source": "G", "type": "rotation", "data": {"angle": angle}}))
+        for gesture in ("fist", "open_hand"):
+            producer.send("gesture_detected", encode_event(
+                {"source": "G", "type": "gesture_detected", "data": {"gesture": gesture}}))
+
+        decoder = FrameDecoder()
+        for frame in hologram.poll():
+            decoder.feed(frame)
+        events = list(decoder.events())
+        assert [e["data"].get("gesture") for e in events[:2]] == ["fist", "open_hand"]
+        assert [e["data"]["angle"] for e in events[2:]] == [9.0]
+        assert ui.poll() == []
+        assert producer.poll() == []  # Los mensajes propios no vuelven al emisor
+        assert hologram.poll() == []
+    finally:
+        transport.close()
+
+
+def test_shared_memory_ring_reports_lapped_readers():
+    transport = SharedMemoryTransport.create()
+    try:
+        producer, reader = transport.endpoint(), transport.endpoint()
+        frame = encode_event({"source": "G", "type": "click", "data": {}})
+        for _ in range(RING_SLOTS + 10):
+            producer.send("click", frame)
+        assert len(reader.poll()) == RING_SLOTS
+        assert reader.lost == 10
+    finally:
+        transport.close()
+
+
+def _shm_consumer(queue):
+    received = []
+    client = EventClient("Holograma", topics=["gesture_detected"])
+    client.on_message_received = received.append
+    client.connect()
+    queue.put("listo")
+    while len(received) < 50:
+        time.sleep(0.001)
+    queue.put([e["data"]["i"] for e in received])
+    client.close()
+
+
+def test_event_client_uses_shared_memory_across_processes():
+    """Los EventClient de procesos lanzados con run_attached no pasan por TCP."""
+    transport = SharedMemoryTransport.create()
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=run_attached, args=(functools.partial(_shm_consumer, queue), transport.spec()))
+    process.start()
+    try:
+        set_local_transport(transport)
+        producer = EventClient("Gestos", topics=[])
+        producer.connect()
+        assert producer._shm is not None
+        assert queue.get(timeout=10) == "listo"
+        for i in range(50):
+            producer.send_event("gesture_detected", {"i": i})
+        assert queue.get(timeout=10) == list(range(50))
+        producer.close()
+    finally:
+        set_local_transport(None)
+        process.join(timeout=5)
+        transport.close()
+
+
+def test_event_bus_bridges_shared_memory_and_tcp_clients():
+    """Con memoria compartida heredada, el bus une a los clientes de ambos transportes."""
+    transport = SharedMemoryTransport.create()
+    set_local_transport(transport)
+    try:
+        bus = _start_bus()
+        tcp_received, shm_received = [], []
+        tcp_done, shm_done = threading.Event(), threading.Event()
+
+        tcp = EventClient("UI", port=bus.port, transport="tcp", topics=["gesture_detected"])
+        tcp.on_message_received = lambda e: (tcp_received.append(e["data"]), tcp_done.set())
+        tcp.connect()
+        shm = EventClient("Holograma", port=bus.port, topics=["ui_command"])
+        shm.on_message_received = lambda e: (shm_received.append(e["data"]), shm_done.set())
+        shm.connect()
+        assert shm._shm is not None
+        _wait_clients(bus, 1)
+        time.sleep(0.05)
+
+        shm.send_event("gesture_detected", {"gesture": "fist"})
+        tcp.send_event("ui_command", {"model": "panda"})
+        assert tcp_done.wait(2.0) and shm_done.wait(2.0)
+        assert tcp_received == [{"gesture": "fist"}]
+        assert shm_received == [{"model": "panda"}]
+
+        # Un mensaje que no cabe en un slot se descarta y se cuenta
+        shm.send_event("gesture_detected", {"gesture": "x" * 4096})
+        assert shm.dropped == 1
+        assert shm.connected
+
+        tcp.close()
+        shm.close()
+        bus.stop()
+    finally:
+        set_local_transport(None)
+        transport.close()
+
+
+def test_shared_memory_client_skips_malformed_frame():
+    """Un frame corrupto en memoria compartida no detiene el hilo lector del cliente."""
+    transport = SharedMemoryTransport.create()
+    set_local_transport(transport)
+    try:
+        received = []
+        done = threading.Event()
+        consumer = EventClient("Holograma")
+        consumer.on_message_received = lambda e: (received.append(e["data"]), len(received) == 2 and done.set())
+        consumer.connect()
+        producer = transport.endpoint()
+
+        bad = b'{"type": "gesture_detected", "data": '
+        producer.send("gesture_detected", encode_event(
+            {"source": "G", "type": "gesture_detected", "data": {"i": 1}}, CODEC_JSON))
+        producer.send("gesture_detected", HEADER.pack(len(bad), CODEC_JSON) + bad)
+        producer.send("gesture_detected", encode_event(
+            {"source": "G", "type": "gesture_detected", "data": {"i": 2}}, CODEC_JSON))
+        assert done.wait(2.0)
+        assert received == [{"i": 1}, {"i": 2}]
+        consumer.close()
+    finally:
+        set_local_transport(None)
+        transport.close()
+
+
+def test_shared_memory_reader_sleeps_until_written():
+    """Un lector sin mensajes duerme en la condición y despierta con la escritura."""
+    transport = SharedMemoryTransport.create()
+    try:
+        producer, reader = transport.endpoint(), transport.endpoint()
+        start = time.perf_counter()
+        assert not reader.wait(0.05)
+        assert time.perf_counter() - start >= 0.04
+
+        threading.Timer(0.02, producer.send, args=(
+            "click", encode_event({"source": "G", "type": "click", "data": {}}))).start()
+        assert reader.wait(2.0)
+        assert len(reader.poll()) == 1
+    finally:
+        transport.close()
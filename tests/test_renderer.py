@@ -0,0 +1,265 @@
+import json
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+from panda3d.core import NodePath
+
+from src.benchmarks.scene_draw_calls import make_test_model
+from src.gestos.event_system import GestureEvent, NetworkEventBridge
+from src.holograma.event_queue import FrameEventQueue
+from src.holograma.renderer import GestureNetworkReceiver, HologramRenderer
+from src.holograma.rotations import HologramViewSet
+from src.holograma.scene import build_hologram_scene, draw_stats, unique_geometry_bytes
+
+
+def test_receiver_reassembles_split_messages():
+    """Los mensajes separados por \\n se procesan aunque lleguen partidos o juntos."""
+    receiver = GestureNetworkReceiver(port=0)
+    received = []
+    done = threading.Event()
+
+    def on_rotation(data):
+        received.append(data['angle'])
+        if len(received) == 3:
+            done.set()
+
+    receiver.register_callback("rotation", on_rotation)
+    receiver.start()
+    assert receiver.ready.wait(2.0)
+
+    payload = "".join(
+        json.dumps({'event': 'rotation', 'data': {'angle': angle}}) + "\n"
+        for angle in (10, 20, 30)
+    ).encode('utf-8')
+    with socket.create_connection(("localhost", receiver.port)) as sock:
+        sock.sendall(payload[:7])
+        sock.sendall(payload[7:])
+        assert done.wait(2.0)
+    receiver.stop()
+
+    assert received == [10, 20, 30]
+
+
+def test_bridge_coalesces_continuous_events():
+    """Las rotaciones se fusionan por intervalo; los gestos discretos no se pierden."""
+    receiver = GestureNetworkReceiver(port=0)
+    rotations, clicks = [], []
+    done = threading.Event()
+    receiver.register_callback("rotation", lambda data: rotations.append(data['angle']))
+    receiver.register_callback("click", lambda data: (clicks.append(data['i']), len(clicks) == 5 and done.set()))
+    receiver.start()
+    assert receiver.ready.wait(2.0)
+
+    bridge = NetworkEventBridge(port=receiver.port, flush_interval=0.05)
+    bridge.connect()
+    for angle in range(200):
+        bridge.send_gesture_event(GestureEvent.ROTATION, {'angle': angle})
+        if angle % 40 == 0:
+            bridge.send_gesture_event(GestureEvent.CLICK, {'i': angle // 40})
+    bridge.disconnect()
+    assert done.wait(2.0)
+    receiver.stop()
+
+    stats = bridge.get_stats()['events']
+    assert clicks == [0, 1, 2, 3, 4]
+    assert stats['click'] == {'queued': 5, 'merged': 0, 'sent': 5}
+    assert stats['rotation']['merged'] > 0
+    assert stats['rotation']['merged'] + stats['rotation']['sent'] == 200
+    assert rotations[-1] == 199
+
+
+def test_bridge_keeps_order_of_merged_continuous_events():
+    """Una rotación fusionada sale en la posición de su último valor, no del primero."""
+    receiver = GestureNetworkReceiver(port=0)
+    received = []
+    done = threading.Event()
+    receiver.register_callback("rotation", lambda data: (received.append(("rotation", data['angle'])),
+                                                         data['angle'] == 20 and done.set()))
+    receiver.register_callback("swipe_left", lambda data: received.append(("swipe_left", None)))
+    receiver.start()
+    assert receiver.ready.wait(2.0)
+
+    bridge = NetworkEventBridge(port=receiver.port, flush_interval=0.05)
+    bridge.connect()
+    # El hilo de envío espera el lock: los tres eventos caen en el mismo lote
+    with bridge._cond:
+        bridge.send_gesture_event(GestureEvent.ROTATION, {'angle': 10})
+        bridge.send_gesture_event(GestureEvent.SWIPE_LEFT, {})
+        bridge.send_gesture_event(GestureEvent.ROTATION, {'angle': 20})
+    assert done.wait(2.0)
+    bridge.disconnect()
+    receiver.stop()
+
+    assert received == [("swipe_left", None), ("rotation", 20)]
+
+
+def test_bridge_disconnect_sends_leftovers_after_inflight_batch():
+    """Al desconectar, lo pendiente sale después del lote que el hilo ya estaba enviando."""
+    receiver = GestureNetworkReceiver(port=0)
+    clicks = []
+    done = threading.Event()
+    receiver.register_callback("click", lambda data: (clicks.append(data['i']), len(clicks) == 2 and done.set()))
+    receiver.start()
+    assert receiver.ready.wait(2.0)
+
+    bridge = NetworkEventBridge(port=receiver.port, flush_interval=0.05)
+    bridge.connect()
+    # Con el lock de escritura tomado, el hilo queda trabado con el primer lote
+    with bridge._lock:
+        bridge.send_gesture_event(GestureEvent.CLICK, {'i': 0})
+        while bridge._batch:
+            time.sleep(0.001)
+        bridge.send_gesture_event(GestureEvent.CLICK, {'i': 1})
+        closer = threading.Thread(target=bridge.disconnect)
+        closer.start()
+        time.sleep(0.05)
+        # disconnect espera al hilo antes de tomar lo pendiente
+        assert bridge._batch
+    closer.join(2.0)
+    assert done.wait(2.0)
+    receiver.stop()
+
+    assert clicks == [0, 1]
+
+
+def test_renderer_keeps_swipes_across_absolute_rotations():
+    """Un swipe no se pierde con la siguiente ROTATION, que trae un ángulo absoluto."""
+    renderer = SimpleNamespace(master=NodePath("maestro"), swipe_offset=0.0, rotation_predictor=None)
+    HologramRenderer.on_rotation(renderer, {'angle': 10.0})
+    HologramRenderer.rotate_by(renderer, HologramRenderer.ROTATION_STEP)
+    assert renderer.master.getH() == 55.0
+    HologramRenderer.on_rotation(renderer, {'angle': 20.0})
+    assert renderer.master.getH() == 65.0
+
+
+def test_frame_event_queue_collapses_state_and_respects_budget():
+    """Sólo se aplica la última rotación; los discretos que no entran pasan al siguiente frame."""
+    queue = FrameEventQueue(budget=0.0, latest_only=("rotation",))
+    applied = []
+    handlers = {
+        "rotation": lambda data: applied.append(("rotation", data['angle'])),
+        "swipe_left": lambda data: applied.append(("swipe_left", data['i'])),
+    }
+    for i in range(3):
+        queue.push("rotation", {'angle': i})
+        queue.push("swipe_left", {'i': i})
+    queue.push("rotation", {'angle': 99})
+
+    # Presupuesto 0: entra un solo evento discreto por frame; la rotación
+    # posterior a los diferidos espera con ellos para no adelantarse
+    queue.drain(handlers)
+    assert applied == [("swipe_left", 0)]
+    assert queue.stats['collapsed'] == 3
+
+    queue.budget = 1.0
+    queue.drain(handlers)
+    assert applied[1:] == [("swipe_left", 1), ("swipe_left", 2), ("rotation", 99)]
+    assert len(queue) == 0
+
+
+def test_frame_event_queue_applies_collapsed_state_in_arrival_order():
+    """El estado colapsado se aplica donde llegó su último valor, no al final del frame."""
+    queue = FrameEventQueue(latest_only=("rotation",))
+    applied = []
+    handlers = {
+        "rotation": lambda data: applied.append(("rotation", data['angle'])),
+        "swipe_left": lambda data: applied.append(("swipe_left", None)),
+    }
+    queue.push("swipe_left")
+    queue.push("rotation", {'angle': 10})
+    queue.push("rotation", {'angle': 20})
+    queue.push("swipe_left")
+    queue.drain(handlers)
+
+    assert applied == [("swipe_left", None), ("rotation", 20), ("swipe_left", None)]
+
+
+def test_scene_instances_one_flattened_model():
+    """Las vistas comparten la geometría del modelo y los pisos son un único Geom."""
+    render = NodePath("render")
+    scene = build_hologram_scene(render, make_test_model(triangles=4000, parts=8), floors=True)
+
+    instances = [view.getChild(0).node() for view in scene.views.values()]
+    assert all(node == instances[0] for node in instances)
+    stats = draw_stats(scene.root)
+    # Una llamada por vista (modelo aplanado) y una para los pisos
+    assert stats['draw_calls'] == len(scene.views) + 1
+    assert stats['state_changes'] == 2
+    assert unique_geometry_bytes([scene.root]) < 4000 * 3 * 24
+
+
+def test_compositor_skips_unchanged_views():
+    """Cada vista se renderiza a su buffer escalado y sólo se repite si cambió."""
+    from src.benchmarks.offscreen import offscreen_base
+    from src.holograma.compositor import HologramCompositor
+
+    base = offscreen_base(300, 300)
+    compositor = HologramCompositor(base, make_test_model(triangles=2000, parts=4),
+                                    panel_size=(300, 300), view_scale={"posterior": 0.5})
+    try:
+        assert compositor.buffers["posterior"].getXSize() < compositor.buffers["frontal"].getXSize()
+        assert compositor.update(0.0) == 4
+        base.graphicsEngine.renderFrame()
+        assert compositor.update(0.0) == 0
+        assert compositor.update(10.0) == 4
+        assert compositor.pivots["frontal"].getH() == 10.0
+        assert compositor.pivots["posterior"].getH() == 170.0
+        base.graphicsEngine.renderFrame()
+        assert compositor.get_stats() == {'rendered': 8, 'skipped': 4}
+    finally:
+        compositor.destroy()
+
+
+def test_view_set_only_updates_changed_views():
+    """Sin giro del maestro no se toca ninguna vista; admite más de cuatro vistas."""
+    render = NodePath("render")
+    scene = build_hologram_scene(render, make_test_model(triangles=400, parts=2))
+    view_set = HologramViewSet(scene.master, scene.views, scene.base_hprs)
+    view_set.add_view("izquierda", render.attachNewNode("izquierda"), (45, 0, 0), mirrored=True)
+
+    assert len(view_set.update()) == 5
+    assert view_set.update() == []
+    scene.master.setH(30)
+    assert len(view_set.update()) == 5
+    assert scene.views["frontal"].getH() == 30
+    assert view_set.views["izquierda"].getH() == 15
+    assert view_set.get_stats() == {'applied': 10, 'skipped': 5}
+
+
+def test_asset_manager_caches_and_simplifies(tmp_path):
+    """Carga en segundo plano, .bam convertido en disco, LRU con presupuesto y LOD."""
+    from src.holograma.assets import AssetManager, ModelCache, simplify_model
+
+    model = make_test_model(triangles=20000, parts=4)
+    before = draw_stats(model)['triangles']
+    simplified = simplify_model(make_test_model(triangles=20000, parts=4), grid=16)
+    assert 0 < draw_stats(simplified)['triangles'] < before / 2
+
+    source = tmp_path / "modelo.bam"
+    model.writeBamFile(str(source))
+    loaded = []
+    assets = AssetManager(output_size=(96, 96), cache_dir=tmp_path / "cache")
+    try:
+        assets.load_async(str(source), loaded.append)
+        deadline = time.monotonic() + 10
+        while not loaded and time.monotonic() < deadline:
+            assets.poll()
+            time.sleep(0.01)
+        assert draw_stats(loaded[0])['triangles'] < before
+        assert assets.get(str(source)) is loaded[0]
+        assert len(list((tmp_path / "cache").glob("modelo-*.bam"))) == 1
+    finally:
+        assets.shutdown()
+
+    # Otra instancia lee el .bam convertido en lugar de volver a simplificar
+    again = AssetManager(output_size=(96, 96), cache_dir=tmp_path / "cache")
+    again.load(str(source))
+    again.shutdown()
+    assert again.get_stats()['disk_hits'] == 1 and again.get_stats()['conversions'] == 0
+
+    cache = ModelCache(budget_bytes=100)
+    cache.put("a", NodePath("a"), size=60)
+    cache.put("b", NodePath("b"), size=60)
+    assert "a" not in cache and "b" in cache and cache.evictions == 1